@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Import time benchmark
+
+This script measures the cold-start cost of the web app and the Celery worker with ``python -X importtime``.
+
+Usage:
+    python benchmarks/import_time.py [--top 15] [--budget-ms 0]
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Code run in a fresh interpreter: what a web worker or Celery worker imports at boot.
+BOOT_CODE = """
+import django
+django.setup()
+import tgpostman.urls
+import tgpostman.celery
+import scheduled_posts.tasks
+from tgpostman import telegram
+assert telegram._bot is None and telegram._async_bot is None, 'Bot API client created at import'
+"""
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+# --------------------------------------------------------------------------------
+# FUNCTIONS
+
+
+def measure() -> tuple:
+    """
+    Boot the project in a subprocess with import timing enabled.
+
+    :return: Tuple of wall-clock seconds and (cumulative microseconds, module) pairs of top-level imports
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='tgpostman.settings')
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(result.returncode)
+
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top_level.append((int(match.group(2)), match.group(4)))
+    return elapsed, top_level
+
+
+def main() -> None:
+    """
+    Print the slowest top-level imports and the total boot time.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to show.')
+    parser.add_argument('--budget-ms', type=float, default=0, help='Fail if boot takes longer (0 disables).')
+    args = parser.parse_args()
+
+    elapsed, top_level = measure()
+    print(f"{'cumulative ms':>14}  module")
+    for cumulative, module in sorted(top_level, reverse=True)[:args.top]:
+        print(f'{cumulative / 1000:14.1f}  {module}')
+    print(f'\nBoot: {elapsed * 1000:.0f} ms wall clock, {sum(c for c, _ in top_level) / 1000:.0f} ms importing')
+
+    if args.budget_ms and elapsed * 1000 > args.budget_ms:
+        raise SystemExit(f'Boot took {elapsed * 1000:.0f} ms, budget is {args.budget_ms:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
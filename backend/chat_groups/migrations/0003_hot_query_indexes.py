@@ -0,0 +1,17 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_groups', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatgroupmember',
+            index=models.Index(fields=['chat_id'], name='chatgroupmember_chat_id_idx'),
+        ),
+    ]
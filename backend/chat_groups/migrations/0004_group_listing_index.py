@@ -0,0 +1,19 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_groups', '0003_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatgroup',
+            index=models.Index(fields=['user', '-created_at'], name='chatgroup_user_created_idx'),
+        ),
+    ]
@@ -7,7 +7,9 @@ Models for grouping and managing Telegram chats.
 
 from django.conf import settings
 from django.db import models
+from django.db.models import OuterRef, Subquery
 
+from telegram_accounts.models import TelegramChat
 from tgpostman.settings import LANG_CHOICES
 
 # --------------------------------------------------------------------------------
@@ -37,6 +39,9 @@ class ChatGroup(models.Model):
     class Meta:
         unique_together = ('user', 'name')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='chatgroup_user_created_idx'),
+        ]
 
     def __str__(self):
         return f'{self.name} ({self.user.username})'
@@ -44,6 +49,33 @@ class ChatGroup(models.Model):
 # --------------------------------------------------------------------------------
 
 
+class ChatGroupMemberQuerySet(models.QuerySet):
+    """
+    Queryset of group members with helpers for joining them to Telegram chats.
+    """
+
+    def with_chat(self, user) -> 'ChatGroupMemberQuerySet':
+        """
+        Annotate each member with the title and link of the user's matching chat.
+
+        Members and chats are linked by chat ID only, so the chat columns are
+        fetched with correlated subqueries in the same SELECT.
+
+        Args:
+            user (User): Owner of the chats.
+
+        Returns:
+            ChatGroupMemberQuerySet: Members with ``chat_title`` and ``chat_url``, None if the chat is unknown.
+        """
+        chat = TelegramChat.objects.filter(user=user, chat_id=OuterRef('chat_id'))
+        return self.annotate(
+            chat_title=Subquery(chat.values('title')[:1]),
+            chat_url=Subquery(chat.values('url')[:1])
+        )
+
+# --------------------------------------------------------------------------------
+
+
 class ChatGroupMember(models.Model):
     """
     Represents a Telegram chat added to a specific chat group.
@@ -65,8 +97,13 @@ class ChatGroupMember(models.Model):
     chat_id = models.BigIntegerField()
     language = models.CharField(max_length=10, choices=LANG_CHOICES)
 
+    objects = ChatGroupMemberQuerySet.as_manager()
+
     class Meta:
         unique_together = ('group', 'chat_id')
+        indexes = [
+            models.Index(fields=['chat_id'], name='chatgroupmember_chat_id_idx'),
+        ]
 
     def __str__(self):
         return f'{self.chat_id} in {self.group.name} ({self.language})'
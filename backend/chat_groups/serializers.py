@@ -19,14 +19,29 @@ class ChatGroupMemberSerializer(serializers.ModelSerializer):
     Args:
         chat_id (int): Unique Telegram chat ID.
         language (str): Language of the chat.
+        title (str): Title of the owner's chat, if the member was loaded with ``with_chat``.
 
     Returns:
         Serialized representation of ChatGroupMember.
     """
 
+    title = serializers.SerializerMethodField()
+
     class Meta:
         model = ChatGroupMember
-        fields = ('id', 'chat_id', 'language')
+        fields = ('id', 'chat_id', 'language', 'title')
+
+    def get_title(self, obj: ChatGroupMember):
+        """
+        Return the chat title annotated by ``ChatGroupMemberQuerySet.with_chat``.
+
+        Args:
+            obj (ChatGroupMember): Serialized member.
+
+        Returns:
+            str: Chat title, or None if it was not loaded or the chat is unknown.
+        """
+        return getattr(obj, 'chat_title', None)
 
 # --------------------------------------------------------------------------------
 
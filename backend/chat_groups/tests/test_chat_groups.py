@@ -0,0 +1,103 @@
+"""
+Chat group tests
+Unit tests for listing group members joined to the owner's Telegram chats.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chat_groups.models import ChatGroup, ChatGroupMember
+from telegram_accounts.models import TelegramChat
+from users import api_keys
+from users.models import User
+
+# --------------------------------------------------------------------------------
+# TEST CASES
+
+
+class ChatGroupMemberTests(APITestCase):
+    """
+    Test case for member listings running a constant number of queries.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a user with a group whose members match the user's chats.
+        """
+        self.user = User.objects.create_user(username="user1", password="1234")
+        self.client.force_login(self.user)
+        self.client.credentials(HTTP_X_API_KEY=self.user.api_key)
+        api_keys.resolve(self.user.api_key)
+        self.group = ChatGroup.objects.create(user=self.user, name="News")
+
+    def add_members(self, start: int, count: int) -> None:
+        """
+        Add members to the group together with matching chats.
+
+        Args:
+            start (int): First chat ID offset.
+            count (int): Number of members to add.
+        """
+        TelegramChat.objects.bulk_create([
+            TelegramChat(user=self.user, chat_id=-1000 - i, title=f"Channel {i}", chat_type="channel")
+            for i in range(start, start + count)
+        ])
+        ChatGroupMember.objects.bulk_create([
+            ChatGroupMember(group=self.group, chat_id=-1000 - i, language="en")
+            for i in range(start, start + count)
+        ])
+
+    def count_queries(self, url: str, params: dict = None) -> int:
+        """
+        Request a URL and count the SQL queries it ran.
+
+        Args:
+            url (str): URL to request.
+            params (dict): Query parameters.
+
+        Returns:
+            int: Number of queries.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_member_list_queries(self) -> None:
+        """
+        Test that the member page costs the same number of queries for 5 and 50 members, with and without search.
+        """
+        url = reverse("chat_groups:member_list", args=[self.group.pk])
+        self.add_members(0, 5)
+        small, small_search = self.count_queries(url), self.count_queries(url, {"q": "Channel"})
+        self.add_members(5, 45)
+        self.assertEqual(self.count_queries(url), small)
+        self.assertEqual(self.count_queries(url, {"q": "Channel"}), small_search)
+
+        page = self.client.get(url).context["members"]
+        self.assertEqual(len(page), 10)
+        self.assertTrue(page.has_next)
+
+        page = self.client.get(url, {"q": "Channel 7"}).context["members"]
+        self.assertEqual(list(page)[0].chat_title, "Channel 7")
+
+    def test_group_api_members(self) -> None:
+        """
+        Test that the group API lists nested members with chat titles in a constant number of queries.
+        """
+        url = reverse("chat_groups:chatgroup-list")
+        self.add_members(0, 3)
+        small = self.count_queries(url)
+        self.add_members(3, 30)
+        ChatGroup.objects.create(user=self.user, name="Sports")
+        self.assertEqual(self.count_queries(url), small)
+
+        response = self.client.get(url)
+        group = next(g for g in response.data["results"] if g["name"] == "News")
+        self.assertEqual(len(group["members"]), 33)
+        self.assertEqual(group["members"][0]["title"], "Channel 0")
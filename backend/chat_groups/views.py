@@ -5,8 +5,8 @@ Views for managing chat groups via web and API.
 
 # --------------------------------------------------------------------------------
 
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.contrib.auth.decorators import login_required
+from django.db.models import OuterRef, Prefetch, Subquery
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -16,6 +16,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from telegram_accounts.models import TelegramChat
+from tgpostman.pagination import KeysetPagination, KeysetPaginator
+from tgpostman.search import search
 from .forms import ChatGroupForm, ChatGroupMemberForm
 from .models import ChatGroup, ChatGroupMember
 from .serializers import ChatGroupSerializer, ChatGroupMemberSerializer
@@ -30,14 +32,7 @@ class ChatGroupListCreateView(View):
         if q:
             groups_qs = groups_qs.filter(name__icontains=q)
 
-        paginator = Paginator(groups_qs.order_by('-created_at'), 10)
-        page = request.GET.get('page', 1)
-        try:
-            groups = paginator.page(page)
-        except PageNotAnInteger:
-            groups = paginator.page(1)
-        except EmptyPage:
-            groups = paginator.page(paginator.num_pages)
+        groups = KeysetPaginator(groups_qs.order_by('-created_at'), 10).page_or_first(request.GET.get('cursor'))
 
         form = ChatGroupForm()
         return render(request, 'chat_groups/group_list.html', {
@@ -54,9 +49,9 @@ class ChatGroupListCreateView(View):
             group.save()
             return redirect('chat_groups:group_list')
 
-        groups = Paginator(
+        groups = KeysetPaginator(
             ChatGroup.objects.filter(user=request.user).order_by('-created_at'), 10
-        ).page(1)
+        ).page()
         return render(request, 'chat_groups/group_list.html', {
             'groups': groups,
             'form': form,
@@ -78,24 +73,15 @@ class ChatGroupMemberManageView(View):
     def get(self, request, pk):
         group = get_object_or_404(ChatGroup, pk=pk, user=request.user)
         q = request.GET.get('q', '')
-        items = []
-
-        for member in group.members.all():
-            chat = TelegramChat.objects.filter(
-                chat_id=member.chat_id, user=request.user
-            ).first()
-            title = chat.title if chat else ''
-            if not q or q.lower() in title.lower():
-                items.append({'member': member, 'chat': chat})
-
-        paginator = Paginator(items, 10)
-        page = request.GET.get('page', 1)
-        try:
-            members = paginator.page(page)
-        except PageNotAnInteger:
-            members = paginator.page(1)
-        except EmptyPage:
-            members = paginator.page(paginator.num_pages)
+
+        members_qs = group.members.with_chat(request.user).order_by('pk')
+        if q.strip():
+            matching = search(TelegramChat.objects.filter(user=request.user), q, 'title')
+            members_qs = members_qs.annotate(
+                rank=Subquery(matching.filter(chat_id=OuterRef('chat_id')).values('rank')[:1])
+            ).filter(rank__isnull=False).order_by('-rank')
+
+        members = KeysetPaginator(members_qs, 10).page_or_first(request.GET.get('cursor'))
 
         form = ChatGroupMemberForm(user=request.user, group=group)
         return render(request, 'chat_groups/member_list.html', {
@@ -127,9 +113,13 @@ class ChatGroupMemberManageView(View):
 class ChatGroupViewSet(viewsets.ModelViewSet):
     serializer_class = ChatGroupSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return ChatGroup.objects.filter(user=self.request.user)
+        members = ChatGroupMember.objects.with_chat(self.request.user).order_by('pk')
+        return ChatGroup.objects.filter(user=self.request.user).prefetch_related(
+            Prefetch('members', queryset=members)
+        ).order_by('-created_at')
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -0,0 +1,278 @@
+"""
+Asyncio post sender
+Delivery engine sending scheduled posts through the asyncio Bot API client, many recipients per event loop.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import asyncio
+from typing import List
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.exceptions import ConnectionError, Timeout
+from telebot.apihelper import ApiTelegramException
+
+from tgpostman.telegram import async_bot as bot, close_async_session
+from . import ledger, post_sender
+from .attachments import AttachmentLoader
+from .fanout import DeliveryResult, FanOutSummary, fan_out_async
+from .models import ScheduledPost
+from .post_sender import (
+    INPUT_MEDIA, Recipient, _SendContext, _media, _message_ids, _remember_file_id, _rewind, _save_file_ids,
+    prepare_variants, resolve_recipients
+)
+from .retry import call_with_retry_async
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def _sync_error(exc: Exception) -> Exception:
+    """
+    Map an error of the asyncio client onto the error the threaded client raises.
+
+    Keeps the retry policy and the media group fallback shared by both engines.
+
+    Args:
+        exc (Exception): Error raised by an AsyncTeleBot call.
+
+    Returns:
+        Exception: Equivalent ApiTelegramException, Timeout or ConnectionError, or exc itself.
+    """
+    from telebot import asyncio_helper
+
+    if isinstance(exc, asyncio_helper.ApiTelegramException):
+        return ApiTelegramException(exc.function_name, exc.result, exc.result_json)
+    if isinstance(exc, asyncio_helper.RequestTimeout):
+        return Timeout(str(exc))
+    if isinstance(exc, asyncio_helper.ApiHTTPException) and getattr(exc.result, 'status', 0) >= 500:
+        return ConnectionError(str(exc))
+    return exc
+
+
+def _timeout(*media) -> float:
+    """
+    Pick the total request timeout of a send.
+
+    Args:
+        *media: File IDs or file contents sent with the message.
+
+    Returns:
+        float: Connect plus read timeout in seconds, longer when files are uploaded.
+    """
+    upload = any(not isinstance(item, str) for item in media)
+    read = settings.TELEGRAM_UPLOAD_READ_TIMEOUT if upload else settings.TELEGRAM_READ_TIMEOUT
+    return settings.TELEGRAM_CONNECT_TIMEOUT + read
+
+
+async def _send(method: str, chat_id: int, **kwargs):
+    """
+    Await a Bot API send method once the rate limiter allows it.
+
+    The limiter is shared with the threaded engine. Reservations may query the
+    database, so they run in Django's sync thread; the wait itself is awaited.
+    Every attempt uploads files from their start.
+
+    Args:
+        method (str): Name of the AsyncTeleBot method, e.g. 'send_message'.
+        chat_id (int): Telegram chat ID.
+        **kwargs: Arguments of the method.
+
+    Returns:
+        Result of the Bot API call.
+
+    Raises:
+        DeliveryDeferred: If Telegram asked to wait too long to retry inline.
+    """
+    async def call():
+        wait = await sync_to_async(post_sender.rate_limiter.reserve)(chat_id)
+        if wait:
+            await asyncio.sleep(wait)
+        _rewind(kwargs)
+        try:
+            return await getattr(bot, method)(chat_id=chat_id, **kwargs)
+        except Exception as e:
+            error = _sync_error(e)
+            if error is e:
+                raise
+            raise error from e
+
+    return await call_with_retry_async(call)
+
+
+async def _deliver(rec: Recipient, ctx: _SendContext) -> List[int]:
+    """
+    Send a post to one recipient, keeping the order of multi-message sends.
+
+    Args:
+        rec (Recipient): Recipient to send to.
+        ctx (_SendContext): Shared state of the post being sent.
+
+    Returns:
+        list[int]: IDs of the sent messages.
+    """
+    attachments, loader = ctx.attachments, ctx.loader
+    mode, parse_mode = ctx.mode, ctx.parse_mode
+    variant = ctx.variants[rec.language]
+    message_text, markup = variant.text, variant.reply_markup
+
+    if mode == 'text':
+        message = await _send(
+            'send_message',
+            chat_id=rec.chat_id,
+            text=message_text,
+            parse_mode=parse_mode,
+            reply_markup=markup,
+            timeout=_timeout()
+        )
+        return _message_ids(message)
+
+    if len(attachments) == 1:
+        att = attachments[0]
+        kind = ctx.send_kinds[0]
+        media = _media(att, kind, loader)
+
+        send_kwargs = {'chat_id': rec.chat_id, 'reply_markup': markup, 'timeout': _timeout(media)}
+        if message_text:
+            send_kwargs.update({'caption': message_text, 'parse_mode': parse_mode})
+
+        message = await _send(f'send_{kind}', **{kind: media}, **send_kwargs)
+        _remember_file_id(att, kind, message)
+        return _message_ids(message)
+
+    if not ctx.documents_only:
+        kinds = ctx.send_kinds
+        blobs = [INPUT_MEDIA[kind](media=_media(att, kind, loader)) for att, kind in zip(attachments, kinds)]
+
+        if message_text:
+            if mode == 'media_group':
+                blobs[0].caption = message_text
+                blobs[0].parse_mode = parse_mode
+            else:
+                blobs[-1].caption = message_text
+                blobs[-1].parse_mode = parse_mode
+
+        try:
+            messages = await _send(
+                'send_media_group', chat_id=rec.chat_id, media=blobs,
+                timeout=_timeout(*(blob.media for blob in blobs))
+            )
+        except ApiTelegramException:
+            ctx.documents_only = True
+        else:
+            for att, kind, message in zip(attachments, kinds, messages or []):
+                _remember_file_id(att, kind, message)
+            return _message_ids(*(messages or []))
+
+    messages = []
+    for idx, att in enumerate(attachments):
+        media = _media(att, 'document', loader)
+        kwargs = {'timeout': _timeout(media)}
+        if idx == len(attachments) - 1 and message_text:
+            kwargs.update({'caption': message_text, 'parse_mode': parse_mode})
+        if idx == len(attachments) - 1:
+            kwargs['reply_markup'] = markup
+        message = await _send('send_document', chat_id=rec.chat_id, document=media, **kwargs)
+        _remember_file_id(att, 'document', message)
+        messages.append(message)
+    return _message_ids(*messages)
+
+
+async def _fan_out(
+    recipients: List[Recipient],
+    ctx: _SendContext,
+    recorder: ledger.Recorder,
+    concurrency: int
+) -> list:
+    """
+    Deliver to recipients on the running event loop.
+
+    Args:
+        recipients (list[Recipient]): Recipients to deliver to.
+        ctx (_SendContext): Shared state of the post being sent.
+        recorder (ledger.Recorder): Ledger buffer receiving every result, flushed in Django's sync thread.
+        concurrency (int): Maximum number of recipients handled at once.
+
+    Returns:
+        list[DeliveryResult]: Results in recipient order.
+    """
+    async def deliver(rec: Recipient) -> List[int]:
+        return await _deliver(rec, ctx)
+
+    async def on_result(result: DeliveryResult) -> None:
+        if recorder.add(result):
+            await sync_to_async(recorder.flush)()
+
+    try:
+        return (await fan_out_async(recipients, deliver, concurrency=concurrency, on_result=on_result)).results
+    finally:
+        await close_async_session()
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def send_to_recipients(post: ScheduledPost, recipients: List[Recipient]) -> FanOutSummary:
+    """
+    Send a post to the given recipients on an event loop.
+
+    Same contract as post_sender.send_to_recipients: delivered recipients are
+    skipped, prepared variants are reused and every attempt is recorded in the
+    delivery ledger. Attachments are uploaded first and their file_ids stored
+    before the concurrent fan-out starts. Database work happens outside the
+    event loops, apart from full ledger batches written from Django's sync
+    thread; during the fan-out up to POST_ASYNC_CONCURRENCY recipients are in
+    flight, each costing a coroutine instead of a thread.
+
+    Args:
+        post (ScheduledPost): Post instance to send.
+        recipients (list[Recipient]): Recipients to deliver to.
+
+    Returns:
+        FanOutSummary: Per-recipient delivery results of this attempt.
+    """
+    recipients = ledger.undelivered(post, recipients)
+    languages = dict.fromkeys(rec.language for rec in recipients if rec.language is not None)
+    variants = prepare_variants(post, languages)
+    attachments = list(post.attachments.all())
+    recorder = ledger.Recorder(post)
+
+    with AttachmentLoader() as loader:
+        ctx = _SendContext(post, attachments, variants, loader)
+        try:
+            # Upload attachments once: send sequentially until one recipient succeeds,
+            # everyone after that gets the cached file_id. The file_ids are stored
+            # before the concurrent fan-out, so a crash there does not lose them.
+            results = []
+            pending = recipients
+            while attachments and pending and not ctx.uploaded():
+                results += asyncio.run(_fan_out(pending[:1], ctx, recorder, concurrency=1))
+                pending = pending[1:]
+                if results[-1].ok:
+                    break
+            if attachments:
+                _save_file_ids(attachments)
+
+            results += asyncio.run(_fan_out(pending, ctx, recorder, concurrency=settings.POST_ASYNC_CONCURRENCY))
+            if attachments:
+                _save_file_ids(attachments)
+        finally:
+            recorder.flush()
+    return FanOutSummary(results)
+
+
+def send_post(post: ScheduledPost) -> FanOutSummary:
+    """
+    Send a scheduled post to all associated recipients from one event loop.
+
+    Args:
+        post (ScheduledPost): Post instance to send.
+
+    Returns:
+        FanOutSummary: Per-recipient delivery results.
+    """
+    if post.status.lower() != 'pending':
+        return FanOutSummary([])
+    return send_to_recipients(post, resolve_recipients(post))
@@ -0,0 +1,251 @@
+"""
+Attachment loader
+Describes uploaded attachments and opens them once per post as zero-copy, re-readable views.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import hashlib
+import io
+import mimetypes
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1MB per read when copying remote files
+
+MAX_MEDIA_SIZE = 5 * 1024 * 1024  # 5MB file size limit
+
+IMAGE_EXT = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+VIDEO_EXT = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.mpeg', '.mpg'}
+AUDIO_EXT = {'.mp3', '.ogg', '.wav', '.m4a', '.aac', '.flac'}
+
+MEDIA_KINDS = {'image': 'photo', 'video': 'video', 'audio': 'audio'}
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def guess_mime_type(filename: str) -> str:
+    """
+    Determine MIME type of a file based on its extension.
+
+    Args:
+        filename (str): File name to examine.
+
+    Returns:
+        str: Guessed MIME type or fallback.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in IMAGE_EXT:
+        category = 'image'
+    elif ext in VIDEO_EXT:
+        category = 'video'
+    elif ext in AUDIO_EXT:
+        category = 'audio'
+    else:
+        return 'application/octet-stream'
+    return mimetypes.guess_type(filename)[0] or f"{category}/*"
+
+
+def media_kind(mime_type: str, size: int) -> str:
+    """
+    Map a file to the Telegram media kind used to send it.
+
+    Files above MAX_MEDIA_SIZE are always sent as documents.
+
+    Args:
+        mime_type (str): MIME type of the file.
+        size (int): File size in bytes.
+
+    Returns:
+        str: 'photo', 'video', 'audio' or 'document'.
+    """
+    if size > MAX_MEDIA_SIZE:
+        return 'document'
+    return MEDIA_KINDS.get(mime_type.split('/')[0], 'document')
+
+
+def describe(file, filename: str) -> Dict[str, object]:
+    """
+    Compute the stored metadata of an attachment in one pass over its content.
+
+    Args:
+        file (File): Uploaded or stored file.
+        filename (str): Original file name.
+
+    Returns:
+        dict: media_kind, mime_type, size and content_hash field values.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in file.chunks(STREAM_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    mime_type = guess_mime_type(filename)
+    return {
+        'media_kind': media_kind(mime_type, size),
+        'mime_type': mime_type,
+        'size': size,
+        'content_hash': digest.hexdigest(),
+    }
+
+# --------------------------------------------------------------------------------
+
+
+class AttachmentView(io.RawIOBase):
+    """
+    Read-only, seekable file object over a buffer owned by AttachmentLoader.
+
+    Args:
+        buffer (memoryview): Shared file content.
+        name (str): File name reported to the Bot API.
+    """
+
+    def __init__(self, buffer: memoryview, name: str):
+        super().__init__()
+        self._buffer = buffer
+        self._pos = 0
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        """
+        Read bytes into a pre-allocated buffer.
+
+        Args:
+            b (bytearray): Target buffer.
+
+        Returns:
+            int: Number of bytes read.
+        """
+        chunk = self._buffer[self._pos:self._pos + len(b)]
+        size = len(chunk)
+        b[:size] = chunk
+        self._pos += size
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to size bytes, or everything left if size is negative.
+
+        Args:
+            size (int): Maximum number of bytes.
+
+        Returns:
+            bytes: Data read.
+        """
+        end = len(self._buffer) if size is None or size < 0 else self._pos + size
+        data = bytes(self._buffer[self._pos:end])
+        self._pos += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Move the read position.
+
+        Args:
+            offset (int): Offset relative to whence.
+            whence (int): io.SEEK_SET, io.SEEK_CUR or io.SEEK_END.
+
+        Returns:
+            int: New position.
+        """
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._buffer)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+# --------------------------------------------------------------------------------
+
+
+class AttachmentLoader:
+    """
+    Loads every attachment of a post at most once and closes all handles on exit.
+
+    Files in local storage are memory-mapped; files in remote storage are
+    streamed once into a temporary file which is then memory-mapped. Peak
+    memory therefore does not depend on the number of recipients.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self._handles = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'AttachmentLoader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def open(self, att) -> AttachmentView:
+        """
+        Return a fresh view over the content of an attachment.
+
+        Args:
+            att (ScheduledPostAttachment): Attachment of the post.
+
+        Returns:
+            AttachmentView: Independent reader positioned at the start.
+        """
+        with self._lock:
+            buffer = self._buffers.get(att.pk)
+            if buffer is None:
+                buffer = self._buffers[att.pk] = self._load(att)
+        return AttachmentView(buffer, att.original_name)
+
+    def _load(self, att) -> memoryview:
+        """
+        Open an attachment and map its content into memory.
+
+        Args:
+            att (ScheduledPostAttachment): Attachment to load.
+
+        Returns:
+            memoryview: Content of the file.
+        """
+        storage = att.file.storage
+        try:
+            fh = open(storage.path(att.file.name), 'rb')
+        except NotImplementedError:
+            fh = tempfile.TemporaryFile()
+            with storage.open(att.file.name, 'rb') as remote:
+                shutil.copyfileobj(remote, fh, STREAM_CHUNK_SIZE)
+            fh.flush()
+        self._handles.append(fh)
+
+        if os.fstat(fh.fileno()).st_size == 0:
+            return memoryview(b'')
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._handles.append(mapped)
+        return memoryview(mapped)
+
+    def close(self) -> None:
+        """
+        Release all buffers and close memory maps and file handles.
+        """
+        with self._lock:
+            for buffer in self._buffers.values():
+                buffer.release()
+            for handle in reversed(self._handles):
+                try:
+                    handle.close()
+                except BufferError:
+                    pass  # a view is still being read; the map is freed with it
+            self._buffers.clear()
+            self._handles.clear()
@@ -0,0 +1,155 @@
+"""
+Bulk post creation
+Set-based validation and insertion of many scheduled posts in one transaction.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import uuid
+from typing import List, Tuple
+
+from django.db import transaction
+
+from chat_groups.models import ChatGroup
+from telegram_accounts.models import TelegramChat
+from tgpostman.fields import OwnedObjectsField
+from .attachments import describe
+from .models import ScheduledPost, ScheduledPostAttachment
+from .serializers import BulkPostItemSerializer
+from .tasks import dispatch_created_posts
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+INSERT_BATCH_SIZE = 1000  # rows per INSERT statement
+INVALID_PK = OwnedObjectsField.default_error_messages['does_not_exist']
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def _owned_ids(model, user, ids: set) -> set:
+    """
+    Keep the IDs of rows owned by a user, in one query.
+
+    Args:
+        model (Model): TelegramChat or ChatGroup.
+        user (User): Owner of the rows.
+        ids (set[int]): IDs to check.
+
+    Returns:
+        set[int]: IDs that exist and belong to the user.
+    """
+    if not ids:
+        return set()
+    return set(model.objects.filter(user=user, pk__in=ids).values_list('pk', flat=True))
+
+
+def _validate(user, items: list) -> Tuple[List[dict], List[Tuple[int, dict]]]:
+    """
+    Validate every item, checking referenced chats and groups for the whole batch at once.
+
+    Args:
+        user (User): Author of the posts.
+        items (list[dict]): Raw post payloads.
+
+    Returns:
+        tuple: Per-item results (None for valid items) and (index, validated data) pairs.
+    """
+    results: List[dict] = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = BulkPostItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'status': 'invalid', 'errors': serializer.errors}
+
+    chats = _owned_ids(TelegramChat, user, {pk for _, data in valid for pk in data['targets']})
+    groups = _owned_ids(ChatGroup, user, {pk for _, data in valid for pk in data['groups']})
+
+    checked = []
+    for index, data in valid:
+        errors = {}
+        for field, owned in (('targets', chats), ('groups', groups)):
+            missing = [pk for pk in data[field] if pk not in owned]
+            if missing:
+                errors[field] = [INVALID_PK.format(pk_value=pk) for pk in missing]
+        if errors:
+            results[index] = {'index': index, 'status': 'invalid', 'errors': errors}
+        else:
+            checked.append((index, data))
+    return results, checked
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def create_posts(user, items: list) -> List[dict]:
+    """
+    Validate and create a batch of posts.
+
+    Valid posts, their target and group links and their attachments are
+    inserted with bulk queries in one transaction; invalid items are reported
+    without blocking the rest. After commit, a single task enqueues sending
+    and variant preparation for the new posts.
+
+    Args:
+        user (User): Author of the posts.
+        items (list[dict]): Raw post payloads.
+
+    Returns:
+        list[dict]: One result per item, in input order, with the new post ID or the validation errors.
+    """
+    results, valid = _validate(user, items)
+    if not valid:
+        return results
+
+    posts = [
+        ScheduledPost(
+            user=user,
+            content=data['content'],
+            html=data.get('html', False),
+            schedule_time=data['schedule_time'],
+            button_text=data.get('button_text'),
+            button_url=data.get('button_url'),
+        )
+        for _, data in valid
+    ]
+    Targets = ScheduledPost.targets.through
+    Groups = ScheduledPost.groups.through
+
+    with transaction.atomic():
+        ScheduledPost.objects.bulk_create(posts, batch_size=INSERT_BATCH_SIZE)
+        Targets.objects.bulk_create([
+            Targets(scheduledpost_id=post.id, telegramchat_id=pk)
+            for post, (_, data) in zip(posts, valid)
+            for pk in data['targets']
+        ], batch_size=INSERT_BATCH_SIZE)
+        Groups.objects.bulk_create([
+            Groups(scheduledpost_id=post.id, chatgroup_id=pk)
+            for post, (_, data) in zip(posts, valid)
+            for pk in data['groups']
+        ], batch_size=INSERT_BATCH_SIZE)
+
+        attachments = []
+        for post, (_, data) in zip(posts, valid):
+            for f in data['attachments']:
+                original_name = f.name
+                meta = describe(f, original_name)
+                f.name = f"{uuid.uuid4().hex}_{original_name}"
+                attachments.append(ScheduledPostAttachment(
+                    post=post,
+                    file=f,
+                    original_name=original_name,
+                    **meta
+                ))
+        ScheduledPostAttachment.objects.bulk_create(attachments, batch_size=INSERT_BATCH_SIZE)
+
+        post_ids = [post.id for post in posts]
+        transaction.on_commit(lambda: dispatch_created_posts.delay(post_ids))
+
+    for post, (index, _) in zip(posts, valid):
+        results[index] = {'index': index, 'status': 'created', 'id': post.id}
+    return results
@@ -0,0 +1,249 @@
+"""
+Fan-out engine
+Concurrent delivery of a post to many recipients with bounded parallelism, on threads or on an event loop.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from django.db import connections
+
+# --------------------------------------------------------------------------------
+
+
+class DeliveryResult:
+    """
+    Outcome of delivering a post to a single recipient.
+
+    Args:
+        chat_id (int): Telegram chat ID.
+        error (str): Error message if delivery failed.
+        message_ids (list[int]): Telegram IDs of the delivered messages.
+        retry_after (float): Seconds to wait before retrying a deferred delivery.
+    """
+
+    def __init__(
+        self,
+        chat_id: int,
+        error: Optional[str] = None,
+        message_ids: Optional[List[int]] = None,
+        retry_after: Optional[float] = None
+    ):
+        self.chat_id = chat_id
+        self.error = error
+        self.message_ids = message_ids or []
+        self.retry_after = retry_after
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the delivery succeeded.
+
+        Returns:
+            bool: True if no error was recorded.
+        """
+        return self.error is None
+
+    @property
+    def deferred(self) -> bool:
+        """
+        Whether the delivery was postponed rather than failed.
+
+        Returns:
+            bool: True if a retry delay was recorded.
+        """
+        return self.retry_after is not None
+
+# --------------------------------------------------------------------------------
+
+
+class FanOutSummary:
+    """
+    Per-recipient results of a fan-out.
+
+    Args:
+        results (list[DeliveryResult]): Results in recipient order.
+    """
+
+    def __init__(self, results: List[DeliveryResult]):
+        self.results = results
+
+    @property
+    def sent(self) -> List[DeliveryResult]:
+        """
+        Successful deliveries.
+
+        Returns:
+            list[DeliveryResult]: Results without errors.
+        """
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[DeliveryResult]:
+        """
+        Failed deliveries.
+
+        Returns:
+            list[DeliveryResult]: Results with errors that were not deferred.
+        """
+        return [result for result in self.results if not result.ok and not result.deferred]
+
+    @property
+    def deferred(self) -> List[DeliveryResult]:
+        """
+        Deliveries postponed until a flood wait is over.
+
+        Returns:
+            list[DeliveryResult]: Deferred results.
+        """
+        return [result for result in self.results if result.deferred]
+
+    def error_message(self) -> str:
+        """
+        Build a human-readable description of failed deliveries.
+
+        Returns:
+            str: Empty string if everything was delivered.
+        """
+        failed = self.failed
+        if not failed:
+            return ''
+        details = '; '.join(f"{result.chat_id}: {result.error}" for result in failed)
+        return f"{len(failed)} of {len(self.results)} recipients failed: {details}"
+
+# --------------------------------------------------------------------------------
+
+
+def fan_out(
+    recipients: Iterable,
+    deliver: Callable,
+    max_workers: int,
+    on_result: Optional[Callable[[DeliveryResult], None]] = None
+) -> FanOutSummary:
+    """
+    Deliver to all recipients concurrently, never stopping at the first error.
+
+    Every recipient is handled by exactly one worker from start to finish, so
+    multi-message sends to the same chat keep their order.
+
+    Args:
+        recipients (Iterable): Recipients exposing a ``chat_id`` attribute.
+        deliver (Callable): Function sending the post to one recipient, returning its message IDs.
+        max_workers (int): Maximum number of recipients handled at once.
+        on_result (Callable): Called with every result as soon as it is known, in the calling thread.
+            If it raises, no further recipient is started; sends already in flight
+            finish and are still passed to on_result before the first error is re-raised.
+
+    Returns:
+        FanOutSummary: Results in recipient order.
+    """
+    recipients = list(recipients)
+    results: List[Optional[DeliveryResult]] = [None] * len(recipients)
+    pending = iter(enumerate(recipients))
+    lock = threading.Lock()
+    done: queue.SimpleQueue = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def worker() -> None:
+        try:
+            while True:
+                with lock:
+                    item = None if stop.is_set() else next(pending, None)
+                if item is None:
+                    return
+                index, rec = item
+                try:
+                    results[index] = DeliveryResult(rec.chat_id, message_ids=deliver(rec))
+                except Exception as e:
+                    results[index] = DeliveryResult(
+                        rec.chat_id,
+                        error=str(e) or e.__class__.__name__,
+                        retry_after=getattr(e, 'retry_after', None)
+                    )
+                done.put(index)
+        finally:
+            done.put(None)
+            connections.close_all()
+
+    workers = max(1, min(max_workers, len(recipients)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker) for _ in range(workers)]
+        running = workers
+        error = None
+        while running:
+            index = done.get()
+            if index is None:
+                running -= 1
+            elif on_result is not None:
+                try:
+                    on_result(results[index])
+                except Exception as e:
+                    error = error or e
+                    stop.set()
+    for future in futures:
+        future.result()
+    if error is not None:
+        raise error
+
+    return FanOutSummary(results)
+
+
+async def fan_out_async(
+    recipients: Iterable,
+    deliver: Callable[..., Awaitable[List[int]]],
+    concurrency: int,
+    on_result: Optional[Callable[[DeliveryResult], Awaitable]] = None
+) -> FanOutSummary:
+    """
+    Deliver to all recipients from a fixed set of coroutines on the running event loop.
+
+    The asyncio counterpart of fan_out: every recipient is still handled by
+    one coroutine from start to finish, but waiting on the Bot API costs a
+    coroutine instead of a thread, so hundreds of sends can be in flight.
+
+    Args:
+        recipients (Iterable): Recipients exposing a ``chat_id`` attribute.
+        deliver (Callable): Coroutine function sending the post to one recipient, returning its message IDs.
+        concurrency (int): Maximum number of recipients handled at once.
+        on_result (Callable): Coroutine function awaited with every result as soon as it is known.
+            Errors are handled as in fan_out.
+
+    Returns:
+        FanOutSummary: Results in recipient order.
+    """
+    recipients = list(recipients)
+    results: List[Optional[DeliveryResult]] = [None] * len(recipients)
+    pending = iter(enumerate(recipients))
+    errors: List[Exception] = []
+
+    async def worker() -> None:
+        while not errors:
+            item = next(pending, None)
+            if item is None:
+                return
+            index, rec = item
+            try:
+                results[index] = DeliveryResult(rec.chat_id, message_ids=await deliver(rec))
+            except Exception as e:
+                results[index] = DeliveryResult(
+                    rec.chat_id,
+                    error=str(e) or e.__class__.__name__,
+                    retry_after=getattr(e, 'retry_after', None)
+                )
+            if on_result is not None:
+                try:
+                    await on_result(results[index])
+                except Exception as e:
+                    errors.append(e)
+
+    workers = max(1, min(concurrency, len(recipients)))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if errors:
+        raise errors[0]
+    return FanOutSummary(results)
@@ -13,6 +13,7 @@ from django.utils import timezone
 
 from chat_groups.models import ChatGroup
 from telegram_accounts.models import TelegramChat
+from tgpostman.fields import OwnedModelMultipleChoiceField
 
 # --------------------------------------------------------------------------------
 
@@ -112,7 +113,7 @@ class CreatePostForm(forms.Form):
         required=False,
         help_text="URL для inline-кнопки"
     )
-    targets = forms.ModelMultipleChoiceField(
+    targets = OwnedModelMultipleChoiceField(
         queryset=TelegramChat.objects.none(),
         widget=forms.SelectMultiple(attrs={
             'class': 'form-control',
@@ -121,7 +122,7 @@ class CreatePostForm(forms.Form):
         required=False,
         label='Чаты/каналы'
     )
-    groups = forms.ModelMultipleChoiceField(
+    groups = OwnedModelMultipleChoiceField(
         queryset=ChatGroup.objects.none(),
         widget=forms.SelectMultiple(attrs={
             'class': 'form-control',
@@ -0,0 +1,189 @@
+"""
+Delivery ledger
+Per-recipient delivery records making retries of partially failed posts idempotent.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import threading
+from typing import Iterable, List
+
+from django.conf import settings
+from django.utils import timezone
+
+from .fanout import DeliveryResult, FanOutSummary
+from .models import PostDelivery, ScheduledPost
+
+# --------------------------------------------------------------------------------
+# LEDGER API
+
+
+def undelivered(post: ScheduledPost, recipients: Iterable) -> list:
+    """
+    Drop recipients that have already received the post.
+
+    Args:
+        post (ScheduledPost): Post being sent.
+        recipients (Iterable): Recipients exposing a ``chat_id`` attribute.
+
+    Returns:
+        list: Recipients still waiting for the post, in the original order.
+    """
+    delivered = set(PostDelivery.objects.filter(
+        post=post,
+        status='sent'
+    ).values_list('chat_id', flat=True))
+    return [rec for rec in recipients if rec.chat_id not in delivered]
+
+
+def record(post: ScheduledPost, results: List[DeliveryResult]) -> None:
+    """
+    Store the outcome of one delivery attempt per recipient.
+
+    All rows are written with a single upsert, so a run racing another run of
+    the same post updates the rows that run inserted instead of failing.
+    A recipient already marked sent is never downgraded by a later failure.
+    Deferred recipients stay pending until they run out of TELEGRAM_DELIVERY_MAX_ATTEMPTS.
+
+    Args:
+        post (ScheduledPost): Delivered post.
+        results (list[DeliveryResult]): Results of the attempt.
+    """
+    if not results:
+        return
+    now = timezone.now()
+    existing = {
+        delivery.chat_id: delivery
+        for delivery in PostDelivery.objects.filter(post=post, chat_id__in=[r.chat_id for r in results])
+    }
+
+    deliveries = {}
+    for result in results:
+        delivery = existing.get(result.chat_id)
+        if delivery is None:
+            delivery = PostDelivery(post=post, chat_id=result.chat_id, created_at=now)
+        elif delivery.status == 'sent' and not result.ok:
+            continue
+        delivery.attempts += 1
+        if result.ok:
+            delivery.status = 'sent'
+        elif result.deferred and delivery.attempts < settings.TELEGRAM_DELIVERY_MAX_ATTEMPTS:
+            delivery.status = 'pending'
+        else:
+            delivery.status = 'failed'
+        delivery.message_ids = result.message_ids
+        delivery.error = result.error
+        delivery.updated_at = now
+        deliveries[result.chat_id] = delivery
+
+    PostDelivery.objects.bulk_create(
+        list(deliveries.values()),
+        update_conflicts=True,
+        unique_fields=['post', 'chat_id'],
+        update_fields=['status', 'attempts', 'message_ids', 'error', 'updated_at']
+    )
+
+
+class Recorder:
+    """
+    Buffer of delivery results written to the ledger while a fan-out runs.
+
+    Results are stored in batches of POST_LEDGER_BATCH_SIZE, so a crashed
+    worker loses at most one batch instead of the whole attempt.
+
+    Args:
+        post (ScheduledPost): Post being delivered.
+    """
+
+    def __init__(self, post: ScheduledPost):
+        self.post = post
+        self._pending: List[DeliveryResult] = []
+        self._lock = threading.Lock()
+
+    def add(self, result: DeliveryResult) -> bool:
+        """
+        Buffer one result.
+
+        Args:
+            result (DeliveryResult): Result of a finished delivery.
+
+        Returns:
+            bool: True once a full batch is waiting to be flushed.
+        """
+        with self._lock:
+            self._pending.append(result)
+            return len(self._pending) >= settings.POST_LEDGER_BATCH_SIZE
+
+    def flush(self) -> None:
+        """
+        Write the buffered results to the ledger.
+
+        A batch that fails to be written stays buffered for the next flush.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+        try:
+            record(self.post, batch)
+        except Exception:
+            with self._lock:
+                self._pending[:0] = batch
+            raise
+
+    def __call__(self, result: DeliveryResult) -> None:
+        """
+        Buffer one result and write the batch once it is full.
+
+        Args:
+            result (DeliveryResult): Result of a finished delivery.
+        """
+        if self.add(result):
+            self.flush()
+
+
+def deferred(post: ScheduledPost, recipients: Iterable) -> list:
+    """
+    Keep only recipients whose delivery was postponed by a flood wait.
+
+    Args:
+        post (ScheduledPost): Post being sent.
+        recipients (Iterable): Recipients exposing a ``chat_id`` attribute.
+
+    Returns:
+        list: Deferred recipients, in the original order.
+    """
+    pending = set(PostDelivery.objects.filter(
+        post=post,
+        status='pending'
+    ).values_list('chat_id', flat=True))
+    return [rec for rec in recipients if rec.chat_id in pending]
+
+
+def summary(post_id: int) -> FanOutSummary:
+    """
+    Build the overall delivery outcome of a post from its ledger.
+
+    Args:
+        post_id (int): ID of the ScheduledPost.
+
+    Returns:
+        FanOutSummary: One result per recorded recipient.
+    """
+    rows = PostDelivery.objects.filter(post_id=post_id).order_by('id').values_list('chat_id', 'status', 'error')
+    return FanOutSummary([
+        DeliveryResult(chat_id, error=None if status == 'sent' else error or status)
+        for chat_id, status, error in rows
+    ])
+
+
+def can_retry(post: ScheduledPost) -> bool:
+    """
+    Check whether a failed post has recipients left to retry.
+
+    Args:
+        post (ScheduledPost): Post to check.
+
+    Returns:
+        bool: True if the post failed and at least one recipient was not delivered.
+    """
+    return post.status == 'failed' and post.deliveries.filter(status='failed').exists()
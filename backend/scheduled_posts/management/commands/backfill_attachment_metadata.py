@@ -0,0 +1,69 @@
+"""
+Backfill attachment metadata
+Management command computing media kind, MIME type, size and hash of attachments saved before they were stored.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+from django.core.management.base import BaseCommand
+
+from scheduled_posts.attachments import describe
+from scheduled_posts.models import ScheduledPostAttachment
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+FIELDS = ['media_kind', 'mime_type', 'size', 'content_hash']
+
+# --------------------------------------------------------------------------------
+
+
+class Command(BaseCommand):
+    """
+    Fill metadata fields of attachments that do not have them yet.
+    """
+
+    help = 'Compute media kind, MIME type, size and content hash of existing attachments.'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+
+        Args:
+            parser (ArgumentParser): Command argument parser.
+        """
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows saved per UPDATE query.')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Read every attachment without metadata once and save the results in batches.
+
+        Args:
+            *args: Positional arguments.
+            **options: Parsed command options.
+        """
+        batch_size = options['batch_size']
+        pending = ScheduledPostAttachment.objects.filter(content_hash='').order_by('id')
+
+        batch = []
+        updated = missing = 0
+        for att in pending.iterator(chunk_size=batch_size):
+            try:
+                with att.file.open('rb') as f:
+                    values = describe(f, att.original_name)
+            except FileNotFoundError:
+                missing += 1
+                continue
+            for field, value in values.items():
+                setattr(att, field, value)
+            batch.append(att)
+            if len(batch) >= batch_size:
+                ScheduledPostAttachment.objects.bulk_update(batch, FIELDS)
+                updated += len(batch)
+                batch = []
+        if batch:
+            ScheduledPostAttachment.objects.bulk_update(batch, FIELDS)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} attachments, {missing} files not found."))
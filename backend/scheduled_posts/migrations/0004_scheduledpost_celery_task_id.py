@@ -9,10 +9,17 @@ class Migration(migrations.Migration):
         ('scheduled_posts', '0003_initial'),
     ]
 
+    # 0001_initial already creates the column: only the migration state is updated here,
+    # so migrating an empty database does not fail with DuplicateColumn.
     operations = [
-        migrations.AddField(
-            model_name='scheduledpost',
-            name='celery_task_id',
-            field=models.CharField(blank=True, max_length=255, null=True),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='scheduledpost',
+                    name='celery_task_id',
+                    field=models.CharField(blank=True, max_length=255, null=True),
+                ),
+            ],
+            database_operations=[],
         ),
     ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduled_posts', '0004_scheduledpost_celery_task_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_hash', models.CharField(max_length=64)),
+                ('language', models.CharField(max_length=10)),
+                ('text', models.TextField()),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'unique_together': {('source_hash', 'language')},
+            },
+        ),
+    ]
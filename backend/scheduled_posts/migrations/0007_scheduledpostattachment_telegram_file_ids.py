@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduled_posts', '0006_ratelimitbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpostattachment',
+            name='telegram_file_ids',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
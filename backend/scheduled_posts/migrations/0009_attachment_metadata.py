@@ -0,0 +1,33 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduled_posts', '0008_postdelivery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpostattachment',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='scheduledpostattachment',
+            name='media_kind',
+            field=models.CharField(blank=True, choices=[('photo', 'Photo'), ('video', 'Video'), ('audio', 'Audio'), ('document', 'Document')], max_length=10),
+        ),
+        migrations.AddField(
+            model_name='scheduledpostattachment',
+            name='mime_type',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='scheduledpostattachment',
+            name='size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduled_posts', '0009_attachment_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledPostVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, max_length=10)),
+                ('text', models.TextField(blank=True)),
+                ('button_text', models.CharField(blank=True, max_length=255, null=True)),
+                ('reply_markup', models.TextField(blank=True, null=True)),
+                ('media', models.JSONField(blank=True, default=list)),
+                ('source_hash', models.CharField(max_length=64)),
+                ('prepared_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='scheduled_posts.scheduledpost')),
+            ],
+            options={
+                'unique_together': {('post', 'language')},
+            },
+        ),
+    ]
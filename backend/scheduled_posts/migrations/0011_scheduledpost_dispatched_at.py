@@ -0,0 +1,36 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+def mark_enqueued_posts(apps, schema_editor):
+    """
+    Posts created before the dispatcher already have an ETA task in the broker.
+    """
+    ScheduledPost = apps.get_model('scheduled_posts', 'ScheduledPost')
+    ScheduledPost.objects.filter(celery_task_id__isnull=False).update(dispatched_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_groups', '0002_initial'),
+        ('scheduled_posts', '0010_scheduledpostvariant'),
+        ('telegram_accounts', '0003_alter_telegramchat_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_enqueued_posts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=models.Index(condition=models.Q(('dispatched_at__isnull', True)), fields=['status', 'schedule_time'], name='scheduledpost_due_idx'),
+        ),
+    ]
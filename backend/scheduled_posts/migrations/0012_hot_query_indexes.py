@@ -0,0 +1,29 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_groups', '0003_hot_query_indexes'),
+        ('scheduled_posts', '0011_scheduledpost_dispatched_at'),
+        ('telegram_accounts', '0005_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['schedule_time'], name='scheduledpost_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=models.Index(fields=['user', '-schedule_time'], name='scheduledpost_user_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=models.Index(fields=['user', '-created_at'], name='scheduledpost_user_created_idx'),
+        ),
+    ]
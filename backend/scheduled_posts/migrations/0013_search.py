@@ -0,0 +1,35 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_groups', '0003_hot_query_indexes'),
+        ('scheduled_posts', '0012_hot_query_indexes'),
+        ('telegram_accounts', '0006_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('content', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='scheduledpost_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('content'), name='gin_trgm_ops'), name='scheduledpost_trgm_idx'),
+        ),
+    ]
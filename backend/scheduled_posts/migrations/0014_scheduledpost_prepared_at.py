@@ -0,0 +1,26 @@
+# Generated by Django 5.1.8 on 2026-10-18 07:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_groups', '0004_group_listing_index'),
+        ('scheduled_posts', '0013_search'),
+        ('telegram_accounts', '0008_chat_validation_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='prepared_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=models.Index(condition=models.Q(('prepared_at__isnull', True)), fields=['status', 'schedule_time'], name='scheduledpost_prepare_idx'),
+        ),
+    ]
@@ -14,6 +14,7 @@ from django.utils import timezone
 
 from chat_groups.models import ChatGroup
 from telegram_accounts.models import TelegramChat
+from tgpostman.search import search_indexes, search_vector_field
 
 
 # --------------------------------------------------------------------------------
@@ -32,6 +33,9 @@ class ScheduledPost(models.Model):
         status (str): Current status of the post.
         error_message (str): Error info if sending failed.
         celery_task_id (str): ID of the Celery task.
+        dispatched_at (datetime): When the send task was enqueued.
+        prepared_at (datetime): When the variants were re-rendered ahead of the send.
+        search_vector (SearchVector): Full-text vector of the content, maintained by the database.
         button_text (str): Optional inline button text.
         button_url (str): Optional inline button URL.
         targets (QuerySet): Selected individual chats.
@@ -52,6 +56,9 @@ class ScheduledPost(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     error_message = models.TextField(blank=True, null=True)
     celery_task_id = models.CharField(max_length=255, blank=True, null=True)
+    dispatched_at = models.DateTimeField(blank=True, null=True)
+    prepared_at = models.DateTimeField(blank=True, null=True)
+    search_vector = search_vector_field('content')
 
     button_text = models.CharField(
         max_length=255,
@@ -78,6 +85,28 @@ class ScheduledPost(models.Model):
         help_text='Группы чатов'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'schedule_time'],
+                name='scheduledpost_due_idx',
+                condition=models.Q(dispatched_at__isnull=True)
+            ),
+            models.Index(
+                fields=['status', 'schedule_time'],
+                name='scheduledpost_prepare_idx',
+                condition=models.Q(prepared_at__isnull=True)
+            ),
+            models.Index(
+                fields=['schedule_time'],
+                name='scheduledpost_pending_idx',
+                condition=models.Q(status='pending')
+            ),
+            models.Index(fields=['user', '-schedule_time'], name='scheduledpost_user_sched_idx'),
+            models.Index(fields=['user', '-created_at'], name='scheduledpost_user_created_idx'),
+            *search_indexes('scheduledpost', 'content'),
+        ]
+
     def save(self, *args, **kwargs) -> None:
         """
         Save the scheduled post, defaulting schedule_time if not set.
@@ -120,8 +149,20 @@ class ScheduledPostAttachment(models.Model):
         post (ScheduledPost): Related scheduled post.
         file (File): Uploaded file.
         original_name (str): Name of the file at upload.
+        telegram_file_ids (dict): Telegram file_id per media kind, reused instead of re-uploading.
+        media_kind (str): Telegram media kind used to send the file.
+        mime_type (str): MIME type guessed from the file name.
+        size (int): File size in bytes.
+        content_hash (str): SHA-256 hex digest of the file content.
     """
 
+    MEDIA_KIND_CHOICES = [
+        ('photo', 'Photo'),
+        ('video', 'Video'),
+        ('audio', 'Audio'),
+        ('document', 'Document'),
+    ]
+
     post = models.ForeignKey(
         ScheduledPost,
         related_name='attachments',
@@ -129,6 +170,11 @@ class ScheduledPostAttachment(models.Model):
     )
     file = models.FileField(upload_to='uploads/')
     original_name = models.CharField(max_length=255)
+    telegram_file_ids = models.JSONField(default=dict, blank=True)
+    media_kind = models.CharField(max_length=10, choices=MEDIA_KIND_CHOICES, blank=True)
+    mime_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField(blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True)
 
     def __str__(self) -> str:
         """
@@ -138,3 +184,156 @@ class ScheduledPostAttachment(models.Model):
             str: Original filename and related post ID.
         """
         return f"{self.original_name} (post {self.post.id})"
+
+
+# --------------------------------------------------------------------------------
+
+
+class ScheduledPostVariant(models.Model):
+    """
+    Model storing a post pre-rendered for one recipient language.
+
+    Attributes:
+        post (ScheduledPost): Rendered post.
+        language (str): Target language code, empty for the original text.
+        text (str): Message text in the target language.
+        button_text (str): Inline button text in the target language.
+        reply_markup (str): Serialized inline keyboard sent as is.
+        media (list): Attachment IDs with the media kind used to send each.
+        source_hash (str): Hash of the post fields the variant was rendered from.
+        prepared_at (datetime): When the variant was rendered.
+    """
+
+    post = models.ForeignKey(
+        ScheduledPost,
+        related_name='variants',
+        on_delete=models.CASCADE
+    )
+    language = models.CharField(max_length=10, blank=True)
+    text = models.TextField(blank=True)
+    button_text = models.CharField(max_length=255, blank=True, null=True)
+    reply_markup = models.TextField(blank=True, null=True)
+    media = models.JSONField(default=list, blank=True)
+    source_hash = models.CharField(max_length=64)
+    prepared_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('post', 'language')
+
+    def __str__(self) -> str:
+        """
+        Return string representation of the variant.
+
+        Returns:
+            str: Post ID and language.
+        """
+        return f"Post {self.post_id} [{self.language or 'original'}]"
+
+
+# --------------------------------------------------------------------------------
+
+
+class TranslationCacheEntry(models.Model):
+    """
+    Model storing a cached translation of a text into a target language.
+
+    Attributes:
+        source_hash (str): SHA-256 hex digest of the source text.
+        language (str): Target language code.
+        text (str): Translated text.
+        created_at (datetime): When the translation was stored.
+    """
+
+    source_hash = models.CharField(max_length=64)
+    language = models.CharField(max_length=10)
+    text = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        unique_together = ('source_hash', 'language')
+
+    def __str__(self) -> str:
+        """
+        Return string representation of the cache entry.
+
+        Returns:
+            str: Source hash prefix and target language.
+        """
+        return f"{self.source_hash[:12]} -> {self.language}"
+
+
+# --------------------------------------------------------------------------------
+
+
+class RateLimitBucket(models.Model):
+    """
+    Model storing the state of a token bucket shared between worker processes.
+
+    Attributes:
+        key (str): Bucket identifier (global, chat or group chat).
+        tokens (float): Tokens left at updated_at.
+        updated_at (float): Unix timestamp of the last reserved send, in the future while sends are queued.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()
+
+    def __str__(self) -> str:
+        """
+        Return string representation of the bucket.
+
+        Returns:
+            str: Bucket key and remaining tokens.
+        """
+        return f"{self.key}: {self.tokens:.2f}"
+
+
+# --------------------------------------------------------------------------------
+
+
+class PostDelivery(models.Model):
+    """
+    Model recording delivery of a scheduled post to a single chat.
+
+    Attributes:
+        post (ScheduledPost): Delivered post.
+        chat_id (int): Telegram chat ID of the recipient.
+        status (str): Delivery status of this recipient.
+        attempts (int): Number of delivery attempts so far.
+        message_ids (list): Telegram message IDs of the delivered messages.
+        error (str): Error of the last failed attempt.
+        created_at (datetime): When the first attempt was made.
+        updated_at (datetime): When the last attempt was made.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    post = models.ForeignKey(
+        ScheduledPost,
+        related_name='deliveries',
+        on_delete=models.CASCADE
+    )
+    chat_id = models.BigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    message_ids = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('post', 'chat_id')
+
+    def __str__(self) -> str:
+        """
+        Return string representation of the delivery.
+
+        Returns:
+            str: Post ID, chat ID and status.
+        """
+        return f"Post {self.post_id} -> {self.chat_id}: {self.status}"
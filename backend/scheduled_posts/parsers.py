@@ -0,0 +1,54 @@
+"""
+Request parsers
+Parser for newline-delimited JSON request bodies.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+# --------------------------------------------------------------------------------
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses an NDJSON stream (one JSON document per line) into a list.
+
+    The body is decoded line by line, so a large batch never has to be held
+    as one JSON string. Blank lines are skipped.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None) -> list:
+        """
+        Parse the request body.
+
+        Args:
+            stream (IO): Request body.
+            media_type (str): Content type of the request.
+            parser_context (dict): Extra parser context.
+
+        Returns:
+            list: Parsed documents.
+
+        Raises:
+            ParseError: If a line is not valid JSON.
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for number, line in enumerate(codecs.getreader(encoding)(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                raise ParseError(f'NDJSON parse error on line {number}: {e}')
+        return items
@@ -7,14 +7,15 @@ Functions for preparing and sending scheduled posts via Telegram.
 # IMPORTS
 
 import asyncio
-import io
-import mimetypes
-import os
-from typing import Optional
-
-from decouple import config
-from googletrans import Translator
-from telebot import TeleBot
+import hashlib
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import CharField, Value
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from telebot.apihelper import ApiTelegramException
 from telebot.types import (
     InputMediaPhoto, InputMediaVideo,
@@ -23,237 +24,567 @@ from telebot.types import (
 )
 
 from chat_groups.models import ChatGroupMember
-from .models import ScheduledPost
+from tgpostman.telegram import bot
+from . import ledger, translation_cache
+from .attachments import AttachmentLoader, guess_mime_type, media_kind
+from .fanout import FanOutSummary, fan_out
+from .models import ScheduledPost, ScheduledPostAttachment, ScheduledPostVariant
+from .rate_limiter import RateLimiter
+from .retry import call_with_retry
 
 # --------------------------------------------------------------------------------
 # CONSTANTS
 
-MAX_MEDIA_SIZE = 5 * 1024 * 1024  # 5MB file size limit
-
-IMAGE_EXT = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
-VIDEO_EXT = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.mpeg', '.mpg'}
-AUDIO_EXT = {'.mp3', '.ogg', '.wav', '.m4a', '.aac', '.flac'}
+INPUT_MEDIA = {
+    'photo': InputMediaPhoto,
+    'video': InputMediaVideo,
+    'audio': InputMediaAudio,
+    'document': InputMediaDocument,
+}
 
 # --------------------------------------------------------------------------------
-# BOT INITIALIZATION
+# CLIENTS
+
+
+def _make_translator():
+    """
+    Create the Google Translate client, importing googletrans only when a post is translated.
+
+    Returns:
+        Translator: Translation client.
+    """
+    from googletrans import Translator
+
+    return Translator()
+
+
+translator = SimpleLazyObject(_make_translator)
+rate_limiter = RateLimiter.from_settings()
 
-BOT_TOKEN = config("TELEGRAM_BOT_TOKEN")
-bot = TeleBot(token=BOT_TOKEN)
-translator = Translator()
+_file_ids_lock = threading.Lock()
 
 # --------------------------------------------------------------------------------
 # HELPER FUNCTIONS
 
 
-def _translate_text(text: str, dest: str) -> str:
+def _google_translate_batch(pairs: List[Tuple[str, str]]) -> List[str]:
     """
-    Translate text into target language using Google Translate.
+    Translate several (text, language) pairs concurrently using Google Translate.
 
     Args:
-        text (str): Source text.
-        dest (str): Target language code.
+        pairs (list[tuple]): Source text and target language pairs.
 
     Returns:
-        str: Translated text.
+        list[str]: Translated texts in the order of the pairs.
     """
-    result = translator.translate(text, dest=dest)
-    if asyncio.iscoroutine(result):
-        result = asyncio.get_event_loop().run_until_complete(result)
-    return getattr(result, 'text', text)
+    results = [translator.translate(text, dest=dest) for text, dest in pairs]
+    coroutines = [result for result in results if asyncio.iscoroutine(result)]
+    if coroutines:
+        async def gather() -> list:
+            return await asyncio.gather(*coroutines)
+
+        # A private loop: the asyncio engine's asyncio.run() leaves the thread without a current one.
+        gathered = iter(asyncio.run(gather()))
+        results = [next(gathered) if asyncio.iscoroutine(result) else result for result in results]
+    return [getattr(result, 'text', text) for result, (text, _) in zip(results, pairs)]
+
+
+def _translate_variants(
+    post: ScheduledPost,
+    languages: Iterable[str]
+) -> Dict[str, Tuple[str, Optional[str]]]:
+    """
+    Translate post text and button label once per language.
+
+    All cache misses of all languages are translated in one concurrent batch.
 
+    Args:
+        post (ScheduledPost): Post being sent.
+        languages (Iterable[str]): Distinct target language codes.
 
-def _get_mime_type(filename: str, file_field=None) -> str:
+    Returns:
+        dict: (message text, button text) keyed by language code.
+    """
+    languages = list(languages)
+    with_button = bool(post.button_url and post.button_text)
+
+    pairs = []
+    if post.content:
+        pairs += [(post.content, lang) for lang in languages]
+    if with_button:
+        pairs += [(post.button_text, lang) for lang in languages]
+    translated = translation_cache.get_or_translate_many(pairs, _google_translate_batch)
+
+    return {
+        lang: (
+            translated[(post.content, lang)] if post.content else '',
+            translated[(post.button_text, lang)] if with_button else None,
+        )
+        for lang in languages
+    }
+
+
+def _attachment_kind(att) -> str:
     """
-    Determine MIME type of a file based on extension and size.
+    Return the stored media kind of an attachment.
+
+    Attachments saved before metadata was stored are classified on the fly.
 
     Args:
-        filename (str): File name to examine.
-        file_field (File): File object for size check.
+        att (ScheduledPostAttachment): Attachment to classify.
 
     Returns:
-        str: Guessed MIME type or fallback.
-    """
-    ext = os.path.splitext(filename)[1].lower()
-    if ext in IMAGE_EXT:
-        category = 'image'
-    elif ext in VIDEO_EXT:
-        category = 'video'
-    elif ext in AUDIO_EXT:
-        category = 'audio'
-    else:
-        return 'application/octet-stream'
-
-    if file_field:
-        try:
-            if file_field.size > MAX_MEDIA_SIZE:
-                return 'application/octet-stream'
-        except Exception:
-            pass
-
-    mime_type = mimetypes.guess_type(filename)[0]
-    return mime_type or f"{category}/*"
+        str: 'photo', 'video', 'audio' or 'document'.
+    """
+    if not att.media_kind:
+        att.media_kind = media_kind(guess_mime_type(att.original_name), att.file.size)
+    return att.media_kind
 
 
-def _choose_send_mode(attachments) -> str:
+def _choose_send_mode(kinds: List[str]) -> str:
     """
     Decide how to send the post depending on attachment types.
 
     Args:
-        attachments (list): List of attachments.
+        kinds (list[str]): Media kinds of the attachments.
 
     Returns:
         str: Sending mode: 'text', 'media_group', or 'doc_group'.
     """
-    if not attachments:
+    if not kinds:
         return 'text'
-    mimes = [_get_mime_type(att.original_name, att.file).lower() for att in attachments]
-    if all(m.startswith(('image', 'video', 'audio')) for m in mimes):
+    if 'document' not in kinds:
         return 'media_group'
     return 'doc_group'
 
+
+def _source_hash(post: ScheduledPost, media: list) -> str:
+    """
+    Hash the post fields a variant is rendered from.
+
+    Args:
+        post (ScheduledPost): Post being rendered.
+        media (list): Media descriptors of the post attachments.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    source = [post.content, post.html, post.button_text, post.button_url, media]
+    return hashlib.sha256(json.dumps(source).encode('utf-8')).hexdigest()
+
+
+def _build_markup(button_text: Optional[str], button_url: Optional[str]) -> Optional[str]:
+    """
+    Serialize the inline keyboard of a post variant.
+
+    Args:
+        button_text (str): Button text in the target language.
+        button_url (str): Button URL.
+
+    Returns:
+        str: Keyboard JSON accepted by the Bot API, or None without a button.
+    """
+    if not (button_text and button_url):
+        return None
+    markup = InlineKeyboardMarkup()
+    markup.add(InlineKeyboardButton(text=button_text, url=button_url))
+    return markup.to_json()
+
+
+def post_languages(post: ScheduledPost) -> List[str]:
+    """
+    Collect the distinct languages of the group members a post is sent to.
+
+    Args:
+        post (ScheduledPost): Post to inspect.
+
+    Returns:
+        list[str]: Language codes.
+    """
+    return list(ChatGroupMember.objects.filter(
+        group__scheduled_posts=post
+    ).order_by().values_list('language', flat=True).distinct())
+
+
+def prepare_variants(
+    post: ScheduledPost,
+    languages: Optional[Iterable[str]] = None
+) -> Dict[Optional[str], ScheduledPostVariant]:
+    """
+    Render and store the post once per language, reusing variants that are still current.
+
+    Only languages without an up-to-date variant are translated, in one batch.
+
+    Args:
+        post (ScheduledPost): Post to render.
+        languages (Iterable[str]): Target languages, all member languages of the post by default.
+
+    Returns:
+        dict: Variants keyed by language code, None for the original text.
+    """
+    languages = post_languages(post) if languages is None else list(languages)
+    media = [[att.pk, _attachment_kind(att)] for att in post.attachments.order_by('pk')]
+    source_hash = _source_hash(post, media)
+
+    variants = {
+        variant.language or None: variant
+        for variant in post.variants.filter(source_hash=source_hash, language__in=[''] + languages)
+    }
+    missing = [lang for lang in [None] + languages if lang not in variants]
+    if not missing:
+        return variants
+
+    rendered = _translate_variants(post, [lang for lang in missing if lang is not None])
+    rendered[None] = (post.content or '', post.button_text if post.button_url else None)
+    now = timezone.now()
+    created = [
+        ScheduledPostVariant(
+            post=post,
+            language=lang or '',
+            text=rendered[lang][0],
+            button_text=rendered[lang][1],
+            reply_markup=_build_markup(rendered[lang][1], post.button_url),
+            media=media,
+            source_hash=source_hash,
+            prepared_at=now
+        )
+        for lang in missing
+    ]
+    ScheduledPostVariant.objects.bulk_create(
+        created,
+        update_conflicts=True,
+        unique_fields=['post', 'language'],
+        update_fields=['text', 'button_text', 'reply_markup', 'media', 'source_hash', 'prepared_at']
+    )
+    variants.update((variant.language or None, variant) for variant in created)
+    return variants
+
 # --------------------------------------------------------------------------------
 
 
 class Recipient:
     """
-    Represents a Telegram message recipient with optional button.
+    Represents a Telegram message recipient.
+
+    Slotted, as large posts hold one instance per group member.
 
     Args:
         chat_id (int): Telegram chat ID.
-        message_text (str): Translated message text.
-        button_text (str): Translated inline button text.
+        language (str): Language to translate the post into, None for the original text.
     """
 
-    def __init__(
-        self,
-        chat_id: int,
-        message_text: Optional[str] = None,
-        button_text: Optional[str] = None
-    ):
+    __slots__ = ('chat_id', 'language')
+
+    def __init__(self, chat_id: int, language: Optional[str] = None):
         self.chat_id = chat_id
-        self.message_text = message_text
-        self.button_text = button_text
+        self.language = language
 
 # --------------------------------------------------------------------------------
 
 
-def send_post(post: ScheduledPost) -> None:
+class _SendContext:
     """
-    Send a scheduled post to all associated recipients.
+    Everything needed to deliver one post, shared by all fan-out workers.
 
     Args:
-        post (ScheduledPost): Post instance to send.
+        post (ScheduledPost): Post being sent.
+        attachments (list): Post attachments.
+        variants (dict): Prepared ScheduledPostVariant keyed by recipient language.
+        loader (AttachmentLoader): Loader holding the post's open files.
+    """
+
+    def __init__(self, post: ScheduledPost, attachments: list, variants: dict, loader: AttachmentLoader):
+        self.post = post
+        self.attachments = attachments
+        self.variants = variants
+        self.loader = loader
+        kinds = dict(variants[None].media)
+        self.kinds = [kinds.get(att.pk) or _attachment_kind(att) for att in attachments]
+        self.mode = _choose_send_mode(self.kinds)
+        # Kinds the attachments are sent as: a document group sends everything as documents.
+        self.send_kinds = ['document'] * len(attachments) if self.mode == 'doc_group' else self.kinds
+        # Set once Telegram rejects the media group: the attachments then go out as single documents.
+        self.documents_only = False
+        self.parse_mode = 'HTML' if post.html else None
+
+    def uploaded(self) -> bool:
+        """
+        Check whether every attachment has a file_id for the kind it is sent as.
+
+        Returns:
+            bool: True if no attachment needs to be uploaded.
+        """
+        kinds = ['document'] * len(self.attachments) if self.documents_only else self.send_kinds
+        with _file_ids_lock:
+            return all(att.telegram_file_ids.get(kind) for att, kind in zip(self.attachments, kinds))
+
+# --------------------------------------------------------------------------------
+
+
+def _rewind(kwargs: dict) -> None:
+    """
+    Move every file argument of a send back to its start.
+
+    An attempt reads uploaded files to the end, so without this a retried
+    call would upload them empty.
+
+    Args:
+        kwargs (dict): Arguments of the send method, InputMedia lists included.
+    """
+    for value in kwargs.values():
+        for item in value if isinstance(value, list) else [value]:
+            media = getattr(item, 'media', item)
+            if hasattr(media, 'seek'):
+                media.seek(0)
+
+
+def _send(method: str, chat_id: int, **kwargs):
+    """
+    Call a Bot API send method once the rate limiter allows it.
+
+    Flood waits and transient errors are retried, every attempt taking a new
+    rate limiter slot and uploading files from their start.
+
+    Args:
+        method (str): Name of the TeleBot method, e.g. 'send_message'.
+        chat_id (int): Telegram chat ID.
+        **kwargs: Arguments of the method.
 
     Returns:
-        None
+        Result of the Bot API call.
+
+    Raises:
+        DeliveryDeferred: If Telegram asked to wait too long to retry inline.
     """
-    if post.status.lower() != 'pending':
-        return
-
-    parse_mode = 'HTML' if post.html else None
-
-    recipients = []
-    seen = set()
-
-    # Collect from groups
-    for group in post.groups.all():
-        for member in ChatGroupMember.objects.filter(group=group):
-            if member.chat_id in seen:
-                continue
-            seen.add(member.chat_id)
-            text = _translate_text(post.content, dest=member.language) if post.content else ''
-            btn_text = None
-            if post.button_url and post.button_text:
-                btn_text = _translate_text(post.button_text, dest=member.language)
-            recipients.append(Recipient(chat_id=member.chat_id, message_text=text, button_text=btn_text))
-
-    # Collect from individual targets
-    for chat in post.targets.all():
-        if chat.chat_id in seen:
-            continue
-        seen.add(chat.chat_id)
-        recipients.append(Recipient(
-            chat_id=chat.chat_id,
-            message_text=post.content or '',
-            button_text=post.button_text if post.button_url and post.button_text else None
-        ))
+    def call():
+        rate_limiter.acquire(chat_id)
+        _rewind(kwargs)
+        return getattr(bot, method)(chat_id=chat_id, **kwargs)
 
-    attachments = list(post.attachments.all())
-    mode = _choose_send_mode(attachments)
-
-    for rec in recipients:
-        markup = None
-        if rec.button_text and post.button_url:
-            markup = InlineKeyboardMarkup()
-            markup.add(InlineKeyboardButton(text=rec.button_text, url=post.button_url))
-
-        if mode == 'text':
-            bot.send_message(
-                chat_id=rec.chat_id,
-                text=rec.message_text,
-                parse_mode=parse_mode,
-                reply_markup=markup
-            )
-            continue
-
-        if len(attachments) == 1:
-            att = attachments[0]
-            data = att.file.open('rb').read()
-            bio = io.BytesIO(data)
-            bio.name = att.original_name
-            bio.seek(0)
-            mime = _get_mime_type(att.original_name, att.file).lower()
-
-            send_kwargs = {'chat_id': rec.chat_id, 'reply_markup': markup}
-            if rec.message_text:
-                send_kwargs.update({'caption': rec.message_text, 'parse_mode': parse_mode})
-
-            if mime.startswith('image'):
-                bot.send_photo(photo=bio, **send_kwargs)
-            elif mime.startswith('video'):
-                bot.send_video(video=bio, **send_kwargs)
-            elif mime.startswith('audio'):
-                bot.send_audio(audio=bio, **send_kwargs)
-            else:
-                bot.send_document(document=bio, **send_kwargs)
-            continue
-
-        blobs = []
-        for att in attachments:
-            data = att.file.open('rb').read()
-            bio = io.BytesIO(data)
-            bio.name = att.original_name
-            bio.seek(0)
-            mime = _get_mime_type(att.original_name, att.file).lower()
-            if mode == 'media_group':
-                if mime.startswith('image'):
-                    blobs.append(InputMediaPhoto(media=bio))
-                elif mime.startswith('video'):
-                    blobs.append(InputMediaVideo(media=bio))
-                elif mime.startswith('audio'):
-                    blobs.append(InputMediaAudio(media=bio))
-            else:
-                blobs.append(InputMediaDocument(media=bio))
+    return call_with_retry(call)
+
+
+def _media(att, kind: str, loader: AttachmentLoader):
+    """
+    Return the already uploaded file_id of an attachment, or its content for upload.
+
+    Args:
+        att (ScheduledPostAttachment): Attachment to send.
+        kind (str): Telegram media kind.
+        loader (AttachmentLoader): Loader holding the post's open files.
+
+    Returns:
+        str | AttachmentView: Cached file_id or file content.
+    """
+    with _file_ids_lock:
+        file_id = att.telegram_file_ids.get(kind)
+    return file_id or loader.open(att)
+
+
+def _remember_file_id(att, kind: str, message) -> None:
+    """
+    Keep the file_id Telegram assigned to an uploaded attachment.
+
+    Args:
+        att (ScheduledPostAttachment): Uploaded attachment.
+        kind (str): Telegram media kind.
+        message (Message): Message returned by the Bot API.
+    """
+    media = getattr(message, kind, None)
+    if kind == 'photo' and media:
+        media = media[-1]  # largest size
+    file_id = getattr(media, 'file_id', None)
+    if isinstance(file_id, str):
+        with _file_ids_lock:
+            att.telegram_file_ids[kind] = file_id
+
+
+def _message_ids(*messages) -> List[int]:
+    """
+    Extract Telegram message IDs from Bot API results.
+
+    Args:
+        *messages (Message): Messages returned by the Bot API.
+
+    Returns:
+        list[int]: IDs of the messages.
+    """
+    ids = [getattr(message, 'message_id', None) for message in messages]
+    return [message_id for message_id in ids if isinstance(message_id, int)]
+
+
+def _save_file_ids(attachments: list) -> None:
+    """
+    Persist captured file_ids so retries and re-sends skip the upload too.
+
+    Args:
+        attachments (list): Post attachments.
+    """
+    with _file_ids_lock:
+        ScheduledPostAttachment.objects.bulk_update(attachments, ['telegram_file_ids'])
+
+
+def _deliver(rec: Recipient, ctx: _SendContext) -> List[int]:
+    """
+    Send a post to one recipient, keeping the order of multi-message sends.
+
+    Args:
+        rec (Recipient): Recipient to send to.
+        ctx (_SendContext): Shared state of the post being sent.
 
-        if rec.message_text:
+    Returns:
+        list[int]: IDs of the sent messages.
+    """
+    attachments, loader = ctx.attachments, ctx.loader
+    mode, parse_mode = ctx.mode, ctx.parse_mode
+    variant = ctx.variants[rec.language]
+    message_text, markup = variant.text, variant.reply_markup
+
+    if mode == 'text':
+        message = _send(
+            'send_message',
+            chat_id=rec.chat_id,
+            text=message_text,
+            parse_mode=parse_mode,
+            reply_markup=markup
+        )
+        return _message_ids(message)
+
+    if len(attachments) == 1:
+        att = attachments[0]
+        kind = ctx.send_kinds[0]
+
+        send_kwargs = {'chat_id': rec.chat_id, 'reply_markup': markup}
+        if message_text:
+            send_kwargs.update({'caption': message_text, 'parse_mode': parse_mode})
+
+        message = _send(f'send_{kind}', **{kind: _media(att, kind, loader)}, **send_kwargs)
+        _remember_file_id(att, kind, message)
+        return _message_ids(message)
+
+    if not ctx.documents_only:
+        kinds = ctx.send_kinds
+        blobs = [INPUT_MEDIA[kind](media=_media(att, kind, loader)) for att, kind in zip(attachments, kinds)]
+
+        if message_text:
             if mode == 'media_group':
-                blobs[0].caption = rec.message_text
+                blobs[0].caption = message_text
                 blobs[0].parse_mode = parse_mode
             else:
-                blobs[-1].caption = rec.message_text
+                blobs[-1].caption = message_text
                 blobs[-1].parse_mode = parse_mode
 
         try:
-            bot.send_media_group(chat_id=rec.chat_id, media=blobs)
+            messages = _send('send_media_group', chat_id=rec.chat_id, media=blobs)
         except ApiTelegramException:
-            for idx, att in enumerate(attachments):
-                data = att.file.open('rb').read()
-                bio = io.BytesIO(data)
-                bio.name = att.original_name
-                bio.seek(0)
-                kwargs = {}
-                if idx == len(attachments) - 1 and rec.message_text:
-                    kwargs.update({'caption': rec.message_text, 'parse_mode': parse_mode})
-                if idx == len(attachments) - 1:
-                    kwargs['reply_markup'] = markup
-                bot.send_document(chat_id=rec.chat_id, document=bio, **kwargs)
+            ctx.documents_only = True
+        else:
+            for att, kind, message in zip(attachments, kinds, messages or []):
+                _remember_file_id(att, kind, message)
+            return _message_ids(*(messages or []))
+
+    messages = []
+    for idx, att in enumerate(attachments):
+        kwargs = {}
+        if idx == len(attachments) - 1 and message_text:
+            kwargs.update({'caption': message_text, 'parse_mode': parse_mode})
+        if idx == len(attachments) - 1:
+            kwargs['reply_markup'] = markup
+        message = _send('send_document', chat_id=rec.chat_id, document=_media(att, 'document', loader), **kwargs)
+        _remember_file_id(att, 'document', message)
+        messages.append(message)
+    return _message_ids(*messages)
+
+
+def resolve_recipients(post: ScheduledPost) -> List[Recipient]:
+    """
+    Collect unique recipients of a post from its groups and individual targets.
+
+    Deduplication happens in a single query: group members are made unique by
+    chat ID, and targets already present in a group are excluded. A chat in
+    several groups uses the language of its most recently created group.
+
+    Args:
+        post (ScheduledPost): Post to resolve.
+
+    Returns:
+        list[Recipient]: Group members first, then targets not present in any group.
+    """
+    members = ChatGroupMember.objects.filter(
+        group__scheduled_posts=post
+    ).order_by('chat_id', '-group_id').distinct('chat_id')
+    targets = post.targets.exclude(
+        chat_id__in=members.values('chat_id')
+    ).order_by().distinct()
+
+    rows = members.values_list('chat_id', 'language').union(
+        targets.values_list('chat_id', Value(None, output_field=CharField())),
+        all=True
+    )
+    return [Recipient(chat_id, language) for chat_id, language in rows.iterator()]
+
+
+def send_to_recipients(post: ScheduledPost, recipients: List[Recipient]) -> FanOutSummary:
+    """
+    Send a post to the given recipients concurrently.
+
+    Recipients who already received the post are skipped, and every attempt
+    is recorded in the delivery ledger in batches while the fan-out runs.
+    Variants prepared ahead of time are reused; only languages without one
+    are rendered before sending.
+
+    Args:
+        post (ScheduledPost): Post instance to send.
+        recipients (list[Recipient]): Recipients to deliver to.
+
+    Returns:
+        FanOutSummary: Per-recipient delivery results of this attempt.
+    """
+    recipients = ledger.undelivered(post, recipients)
+    languages = dict.fromkeys(rec.language for rec in recipients if rec.language is not None)
+    variants = prepare_variants(post, languages)
+    attachments = list(post.attachments.all())
+    recorder = ledger.Recorder(post)
+
+    with AttachmentLoader() as loader:
+        ctx = _SendContext(post, attachments, variants, loader)
+
+        def deliver(rec: Recipient) -> List[int]:
+            return _deliver(rec, ctx)
+
+        try:
+            # Upload attachments once: send sequentially until one recipient succeeds,
+            # everyone after that gets the cached file_id.
+            results = []
+            pending = recipients
+            while attachments and pending and not ctx.uploaded():
+                results += fan_out(pending[:1], deliver, max_workers=1, on_result=recorder).results
+                pending = pending[1:]
+                if results[-1].ok:
+                    break
+            if attachments:
+                _save_file_ids(attachments)
+
+            results += fan_out(
+                pending, deliver, max_workers=settings.POST_SENDER_CONCURRENCY, on_result=recorder
+            ).results
+            if attachments:
+                _save_file_ids(attachments)
+        finally:
+            recorder.flush()
+    return FanOutSummary(results)
+
+
+def send_post(post: ScheduledPost) -> FanOutSummary:
+    """
+    Send a scheduled post to all associated recipients concurrently.
+
+    Args:
+        post (ScheduledPost): Post instance to send.
+
+    Returns:
+        FanOutSummary: Per-recipient delivery results.
+    """
+    if post.status.lower() != 'pending':
+        return FanOutSummary([])
+    return send_to_recipients(post, resolve_recipients(post))
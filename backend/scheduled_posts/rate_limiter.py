@@ -0,0 +1,273 @@
+"""
+Telegram rate limiter
+Token buckets keeping Bot API traffic within Telegram limits across all workers.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import RateLimitBucket
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+PRUNE_EVERY = 1000  # reservations between deletions of idle buckets
+
+Bucket = Tuple[str, float, float]  # key, refill rate in tokens per second, maximum burst size
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def _available_at(tokens: float, updated_at: float, rate: float) -> float:
+    """
+    Compute when a bucket next holds a whole token.
+
+    Args:
+        tokens (float): Tokens left at updated_at.
+        updated_at (float): Unix timestamp of the last reservation.
+        rate (float): Refill rate in tokens per second.
+
+    Returns:
+        float: Unix timestamp of the earliest send the bucket allows.
+    """
+    return updated_at + max(0.0, 1 - tokens) / rate
+
+
+def _take(
+    tokens: float,
+    updated_at: float,
+    send_at: float,
+    rate: float,
+    capacity: float
+) -> Tuple[float, float]:
+    """
+    Refill a bucket up to the time of a send and take one token from it.
+
+    Args:
+        tokens (float): Tokens left at updated_at.
+        updated_at (float): Unix timestamp of the last reservation.
+        send_at (float): Unix timestamp the message will be sent at, never before the bucket allows it.
+        rate (float): Refill rate in tokens per second.
+        capacity (float): Maximum burst size.
+
+    Returns:
+        tuple: New token balance and its timestamp, send_at.
+    """
+    return min(capacity, tokens + (send_at - updated_at) * rate) - 1, send_at
+
+
+def _reserve(state: Dict[str, Tuple[float, float]], buckets: List[Bucket], now: float) -> float:
+    """
+    Reserve one send slot in several buckets at once.
+
+    The send time is the latest time any bucket allows, and every bucket is
+    charged at that time, not at the time of the call. A bucket with spare
+    capacity therefore does not refill early while the send waits for another
+    bucket, which would let later sends exceed its rate.
+
+    Args:
+        state (dict): (tokens, updated_at) per bucket key, updated in place; missing buckets are full.
+        buckets (list): Buckets to reserve from.
+        now (float): Current Unix timestamp.
+
+    Returns:
+        float: Seconds to wait before sending.
+    """
+    for key, _, capacity in buckets:
+        state.setdefault(key, (capacity, now))
+    send_at = max([now] + [_available_at(*state[key], rate) for key, rate, _ in buckets])
+    for key, rate, capacity in buckets:
+        state[key] = _take(*state[key], send_at, rate, capacity)
+    return send_at - now
+
+# --------------------------------------------------------------------------------
+
+
+class LocalBucketStore:
+    """
+    In-process bucket store, shared only by the threads of one worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._reservations = 0
+
+    def reserve(self, buckets: List[Bucket]) -> float:
+        """
+        Reserve one token from every bucket.
+
+        Args:
+            buckets (list): (key, rate, capacity) of the buckets.
+
+        Returns:
+            float: Seconds to wait before sending.
+        """
+        now = time.time()
+        with self._lock:
+            wait = _reserve(self._buckets, buckets, now)
+            self._reservations += 1
+            if self._reservations % PRUNE_EVERY == 0:
+                idle_since = now - settings.TELEGRAM_RATE_LIMIT_IDLE
+                for key in [key for key, (_, updated_at) in self._buckets.items() if updated_at < idle_since]:
+                    del self._buckets[key]
+        return wait
+
+# --------------------------------------------------------------------------------
+
+
+class DatabaseBucketStore:
+    """
+    PostgreSQL-backed bucket store shared by all worker processes and nodes.
+
+    A reservation locks all of its bucket rows in one transaction, always in
+    key order, so concurrent workers never deadlock. Buckets idle for
+    TELEGRAM_RATE_LIMIT_IDLE seconds are full again and their rows are deleted
+    periodically.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reservations = 0
+
+    def reserve(self, buckets: List[Bucket]) -> float:
+        """
+        Reserve one token from every bucket.
+
+        Args:
+            buckets (list): (key, rate, capacity) of the buckets.
+
+        Returns:
+            float: Seconds to wait before sending.
+        """
+        keys = [key for key, _, _ in buckets]
+        now = time.time()
+        with transaction.atomic():
+            rows = self._lock_rows(keys)
+            missing = [(key, capacity) for key, _, capacity in buckets if key not in rows]
+            if missing:
+                RateLimitBucket.objects.bulk_create(
+                    [RateLimitBucket(key=key, tokens=capacity, updated_at=now) for key, capacity in missing],
+                    ignore_conflicts=True
+                )
+                rows.update(self._lock_rows([key for key, _ in missing]))
+
+            state = {key: (row.tokens, row.updated_at) for key, row in rows.items()}
+            wait = _reserve(state, buckets, now)
+            for key, row in rows.items():
+                row.tokens, row.updated_at = state[key]
+            RateLimitBucket.objects.bulk_update(list(rows.values()), ['tokens', 'updated_at'])
+
+        with self._lock:
+            self._reservations += 1
+            run_prune = self._reservations % PRUNE_EVERY == 0
+        if run_prune:
+            self.prune()
+        return wait
+
+    @staticmethod
+    def _lock_rows(keys: List[str]) -> Dict[str, RateLimitBucket]:
+        """
+        Lock bucket rows in key order.
+
+        Args:
+            keys (list[str]): Bucket keys.
+
+        Returns:
+            dict: Locked rows keyed by bucket key; keys without a row are left out.
+        """
+        rows = RateLimitBucket.objects.select_for_update().filter(key__in=keys).order_by('key')
+        return {row.key: row for row in rows}
+
+    def prune(self) -> int:
+        """
+        Delete buckets idle for TELEGRAM_RATE_LIMIT_IDLE seconds.
+
+        Returns:
+            int: Number of deleted rows.
+        """
+        idle_since = time.time() - settings.TELEGRAM_RATE_LIMIT_IDLE
+        deleted, _ = RateLimitBucket.objects.filter(updated_at__lt=idle_since).delete()
+        return deleted
+
+# --------------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """
+    Combines the global, per-chat and per-group-chat Telegram limits.
+
+    Group chats are recognised by their negative ID; channels share that range
+    and are limited conservatively as well.
+
+    Args:
+        store: Bucket store implementing ``reserve(buckets)``.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    @classmethod
+    def from_settings(cls) -> 'RateLimiter':
+        """
+        Build a limiter using the store configured in TELEGRAM_RATE_LIMIT_STORE.
+
+        Returns:
+            RateLimiter: Configured limiter.
+        """
+        return cls(import_string(settings.TELEGRAM_RATE_LIMIT_STORE)())
+
+    def reserve(self, chat_id: int) -> float:
+        """
+        Reserve a send slot for a chat in every applicable bucket with one store call.
+
+        Args:
+            chat_id (int): Telegram chat ID.
+
+        Returns:
+            float: Seconds to wait before sending.
+        """
+        global_rate = settings.TELEGRAM_GLOBAL_RATE
+        chat_rate = settings.TELEGRAM_CHAT_RATE
+        buckets = [
+            ('global', global_rate, global_rate),
+            (f'chat:{chat_id}', chat_rate, max(1.0, chat_rate)),
+        ]
+        if chat_id < 0:
+            group_rate = settings.TELEGRAM_GROUP_RATE
+            buckets.append((f'group:{chat_id}', group_rate / 60, group_rate))
+        return self.store.reserve(buckets)
+
+    def acquire(self, chat_id: int) -> None:
+        """
+        Block until a message to the chat may be sent.
+
+        Args:
+            chat_id (int): Telegram chat ID.
+        """
+        wait = self.reserve(chat_id)
+        if wait:
+            time.sleep(wait)
+
+    def throttle(self, key: str, rate: float) -> None:
+        """
+        Block until a bucket of its own allows one more Bot API call.
+
+        Used for requests outside the send limits, such as chat lookups.
+
+        Args:
+            key (str): Bucket identifier.
+            rate (float): Calls per second.
+        """
+        wait = self.store.reserve([(key, rate, max(1.0, rate))])
+        if wait:
+            time.sleep(wait)
@@ -0,0 +1,170 @@
+"""
+Bot API retries
+Retry layer honouring Telegram flood-wait hints and backing off on transient errors.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+from django.conf import settings
+from requests.exceptions import ConnectionError, Timeout
+from telebot.apihelper import ApiHTTPException, ApiTelegramException
+
+# --------------------------------------------------------------------------------
+
+
+class DeliveryDeferred(Exception):
+    """
+    Raised when Telegram asks to wait longer than a worker should block.
+
+    The recipient is left for a rescheduled run instead of failing the post.
+
+    Args:
+        retry_after (float): Seconds Telegram asked to wait.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Flood wait: retry after {retry_after:g}s")
+        self.retry_after = retry_after
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """
+    Read the flood-wait delay from a Bot API error.
+
+    Args:
+        exc (Exception): Error raised by a Bot API call.
+
+    Returns:
+        float: Seconds to wait, or None if the error is not a 429.
+    """
+    if not isinstance(exc, ApiTelegramException) or exc.error_code != 429:
+        return None
+    parameters = exc.result_json.get('parameters') or {}
+    return float(parameters.get('retry_after', 1))
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    Check whether an error is worth retrying with backoff.
+
+    Args:
+        exc (Exception): Error raised by a Bot API call.
+
+    Returns:
+        bool: True for network errors and Telegram server errors.
+    """
+    if isinstance(exc, (ConnectionError, Timeout)):
+        return True
+    if isinstance(exc, ApiTelegramException):
+        return exc.error_code >= 500
+    if isinstance(exc, ApiHTTPException):
+        return getattr(exc.result, 'status_code', 0) >= 500
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Compute a jittered exponential backoff delay.
+
+    Args:
+        attempt (int): Number of the failed attempt, starting at 1.
+
+    Returns:
+        float: Seconds to wait before the next attempt.
+    """
+    delay = min(settings.TELEGRAM_RETRY_BACKOFF_MAX, settings.TELEGRAM_RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def next_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """
+    Decide how long to wait before retrying a failed Bot API call.
+
+    Args:
+        exc (Exception): Error raised by the call.
+        attempt (int): Number of the failed attempt, starting at 1.
+
+    Returns:
+        float: Seconds to wait, or None if the error should be raised.
+
+    Raises:
+        DeliveryDeferred: If Telegram asked to wait longer than TELEGRAM_RETRY_INLINE_MAX,
+            or the last attempt ended with a flood wait.
+    """
+    wait = retry_after(exc)
+    if wait is not None and wait > settings.TELEGRAM_RETRY_INLINE_MAX:
+        raise DeliveryDeferred(wait) from exc
+    if wait is None and not is_transient(exc):
+        return None
+    if attempt >= settings.TELEGRAM_SEND_MAX_ATTEMPTS:
+        if wait is not None:
+            raise DeliveryDeferred(wait) from exc
+        return None
+    return wait if wait is not None else backoff_delay(attempt)
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def call_with_retry(call: Callable, sleep: Callable[[float], None] = time.sleep):
+    """
+    Run a Bot API call, retrying flood waits and transient errors.
+
+    Short flood waits are slept through; longer ones raise DeliveryDeferred so
+    the worker can move on to other recipients. Other errors are raised at once.
+
+    Args:
+        call (Callable): Function performing one Bot API request.
+        sleep (Callable): Function used to wait between attempts.
+
+    Returns:
+        Result of the Bot API call.
+
+    Raises:
+        DeliveryDeferred: If Telegram asked to wait longer than TELEGRAM_RETRY_INLINE_MAX.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return call()
+        except Exception as e:
+            delay = next_delay(e, attempt)
+            if delay is None:
+                raise
+            sleep(delay)
+
+
+async def call_with_retry_async(call: Callable[[], Awaitable], sleep: Callable = asyncio.sleep):
+    """
+    Await a Bot API call with the same retry policy as call_with_retry.
+
+    Args:
+        call (Callable): Coroutine function performing one Bot API request.
+        sleep (Callable): Coroutine function used to wait between attempts.
+
+    Returns:
+        Result of the Bot API call.
+
+    Raises:
+        DeliveryDeferred: If Telegram asked to wait longer than TELEGRAM_RETRY_INLINE_MAX.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await call()
+        except Exception as e:
+            delay = next_delay(e, attempt)
+            if delay is None:
+                raise
+            await sleep(delay)
@@ -6,16 +6,21 @@ Serializer for creating and validating scheduled posts with attachments.
 # --------------------------------------------------------------------------------
 # IMPORTS
 
+import base64
+import binascii
 import uuid
 from datetime import timedelta
 
+from django.core.files.base import ContentFile
 from django.utils import timezone
 from rest_framework import serializers
 
 from chat_groups.models import ChatGroup
 from telegram_accounts.models import TelegramChat
+from tgpostman.fields import OwnedObjectsField
+from .attachments import describe
 from .models import ScheduledPost, ScheduledPostAttachment
-from .tasks import send_scheduled_post
+from .tasks import dispatch_post, schedule_preparation
 
 # --------------------------------------------------------------------------------
 
@@ -28,8 +33,8 @@ class ScheduledPostSerializer(serializers.ModelSerializer):
         attachments (list[File]): Files to attach to the post.
         delay_seconds (int): Delay in seconds until scheduled time.
         schedule_time (datetime): Specific datetime to schedule the post.
-        targets (list[int]): Telegram chat IDs.
-        groups (list[int]): Chat group IDs.
+        targets (list[int]): IDs of the user's Telegram chats.
+        groups (list[int]): IDs of the user's chat groups.
         button_text (str): Optional inline button text.
         button_url (str): Optional inline button URL.
 
@@ -37,8 +42,8 @@ class ScheduledPostSerializer(serializers.ModelSerializer):
         ScheduledPost: Created post instance with attachments and schedule.
     """
 
-    targets = serializers.PrimaryKeyRelatedField(queryset=TelegramChat.objects.all(), many=True)
-    groups = serializers.PrimaryKeyRelatedField(queryset=ChatGroup.objects.all(), many=True)
+    targets = OwnedObjectsField(TelegramChat)
+    groups = OwnedObjectsField(ChatGroup)
     attachments = serializers.ListField(
         child=serializers.FileField(), write_only=True, required=False
     )
@@ -98,10 +103,101 @@ class ScheduledPostSerializer(serializers.ModelSerializer):
             ScheduledPostAttachment.objects.create(
                 post=post,
                 file=f,
-                original_name=original_name
+                original_name=original_name,
+                **describe(f, original_name)
             )
 
-        task = send_scheduled_post.apply_async(args=[post.id], eta=post.schedule_time)
-        post.celery_task_id = task.id
-        post.save()
+        dispatch_post(post)
+        schedule_preparation(post)
         return post
+
+# --------------------------------------------------------------------------------
+
+
+class Base64AttachmentSerializer(serializers.Serializer):
+    """
+    Serializer for an attachment embedded in a JSON document.
+
+    Args:
+        name (str): Original file name.
+        content (str): Base64-encoded file content.
+
+    Returns:
+        ContentFile: Decoded file named after the original file.
+    """
+
+    name = serializers.CharField(max_length=200)
+    content = serializers.CharField()
+
+    def validate(self, attrs: dict) -> ContentFile:
+        """
+        Decode the file content.
+
+        Args:
+            attrs (dict): Name and Base64 content.
+
+        Returns:
+            ContentFile: Decoded file.
+        """
+        try:
+            data = base64.b64decode(attrs['content'], validate=True)
+        except (binascii.Error, ValueError):
+            raise serializers.ValidationError({'content': 'Некорректные данные base64.'})
+        return ContentFile(data, name=attrs['name'])
+
+# --------------------------------------------------------------------------------
+
+
+class BulkPostItemSerializer(serializers.ModelSerializer):
+    """
+    Serializer validating one post of a bulk creation request.
+
+    Targets and groups are plain ID lists here: their ownership is checked for
+    the whole batch at once by ``scheduled_posts.bulk``.
+
+    Args:
+        targets (list[int]): Telegram chat IDs.
+        groups (list[int]): Chat group IDs.
+        attachments (list[dict]): Base64-encoded files.
+        delay_seconds (int): Delay in seconds until scheduled time.
+        schedule_time (datetime): Specific datetime to schedule the post.
+
+    Returns:
+        dict: Validated post fields with ``schedule_time`` resolved.
+    """
+
+    targets = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    groups = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    attachments = Base64AttachmentSerializer(many=True, required=False, default=list)
+    delay_seconds = serializers.IntegerField(required=False, min_value=0)
+    schedule_time = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = ScheduledPost
+        fields = (
+            "content", "html", "attachments", "targets", "groups",
+            "schedule_time", "delay_seconds", "button_text", "button_url"
+        )
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Resolve the send time and drop duplicate IDs.
+
+        Args:
+            attrs (dict): Field values.
+
+        Returns:
+            dict: Validated values.
+        """
+        delay = attrs.pop('delay_seconds', None)
+        schedule_time = attrs.get('schedule_time')
+        if schedule_time:
+            if schedule_time < timezone.now():
+                raise serializers.ValidationError({'schedule_time': "Время отправки должно быть в будущем!"})
+        elif delay:
+            attrs['schedule_time'] = timezone.now() + timedelta(seconds=delay)
+        else:
+            attrs['schedule_time'] = timezone.now()
+        attrs['targets'] = list(dict.fromkeys(attrs['targets']))
+        attrs['groups'] = list(dict.fromkeys(attrs['groups']))
+        return attrs
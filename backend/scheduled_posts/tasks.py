@@ -1,45 +1,374 @@
 """
 Scheduled task
-This file defines a Celery task to send a scheduled post and update its status accordingly.
+This file defines Celery tasks to dispatch due posts, send them and update their status accordingly.
 """
 
 # --------------------------------------------------------------------------------
 # IMPORTS
 
-from celery import shared_task
+import logging
+from datetime import timedelta
+from importlib import import_module
+from typing import List, Optional
+
+from celery import chord, shared_task
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 
+from . import ledger, translation_cache
+from .fanout import DeliveryResult, FanOutSummary
 from .models import ScheduledPost
-from .post_sender import send_post
+from .post_sender import Recipient, prepare_variants, resolve_recipients
 
 # --------------------------------------------------------------------------------
-# CELERY TASK
+# LOGGING
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def send_to_recipients(post: ScheduledPost, recipients: List[Recipient]) -> FanOutSummary:
+    """
+    Deliver a post with the engine selected by POST_SENDER_ENGINE.
+
+    Args:
+        post (ScheduledPost): Post to send.
+        recipients (list[Recipient]): Recipients to deliver to.
+
+    Returns:
+        FanOutSummary: Per-recipient delivery results.
+    """
+    return import_module(settings.POST_SENDER_ENGINE).send_to_recipients(post, recipients)
+
+
+def _finish(post_id: int, summary: FanOutSummary) -> None:
+    """
+    Reschedule deferred recipients, or write the final delivery outcome of a post.
+
+    The status is taken from the delivery ledger, so it covers every attempt,
+    not only the last one.
+
+    Args:
+        post_id (int): ID of the ScheduledPost.
+        summary (FanOutSummary): Results of the last attempt.
+    """
+    deferred = summary.deferred
+    if deferred and ScheduledPost.objects.filter(id=post_id, deliveries__status='pending').exists():
+        task = send_scheduled_post.apply_async(
+            args=[post_id],
+            kwargs={'deferred_only': True},
+            countdown=max(result.retry_after for result in deferred)
+        )
+        ScheduledPost.objects.filter(id=post_id).update(celery_task_id=task.id)
+        return
+
+    overall = ledger.summary(post_id)
+    ScheduledPost.objects.filter(id=post_id).update(
+        status='failed' if overall.failed else 'sent',
+        error_message=overall.error_message()
+    )
+
+
+def _log_cache_stats() -> None:
+    """
+    Log the hit/miss counters of this worker's translation cache.
+    """
+    logger.info(
+        "Translation cache: %(lru_hits)d LRU hits, %(db_hits)d DB hits, %(misses)d misses",
+        translation_cache.stats()
+    )
+
+
+def _serialize(summary: FanOutSummary) -> List[list]:
+    """
+    Convert delivery results to a JSON-friendly list.
+
+    Args:
+        summary (FanOutSummary): Results to convert.
+
+    Returns:
+        list: [chat_id, error, retry_after] triples.
+    """
+    return [[result.chat_id, result.error, result.retry_after] for result in summary.results]
+
+
+def _dispatch_chunks(post: ScheduledPost, recipients: List[Recipient]) -> None:
+    """
+    Split recipients into chunks sent by parallel subtasks, aggregated by a chord callback.
+
+    When the post has attachments, the first recipient is served inline so the
+    files are uploaded once and every chunk reuses the cached file_id.
+
+    Args:
+        post (ScheduledPost): Post to send.
+        recipients (list[Recipient]): All resolved recipients.
+    """
+    head = []
+    if post.attachments.exists():
+        head = _serialize(send_to_recipients(post, recipients[:1]))
+        recipients = recipients[1:]
+
+    size = settings.POST_FANOUT_CHUNK_SIZE
+    chunks = [
+        [[rec.chat_id, rec.language] for rec in recipients[i:i + size]]
+        for i in range(0, len(recipients), size)
+    ]
+    chord(
+        send_post_chunk.s(post.id, chunk) for chunk in chunks
+    )(finalize_post_chunks.s(post.id, head))
+
+
+def _enqueue(due: List[tuple]) -> None:
+    """
+    Enqueue send tasks for claimed posts and store their task IDs in one query.
+
+    Args:
+        due (list[tuple]): (post ID, schedule time) pairs.
+    """
+    posts = [
+        ScheduledPost(id=post_id, celery_task_id=send_scheduled_post.apply_async(args=[post_id], eta=eta).id)
+        for post_id, eta in due
+    ]
+    ScheduledPost.objects.bulk_update(posts, ['celery_task_id'])
+
+
+def dispatch_post(post: ScheduledPost) -> None:
+    """
+    Enqueue a new post right away if it is due soon, otherwise leave it to dispatch_due_posts.
+
+    Args:
+        post (ScheduledPost): Newly created post.
+    """
+    horizon = timezone.now() + timedelta(seconds=settings.POST_DISPATCH_LOOKAHEAD)
+    if post.schedule_time > horizon:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        claimed = ScheduledPost.objects.filter(id=post.id, dispatched_at__isnull=True).update(dispatched_at=now)
+        if claimed:
+            _enqueue([(post.id, post.schedule_time)])
+            post.refresh_from_db(fields=['celery_task_id', 'dispatched_at'])
+
+
+def schedule_preparation(post: ScheduledPost) -> None:
+    """
+    Render post variants now.
+
+    They are rendered again by prepare_upcoming_posts once the post enters the
+    POST_PREPARE_LEAD_MINUTES window, picking up languages of members added
+    after creation, so the send at schedule_time only performs Bot API calls.
+
+    Args:
+        post (ScheduledPost): Newly created post.
+    """
+    prepare_post_variants.delay(post.id)
+
+# --------------------------------------------------------------------------------
+# CELERY TASKS
 
 
 @shared_task
-def send_scheduled_post(post_id: int) -> None:
+def dispatch_due_posts() -> int:
+    """
+    Periodic task enqueueing posts due within POST_DISPATCH_LOOKAHEAD seconds.
+
+    Posts are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED, so
+    several dispatchers can run at once without enqueueing a post twice. Send
+    tasks are published before the claim commits: a failed commit may lead to
+    a second enqueue, which the delivery ledger turns into a no-op, while a
+    failed publish never leaves a post claimed but unsent.
+
+    Returns:
+        int: Number of enqueued posts.
+    """
+    batch_size = settings.POST_DISPATCH_BATCH_SIZE
+    dispatched = 0
+    while True:
+        now = timezone.now()
+        horizon = now + timedelta(seconds=settings.POST_DISPATCH_LOOKAHEAD)
+        with transaction.atomic():
+            due = list(ScheduledPost.objects.select_for_update(skip_locked=True).filter(
+                status='pending',
+                dispatched_at__isnull=True,
+                schedule_time__lte=horizon
+            ).order_by('schedule_time').values_list('id', 'schedule_time')[:batch_size])
+            if not due:
+                break
+            ScheduledPost.objects.filter(id__in=[post_id for post_id, _ in due]).update(dispatched_at=now)
+            _enqueue(due)
+        dispatched += len(due)
+        if len(due) < batch_size:
+            break
+    return dispatched
+
+
+@shared_task
+def prepare_upcoming_posts() -> int:
+    """
+    Periodic task rendering variants of posts due within POST_PREPARE_LEAD_MINUTES.
+
+    Posts are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED and
+    marked prepared before rendering, so concurrent runs never prepare a post
+    twice. A post whose preparation fails is rendered on demand when sent.
+
+    Returns:
+        int: Number of prepared posts.
+    """
+    batch_size = settings.POST_DISPATCH_BATCH_SIZE
+    prepared = 0
+    while True:
+        now = timezone.now()
+        horizon = now + timedelta(minutes=settings.POST_PREPARE_LEAD_MINUTES)
+        with transaction.atomic():
+            claimed = list(ScheduledPost.objects.select_for_update(skip_locked=True).filter(
+                status='pending',
+                prepared_at__isnull=True,
+                schedule_time__gt=now,
+                schedule_time__lte=horizon
+            ).order_by('schedule_time').values_list('id', flat=True)[:batch_size])
+            if not claimed:
+                break
+            ScheduledPost.objects.filter(id__in=claimed).update(prepared_at=now)
+        for post in ScheduledPost.objects.filter(id__in=claimed, status='pending'):
+            prepare_variants(post)
+        prepared += len(claimed)
+        if len(claimed) < batch_size:
+            break
+    if prepared:
+        _log_cache_stats()
+    return prepared
+
+
+@shared_task
+def dispatch_created_posts(post_ids: List[int]) -> None:
+    """
+    Celery task enqueueing sending and variant preparation for posts created in bulk.
+
+    A bulk request publishes only this task; the per-post tasks are published
+    from the worker.
+
+    Args:
+        post_ids (list[int]): IDs of the new posts.
+
+    Returns:
+        None
+    """
+    dispatch_due_posts()
+    for post in ScheduledPost.objects.filter(id__in=post_ids, status='pending').only('id', 'schedule_time'):
+        schedule_preparation(post)
+
+
+@shared_task
+def prepare_post_variants(post_id: int) -> None:
+    """
+    Celery task rendering the per-language variants of a pending post.
+
+    Logs the translation cache counters of the worker afterwards.
+
+    Args:
+        post_id (int): ID of the ScheduledPost to prepare.
+
+    Returns:
+        None
+    """
+    try:
+        post = ScheduledPost.objects.get(id=post_id, status='pending')
+    except ScheduledPost.DoesNotExist:
+        return
+    prepare_variants(post)
+    _log_cache_stats()
+
+
+@shared_task
+def send_scheduled_post(post_id: int, deferred_only: bool = False) -> None:
     """
     Celery task to send a scheduled post and update its status.
 
+    Recipients who already received the post are skipped, so a retried post is
+    sent only to the chats that failed. Recipients deferred by a Telegram flood
+    wait are sent by a rescheduled run once the wait is over. Posts with more than
+    POST_FANOUT_CHUNK_THRESHOLD recipients are split into chunked subtasks;
+    their status is written once all chunks finish.
+
     Args:
         post_id (int): ID of the ScheduledPost to send.
+        deferred_only (bool): Send only to recipients deferred by a previous run.
 
     Returns:
         None
     """
-    post = None
     try:
         post = ScheduledPost.objects.get(id=post_id)
-        send_post(post)
-        post.status = 'sent'
-        post.error_message = ''
     except ScheduledPost.DoesNotExist:
         return
+
+    try:
+        if post.status.lower() != 'pending':
+            summary = FanOutSummary([])
+        else:
+            recipients = resolve_recipients(post)
+            if deferred_only:
+                recipients = ledger.deferred(post, recipients)
+            else:
+                recipients = ledger.undelivered(post, recipients)
+            if len(recipients) > settings.POST_FANOUT_CHUNK_THRESHOLD:
+                _dispatch_chunks(post, recipients)
+                return
+            summary = send_to_recipients(post, recipients)
     except Exception as e:
-        if post:
-            post.status = 'failed'
-            post.error_message = str(e)
-    finally:
-        if post:
-            with transaction.atomic():
-                post.save()
+        ScheduledPost.objects.filter(id=post_id).update(status='failed', error_message=str(e))
+        return
+    _finish(post_id, summary)
+
+
+@shared_task
+def send_post_chunk(post_id: int, recipients: List[list]) -> List[list]:
+    """
+    Celery subtask delivering a post to one chunk of recipients.
+
+    Args:
+        post_id (int): ID of the ScheduledPost to send.
+        recipients (list): [chat_id, language] pairs.
+
+    Returns:
+        list: [chat_id, error, retry_after] triples, error is None for delivered recipients.
+    """
+    recipients = [Recipient(chat_id=chat_id, language=language) for chat_id, language in recipients]
+    try:
+        post = ScheduledPost.objects.get(id=post_id)
+    except ScheduledPost.DoesNotExist:
+        return []
+    try:
+        return _serialize(send_to_recipients(post, recipients))
+    except Exception as e:
+        summary = FanOutSummary([DeliveryResult(rec.chat_id, error=str(e)) for rec in recipients])
+        ledger.record(post, summary.results)
+        return _serialize(summary)
+
+
+@shared_task
+def finalize_post_chunks(
+    chunk_results: List[List[list]],
+    post_id: int,
+    head: Optional[List[list]] = None
+) -> None:
+    """
+    Chord callback aggregating chunk results into the post status.
+
+    Args:
+        chunk_results (list): Results returned by every send_post_chunk.
+        post_id (int): ID of the ScheduledPost.
+        head (list): Results of recipients served before dispatching chunks.
+
+    Returns:
+        None
+    """
+    results = [
+        DeliveryResult(chat_id, error=error, retry_after=retry_after)
+        for chunk in [head or [], *chunk_results]
+        for chat_id, error, retry_after in chunk
+    ]
+    _finish(post_id, FanOutSummary(results))
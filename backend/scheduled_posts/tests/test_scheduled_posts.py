@@ -7,15 +7,67 @@ This file contains unit tests for post creation with delay using Django REST Fra
 # --------------------------------------------------------------------------------
 # IMPORTS
 
-from unittest.mock import patch
+import asyncio
+import base64
+import hashlib
+import json
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch, AsyncMock, Mock, MagicMock
 
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from requests.exceptions import ConnectionError
+from rest_framework import status
 from rest_framework.test import APITestCase
+from telebot import asyncio_helper
+from telebot.apihelper import ApiTelegramException
 
+from chat_groups.models import ChatGroup, ChatGroupMember
+from scheduled_posts import ledger, translation_cache
+from scheduled_posts.attachments import MAX_MEDIA_SIZE, AttachmentLoader, AttachmentView, describe
+from scheduled_posts.fanout import DeliveryResult
+from scheduled_posts.models import (
+    PostDelivery, RateLimitBucket, ScheduledPost, ScheduledPostAttachment, TranslationCacheEntry
+)
+from scheduled_posts.post_sender import prepare_variants, resolve_recipients, send_post, send_to_recipients
+from scheduled_posts.rate_limiter import DatabaseBucketStore, LocalBucketStore, RateLimiter
+from scheduled_posts.retry import DeliveryDeferred, call_with_retry
+from scheduled_posts.tasks import dispatch_due_posts, prepare_post_variants, prepare_upcoming_posts, send_scheduled_post
 from telegram_accounts.models import TelegramChat
+from tgpostman.celery import app as celery_app
+from tgpostman.search import search
 from users.models import User
 
 
+# --------------------------------------------------------------------------------
+# HELPERS
+
+
+def flood_wait(retry_after: int) -> ApiTelegramException:
+    """
+    Build the error the Bot API raises on a 429 response.
+
+    Args:
+        retry_after (int): Seconds Telegram asks to wait.
+
+    Returns:
+        ApiTelegramException: Flood-wait error.
+    """
+    return ApiTelegramException("sendMessage", Mock(), {
+        "error_code": 429,
+        "description": "Too Many Requests",
+        "parameters": {"retry_after": retry_after},
+    })
+
 # --------------------------------------------------------------------------------
 # TEST CASES
 
@@ -59,3 +111,1112 @@ class PostTests(APITestCase):
         self.assertEqual(response.status_code, 201)
         self.assertTrue(mock_async.called)
 
+    def test_search_posts(self) -> None:
+        """
+        Test that the list endpoint matches words and substrings, best matches first.
+        """
+        now = timezone.now()
+        ScheduledPost.objects.create(user=self.user, content="Weekly sale starts today", schedule_time=now)
+        ScheduledPost.objects.create(user=self.user, content="Sale", schedule_time=now)
+        ScheduledPost.objects.create(user=self.user, content="Nothing to see", schedule_time=now)
+
+        response = self.client.get(reverse("posts"), {"q": "sale"})
+        contents = [post["content"] for post in response.data["results"]]
+        self.assertEqual(contents, ["Sale", "Weekly sale starts today"])
+
+        response = self.client.get(reverse("posts"), {"q": "eekl"})
+        self.assertEqual([post["content"] for post in response.data["results"]], ["Weekly sale starts today"])
+
+    def test_keyset_pagination(self) -> None:
+        """
+        Test that cursors walk every post exactly once, even with equal schedule times, and back again.
+        """
+        now = timezone.now()
+        ScheduledPost.objects.bulk_create([
+            ScheduledPost(user=self.user, content=f"Post {i}", schedule_time=now - timedelta(minutes=i % 3))
+            for i in range(120)
+        ])
+        expected = list(ScheduledPost.objects.order_by('-schedule_time', '-pk').values_list('id', flat=True))
+
+        seen, pages = [], []
+        url = reverse("posts")
+        while url:
+            response = self.client.get(url)
+            pages.append(response.data)
+            seen += [post["id"] for post in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["results"], pages[1]["results"])
+
+        response = self.client.get(reverse("posts"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_pagination_with_ties(self) -> None:
+        """
+        Test that cursors walk every search result exactly once when many rows share the same rank.
+        """
+        now = timezone.now()
+        ScheduledPost.objects.bulk_create([
+            ScheduledPost(
+                user=self.user,
+                content="Hello world" if i % 4 else f"Hello brave new world {i}",
+                schedule_time=now - timedelta(minutes=i % 3)
+            )
+            for i in range(130)
+        ])
+
+        seen, pages = [], 0
+        url = f'{reverse("posts")}?q=world'
+        while url and pages < 10:
+            response = self.client.get(url)
+            seen += [post["id"] for post in response.data["results"]]
+            url = response.data["next"]
+            pages += 1
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 130)
+        self.assertEqual(len(set(seen)), 130)
+
+    @patch("scheduled_posts.serializers.schedule_preparation")
+    @patch("scheduled_posts.serializers.dispatch_post")
+    def test_targets_validated_in_one_query(self, mock_dispatch: patch, mock_prepare: patch) -> None:
+        """
+        Test that target lists validate with constant queries, scoped to the user, reporting every bad ID.
+
+        Args:
+            mock_dispatch (patch): Mock for dispatching the new post.
+            mock_prepare (patch): Mock for scheduling variant preparation.
+        """
+        chats = TelegramChat.objects.bulk_create([
+            TelegramChat(user=self.user, chat_id=-2000 - i, title=f"Chat {i}") for i in range(100)
+        ])
+        stranger = User.objects.create_user(username="stranger", password="pass")
+        foreign = TelegramChat.objects.create(user=stranger, chat_id=-1, title="Foreign")
+        self.client.post(reverse("posts"), {"content": "Warm-up", "targets": [self.chat.id], "groups": []},
+                         format="json")
+
+        def create(targets):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    reverse("posts"), {"content": "Hi", "targets": targets, "groups": []}, format="json"
+                )
+            return response, len(ctx.captured_queries)
+
+        response, small = create([chats[0].id, chats[1].id])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response, large = create([chat.id for chat in chats])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(large, small)
+        self.assertEqual(len(response.data["targets"]), 100)
+
+        response, _ = create([foreign.id, chats[0].id, 999999])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["targets"]), 2)
+
+    def post_bulk(self, items: list):
+        """
+        Send a bulk creation request, running the after-commit dispatch hook.
+
+        Args:
+            items (list[dict]): Posts to create.
+
+        Returns:
+            tuple: Response, mock of the dispatch task and number of queries run.
+        """
+        with patch("scheduled_posts.bulk.dispatch_created_posts.delay") as mock_delay, \
+                self.captureOnCommitCallbacks(execute=True), \
+                CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("posts_bulk"), items, format="json")
+        return response, mock_delay, len(ctx.captured_queries)
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_bulk_create(self) -> None:
+        """
+        Test that a bulk request creates valid posts with links and attachments and reports invalid ones.
+        """
+        group = ChatGroup.objects.create(user=self.user, name="News")
+        stranger = User.objects.create_user(username="stranger", password="pass")
+        foreign = TelegramChat.objects.create(user=stranger, chat_id=-1, title="Foreign")
+        items = [
+            {"content": "One", "targets": [self.chat.id], "delay_seconds": 3600},
+            {"content": "Two", "groups": [group.id], "attachments": [
+                {"name": "a.txt", "content": base64.b64encode(b"hello").decode()}
+            ]},
+            {"content": "Three", "targets": [foreign.id, self.chat.id]},
+            {"targets": [self.chat.id]},
+        ]
+
+        response, mock_delay, _ = self.post_bulk(items)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data["results"]
+        self.assertEqual([r["status"] for r in results], ["created", "created", "invalid", "invalid"])
+        self.assertIn("targets", results[2]["errors"])
+        self.assertIn("content", results[3]["errors"])
+        one, two = ScheduledPost.objects.get(id=results[0]["id"]), ScheduledPost.objects.get(id=results[1]["id"])
+        self.assertEqual(list(one.targets.all()), [self.chat])
+        self.assertEqual(list(two.groups.all()), [group])
+        attachment = two.attachments.get()
+        self.assertEqual((attachment.original_name, attachment.size), ("a.txt", 5))
+        mock_delay.assert_called_once_with([one.id, two.id])
+
+    def test_bulk_create_constant_queries(self) -> None:
+        """
+        Test that bulk creation runs the same number of queries for 5 and 100 posts, including NDJSON input.
+        """
+        item = {"content": "Campaign", "targets": [self.chat.id], "delay_seconds": 3600}
+        self.post_bulk([item])  # warms the API key cache
+        _, _, small = self.post_bulk([item] * 5)
+        response, _, large = self.post_bulk([item] * 100)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(large, small)
+
+        body = "\n".join(json.dumps(item) for item in [item] * 3)
+        with patch("scheduled_posts.bulk.dispatch_created_posts.delay"):
+            response = self.client.post(reverse("posts_bulk"), body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(ScheduledPost.objects.filter(content="Campaign").count(), 109)
+
+
+class DispatcherTests(TestCase):
+    """
+    Test case for enqueueing due posts from the database.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up one post due now and one scheduled days ahead.
+        """
+        user = User.objects.create_user(username="user5", password="pass")
+        self.due = ScheduledPost.objects.create(user=user, content="Now", schedule_time=timezone.now())
+        self.later = ScheduledPost.objects.create(
+            user=user,
+            content="Later",
+            schedule_time=timezone.now() + timedelta(days=3)
+        )
+
+    @patch("scheduled_posts.tasks.send_scheduled_post.apply_async")
+    def test_due_posts_are_enqueued_once(self, mock_async: Mock) -> None:
+        """
+        Test that only due posts are enqueued and a second run does not enqueue them again.
+
+        Args:
+            mock_async (Mock): Mock for Celery apply_async method.
+        """
+        mock_async.return_value.id = "task-id"
+
+        self.assertEqual(dispatch_due_posts(), 1)
+        self.assertEqual(dispatch_due_posts(), 0)
+
+        mock_async.assert_called_once_with(args=[self.due.id], eta=self.due.schedule_time)
+        self.due.refresh_from_db()
+        self.later.refresh_from_db()
+        self.assertEqual(self.due.celery_task_id, "task-id")
+        self.assertIsNotNone(self.due.dispatched_at)
+        self.assertIsNone(self.later.dispatched_at)
+
+    @override_settings(POST_PREPARE_LEAD_MINUTES=5)
+    @patch("scheduled_posts.tasks.prepare_variants")
+    def test_posts_entering_lead_window_are_prepared_once(self, mock_prepare: Mock) -> None:
+        """
+        Test that only posts due within the lead window are prepared, and only by the first run.
+
+        Args:
+            mock_prepare (Mock): Mock for the variant renderer.
+        """
+        soon = ScheduledPost.objects.create(
+            user=self.due.user,
+            content="Soon",
+            schedule_time=timezone.now() + timedelta(minutes=3)
+        )
+
+        self.assertEqual(prepare_upcoming_posts(), 1)
+        self.assertEqual(prepare_upcoming_posts(), 0)
+
+        mock_prepare.assert_called_once_with(soon)
+        soon.refresh_from_db()
+        self.later.refresh_from_db()
+        self.assertIsNotNone(soon.prepared_at)
+        self.assertIsNone(self.later.prepared_at)
+
+
+class QueryPlanTests(TestCase):
+    """
+    Test case guarding the hot post and member queries against sequential scans.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """
+        Seed enough posts and group members for the planner to prefer indexes.
+        """
+        users = User.objects.bulk_create([User(username=f"seed{i}") for i in range(200)])
+        now = timezone.now()
+        ScheduledPost.objects.bulk_create([
+            ScheduledPost(
+                user=users[i % len(users)],
+                content=f"Seed post {i} about news, weather and sports of the day. " * 8,
+                schedule_time=now + timedelta(minutes=i),
+                status="pending" if i % 100 == 0 else "sent"
+            )
+            for i in range(20000)
+        ], batch_size=5000)
+        groups = ChatGroup.objects.bulk_create([ChatGroup(user=user, name="Seed") for user in users])
+        ChatGroupMember.objects.bulk_create([
+            ChatGroupMember(group=groups[i % len(groups)], chat_id=i, language="en")
+            for i in range(20000)
+        ], batch_size=5000)
+        cls.user = users[0]
+        with connection.cursor() as cursor:
+            for model in (ScheduledPost, ChatGroupMember):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    def assertNoSeqScan(self, queryset) -> None:
+        """
+        Assert that the query plan does not read the whole table.
+
+        Args:
+            queryset (QuerySet): Query to explain.
+        """
+        plan = queryset.explain()
+        self.assertNotIn("Seq Scan", plan, plan)
+
+    def test_user_posts_use_index(self) -> None:
+        """
+        Test that listing a user's posts by schedule or creation time uses an index.
+        """
+        posts = ScheduledPost.objects.filter(user=self.user)
+        self.assertNoSeqScan(posts.order_by("-schedule_time")[:10])
+        self.assertNoSeqScan(posts.order_by("-created_at")[:10])
+
+    def test_pending_posts_use_index(self) -> None:
+        """
+        Test that scanning pending posts by schedule time uses the partial index.
+        """
+        self.assertNoSeqScan(ScheduledPost.objects.filter(status="pending").order_by("schedule_time"))
+
+    def test_search_uses_index(self) -> None:
+        """
+        Test that full-text and substring search of post content uses the GIN indexes.
+        """
+        self.assertNoSeqScan(search(ScheduledPost.objects.all(), "giveaway", "content"))
+
+    def test_member_lookup_by_chat_id_uses_index(self) -> None:
+        """
+        Test that finding group memberships of a chat uses an index.
+        """
+        self.assertNoSeqScan(ChatGroupMember.objects.filter(chat_id=42))
+
+
+class TranslationCacheTests(TestCase):
+    """
+    Test case for the two-tier translation cache.
+    """
+
+    def setUp(self) -> None:
+        """
+        Start every test with an empty in-process tier.
+        """
+        translation_cache.clear()
+
+    def test_repeated_translation_hits_cache(self) -> None:
+        """
+        Test that the same text is translated only once per language.
+        """
+        translate = Mock(side_effect=lambda text, dest: f"{text} [{dest}]")
+
+        first = translation_cache.get_or_translate("Hello!", "ru", translate)
+        second = translation_cache.get_or_translate("Hello!", "ru", translate)
+        translation_cache.get_or_translate("Hello!", "de", translate)
+
+        self.assertEqual(first, "Hello! [ru]")
+        self.assertEqual(second, first)
+        self.assertEqual(translate.call_count, 2)
+        self.assertEqual(translation_cache.stats(), {'lru_hits': 1, 'db_hits': 0, 'misses': 2})
+
+    def test_database_tier_survives_lru_reset(self) -> None:
+        """
+        Test that translations are served from the database after the LRU is cleared.
+        """
+        translate = Mock(return_value="Привет!")
+        translation_cache.get_or_translate("Hello!", "ru", translate)
+        translation_cache.clear()
+
+        result = translation_cache.get_or_translate("Hello!", "ru", translate)
+
+        self.assertEqual(result, "Привет!")
+        self.assertEqual(translate.call_count, 1)
+        self.assertEqual(translation_cache.stats()['db_hits'], 1)
+
+    def test_misses_are_stored_in_one_query(self) -> None:
+        """
+        Test that a batch of misses costs one lookup and one upsert, and a re-translation overwrites the entry.
+        """
+        pairs = [("Hello!", "ru"), ("Hello!", "de"), ("Bye!", "ru")]
+
+        with self.assertNumQueries(2):
+            translation_cache.get_or_translate_many(pairs, lambda batch: [f"{t} [{d}]" for t, d in batch])
+        translation_cache.clear()
+        TranslationCacheEntry.objects.update(created_at=timezone.now() - timedelta(days=365))
+        translation_cache.get_or_translate_many(pairs[:1], lambda batch: ["Привет!"])
+
+        self.assertEqual(TranslationCacheEntry.objects.count(), 3)
+        self.assertEqual(TranslationCacheEntry.objects.get(language="ru", text__startswith="П").text, "Привет!")
+
+    def test_lru_tier_honours_ttl(self) -> None:
+        """
+        Test that the in-process tier drops entries older than TRANSLATION_CACHE_TTL.
+        """
+        translate = Mock(return_value="Привет!")
+        translation_cache.get_or_translate("Hello!", "ru", translate)
+
+        translation_cache._lru.expire(time.monotonic() + settings.TRANSLATION_CACHE_TTL + 1)
+        translation_cache.get_or_translate("Hello!", "ru", translate)
+
+        self.assertEqual(translation_cache.stats(), {'lru_hits': 0, 'db_hits': 1, 'misses': 1})
+
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_preparation_logs_cache_stats(self, mock_translate: Mock) -> None:
+        """
+        Test that preparing a post logs the translation cache counters.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+        """
+        user = User.objects.create_user(username="user6", password="pass")
+        group = ChatGroup.objects.create(user=user, name="Group")
+        ChatGroupMember.objects.create(group=group, chat_id=1, language="ru")
+        post = ScheduledPost.objects.create(user=user, content="Hello!")
+        post.groups.set([group])
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+
+        with self.assertLogs("scheduled_posts.tasks", "INFO") as logs:
+            prepare_post_variants(post.id)
+
+        self.assertIn("0 LRU hits, 0 DB hits, 1 misses", logs.output[0])
+
+
+class SendPostTests(TestCase):
+    """
+    Test case for recipient resolution and delivery in send_post.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a post targeting a group with members in two languages.
+        """
+        translation_cache.clear()
+        self.user: User = User.objects.create_user(username="user3", password="pass")
+        self.group: ChatGroup = ChatGroup.objects.create(user=self.user, name="Group")
+        for chat_id in range(1, 5):
+            ChatGroupMember.objects.create(group=self.group, chat_id=chat_id, language="ru")
+        ChatGroupMember.objects.create(group=self.group, chat_id=5, language="de")
+        self.post: ScheduledPost = ScheduledPost.objects.create(user=self.user, content="Hello!")
+        self.post.groups.set([self.group])
+        limiter = patch("scheduled_posts.post_sender.rate_limiter", RateLimiter(LocalBucketStore()))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_translates_once_per_language(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that the content is translated once per distinct language, not per member.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [f"{text} [{dest}]" for text, dest in pairs]
+
+        send_post(self.post)
+
+        mock_translate.assert_called_once_with([("Hello!", "ru"), ("Hello!", "de")])
+        sent = {call.kwargs["chat_id"]: call.kwargs["text"] for call in mock_bot.send_message.call_args_list}
+        self.assertEqual(len(sent), 5)
+        self.assertEqual(sent[1], "Hello! [ru]")
+        self.assertEqual(sent[5], "Hello! [de]")
+
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_prepared_variants_are_sent_without_rendering(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that variants rendered ahead of time are sent as is, markup included.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [f"{text} [{dest}]" for text, dest in pairs]
+        self.post.button_text = "Open"
+        self.post.button_url = "https://example.com"
+        self.post.save()
+
+        prepare_post_variants(self.post.id)
+        self.assertEqual(self.post.variants.count(), 3)
+        mock_translate.reset_mock()
+
+        send_post(self.post)
+
+        mock_translate.assert_not_called()
+        call = next(c for c in mock_bot.send_message.call_args_list if c.kwargs["chat_id"] == 5)
+        self.assertEqual(call.kwargs["text"], "Hello! [de]")
+        self.assertIn('"text": "Open [de]"', call.kwargs["reply_markup"])
+
+    def test_recipients_resolved_in_one_query(self) -> None:
+        """
+        Test that group members and targets are deduplicated by chat_id in a single query.
+        """
+        other = ChatGroup.objects.create(user=self.user, name="Other")
+        ChatGroupMember.objects.create(group=other, chat_id=5, language="fr")
+        ChatGroupMember.objects.create(group=other, chat_id=6, language="en")
+        other_user = User.objects.create_user(username="user4", password="pass")
+        for user, chat_id in ((self.user, 6), (self.user, 7), (other_user, 7)):
+            TelegramChat.objects.create(user=user, chat_id=chat_id, title=f"Chat {chat_id}")
+        self.post.groups.add(other)
+        self.post.targets.set(TelegramChat.objects.all())
+
+        with self.assertNumQueries(1):
+            recipients = resolve_recipients(self.post)
+
+        resolved = {rec.chat_id: rec.language for rec in recipients}
+        self.assertEqual(len(recipients), len(resolved))
+        self.assertEqual(resolved, {1: "ru", 2: "ru", 3: "ru", 4: "ru", 5: "fr", 6: "en", 7: None})
+        self.assertFalse(hasattr(recipients[0], "__dict__"))
+
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_failed_recipient_does_not_stop_fan_out(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that one failing recipient is reported without aborting the others.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+
+        def send_message(chat_id: int, **kwargs) -> None:
+            if chat_id == 3:
+                raise RuntimeError("chat not found")
+
+        mock_bot.send_message.side_effect = send_message
+
+        summary = send_post(self.post)
+
+        self.assertEqual(mock_bot.send_message.call_count, 5)
+        self.assertEqual(len(summary.sent), 4)
+        self.assertEqual([result.chat_id for result in summary.failed], [3])
+        self.assertIn("3: chat not found", summary.error_message())
+
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_retry_skips_delivered_recipients(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that a retried post is sent only to the recipients that failed before.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        mock_bot.send_message.side_effect = lambda chat_id, **kwargs: Mock(message_id=100 + chat_id)
+        PostDelivery.objects.create(post=self.post, chat_id=3, status="failed", attempts=1, error="timeout")
+        for chat_id in (1, 2, 4, 5):
+            PostDelivery.objects.create(post=self.post, chat_id=chat_id, status="sent", attempts=1)
+        self.post.status = "failed"
+        self.post.save()
+        self.client.force_login(self.user)
+
+        with patch("scheduled_posts.views.send_scheduled_post.apply_async") as mock_async:
+            mock_async.return_value.id = "task-id"
+            self.client.get(reverse("send_post_now", args=[self.post.id]))
+        send_scheduled_post(self.post.id)
+
+        mock_bot.send_message.assert_called_once()
+        self.assertEqual(mock_bot.send_message.call_args.kwargs["chat_id"], 3)
+        delivery = PostDelivery.objects.get(post=self.post, chat_id=3)
+        self.assertEqual((delivery.status, delivery.attempts, delivery.message_ids), ("sent", 2, [103]))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "sent")
+
+    @override_settings(POST_LEDGER_BATCH_SIZE=2)
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_deliveries_are_recorded_in_batches(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that deliveries are written to the ledger in batches during the fan-out, not once at the end.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+
+        with patch("scheduled_posts.ledger.record", wraps=ledger.record) as mock_record:
+            send_post(self.post)
+
+        self.assertEqual([len(call.args[1]) for call in mock_record.call_args_list], [2, 2, 1])
+        self.assertEqual(PostDelivery.objects.filter(post=self.post, status="sent").count(), 5)
+
+    @override_settings(POST_LEDGER_BATCH_SIZE=1, POST_SENDER_CONCURRENCY=2)
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_ledger_error_stops_fan_out(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that a failing ledger write stops new sends and still records the ones in flight.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+
+        def send_message(chat_id: int, **kwargs) -> Mock:
+            time.sleep(0.2)  # long enough for the failed write to stop the workers before they run out of recipients
+            return Mock(message_id=100 + chat_id)
+
+        mock_bot.send_message.side_effect = send_message
+        record = ledger.record
+        failures = [DatabaseError("connection lost")]
+
+        def flaky_record(post: ScheduledPost, results: list) -> None:
+            if failures:
+                raise failures.pop()
+            record(post, results)
+
+        with patch("scheduled_posts.ledger.record", side_effect=flaky_record):
+            with self.assertRaises(DatabaseError):
+                send_post(self.post)
+
+        sent = {call.kwargs["chat_id"] for call in mock_bot.send_message.call_args_list}
+        self.assertLess(len(sent), 5)
+        self.assertEqual(set(PostDelivery.objects.filter(post=self.post).values_list("chat_id", flat=True)), sent)
+
+    def test_record_upserts_concurrent_rows(self) -> None:
+        """
+        Test that recording rows another run inserted meanwhile updates them and keeps delivered ones.
+        """
+        PostDelivery.objects.create(post=self.post, chat_id=1, status="sent", attempts=1, message_ids=[101])
+        PostDelivery.objects.create(post=self.post, chat_id=2, status="failed", attempts=1, error="timeout")
+
+        with patch.object(PostDelivery.objects, "filter", return_value=PostDelivery.objects.none()):
+            ledger.record(self.post, [DeliveryResult(1, message_ids=[201]), DeliveryResult(2, message_ids=[202])])
+        ledger.record(self.post, [DeliveryResult(1, error="timeout")])
+
+        self.assertEqual(
+            list(PostDelivery.objects.filter(post=self.post).order_by("chat_id").values_list(
+                "chat_id", "status", "message_ids"
+            )),
+            [(1, "sent", [201]), (2, "sent", [202])]
+        )
+
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_flood_wait_defers_recipient(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that a long flood wait reschedules the recipient instead of failing the post.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+
+        def send_message(chat_id: int, **kwargs) -> None:
+            if chat_id == 2:
+                raise flood_wait(60)
+
+        mock_bot.send_message.side_effect = send_message
+
+        with patch("scheduled_posts.tasks.send_scheduled_post.apply_async") as mock_async:
+            mock_async.return_value.id = "task-id"
+            send_scheduled_post(self.post.id)
+
+        self.assertEqual(mock_bot.send_message.call_count, 5)
+        mock_async.assert_called_once_with(args=[self.post.id], kwargs={"deferred_only": True}, countdown=60.0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "pending")
+        self.assertEqual(PostDelivery.objects.get(post=self.post, chat_id=2).status, "pending")
+
+        mock_bot.send_message.reset_mock(side_effect=True)
+        send_scheduled_post(self.post.id, deferred_only=True)
+
+        self.assertEqual([call.kwargs["chat_id"] for call in mock_bot.send_message.call_args_list], [2])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "sent")
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_attachment_uploaded_once(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that an attachment is uploaded once and its file_id is reused for other recipients.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        message = MagicMock()
+        message.photo[-1].file_id = "photo-file-id"
+        mock_bot.send_photo.return_value = message
+        attachment = ScheduledPostAttachment.objects.create(
+            post=self.post,
+            file=ContentFile(b"image-bytes", name="picture.png"),
+            original_name="picture.png"
+        )
+
+        send_post(self.post)
+
+        photos = [call.kwargs["photo"] for call in mock_bot.send_photo.call_args_list]
+        self.assertEqual(len(photos), 5)
+        self.assertIsInstance(photos[0], AttachmentView)
+        self.assertEqual(photos[1:], ["photo-file-id"] * 4)
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.telegram_file_ids, {"photo": "photo-file-id"})
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_file_id_of_another_kind_is_not_reused(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that a photo sent in a document group is uploaded once as a document despite its cached photo file_id.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        picture = ScheduledPostAttachment.objects.create(
+            post=self.post,
+            file=ContentFile(b"image-bytes", name="picture.png"),
+            original_name="picture.png",
+            telegram_file_ids={"photo": "photo-file-id"}
+        )
+        ScheduledPostAttachment.objects.create(
+            post=self.post,
+            file=ContentFile(b"report", name="report.pdf"),
+            original_name="report.pdf",
+            telegram_file_ids={"document": "report-file-id"}
+        )
+        uploaded = MagicMock()
+        uploaded.document.file_id = "picture-document-id"
+
+        def send_media_group(chat_id: int, media: list, **kwargs) -> list:
+            if not isinstance(media[0].media, str):
+                time.sleep(0.1)  # a slow upload, other recipients must not start their own meanwhile
+            return [uploaded, MagicMock()]
+
+        mock_bot.send_media_group.side_effect = send_media_group
+
+        send_post(self.post)
+
+        media = [call.kwargs["media"][0].media for call in mock_bot.send_media_group.call_args_list]
+        self.assertEqual(len(media), 5)
+        self.assertIsInstance(media[0], AttachmentView)
+        self.assertEqual(media[1:], ["picture-document-id"] * 4)
+        picture.refresh_from_db()
+        self.assertEqual(picture.telegram_file_ids, {"photo": "photo-file-id", "document": "picture-document-id"})
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_rejected_media_group_uploads_documents_once(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that after Telegram rejects a media group the fallback documents are uploaded once and reused.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        for name in ("first.png", "second.png"):
+            ScheduledPostAttachment.objects.create(
+                post=self.post, file=ContentFile(b"image-bytes", name=name), original_name=name
+            )
+        mock_bot.send_media_group.side_effect = ApiTelegramException(
+            "sendMediaGroup", Mock(), {"error_code": 400, "description": "Bad Request: wrong file type"}
+        )
+
+        def send_document(chat_id: int, document, **kwargs) -> MagicMock:
+            message = MagicMock()
+            if not isinstance(document, str):
+                time.sleep(0.1)  # a slow upload, other recipients must not start their own meanwhile
+                message.document.file_id = f"document-{document.name}"
+            return message
+
+        mock_bot.send_document.side_effect = send_document
+
+        summary = send_post(self.post)
+
+        self.assertEqual(len(summary.sent), 5)
+        self.assertEqual(mock_bot.send_media_group.call_count, 1)
+        documents = [call.kwargs["document"] for call in mock_bot.send_document.call_args_list]
+        self.assertEqual(len(documents), 10)
+        self.assertEqual(sum(not isinstance(document, str) for document in documents), 2)
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp(), TELEGRAM_RETRY_BACKOFF_BASE=0)
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_retried_upload_sends_whole_file(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that an upload retried after a server error carries the full file again.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        payload = b"x" * 100_000
+        ScheduledPostAttachment.objects.create(
+            post=self.post,
+            file=ContentFile(payload, name="report.pdf"),
+            original_name="report.pdf"
+        )
+        uploads = []
+
+        def send_document(chat_id: int, document, **kwargs) -> MagicMock:
+            if isinstance(document, str):
+                return MagicMock()
+            uploads.append(len(document.read()))
+            if len(uploads) == 1:
+                raise ApiTelegramException("sendDocument", Mock(), {"error_code": 502, "description": "Bad Gateway"})
+            message = MagicMock()
+            message.document.file_id = "document-file-id"
+            return message
+
+        mock_bot.send_document.side_effect = send_document
+
+        summary = send_post(self.post)
+
+        self.assertEqual(uploads, [len(payload), len(payload)])
+        self.assertEqual(len(summary.sent), 5)
+
+    @override_settings(POST_FANOUT_CHUNK_THRESHOLD=2, POST_FANOUT_CHUNK_SIZE=2)
+    @patch("scheduled_posts.post_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_large_post_is_split_into_chunks(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that posts above the threshold are sent in chunked subtasks and aggregated once.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        mock_bot.send_message.side_effect = lambda chat_id, **kwargs: self.assertNotEqual(chat_id, 5)
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+
+        with patch("scheduled_posts.tasks.send_to_recipients", wraps=send_to_recipients) as mock_chunk:
+            send_scheduled_post(self.post.id)
+
+        self.assertEqual([len(call.args[1]) for call in mock_chunk.call_args_list], [2, 2, 1])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "failed")
+        self.assertTrue(self.post.error_message.startswith("1 of 5 recipients failed: 5:"))
+
+    @override_settings(POST_SENDER_ENGINE="scheduled_posts.async_sender")
+    @patch("scheduled_posts.async_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_asyncio_engine_multiplexes_sends(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that the asyncio engine keeps several sends in flight on one event loop.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the asyncio Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        in_flight = []
+        peak = []
+
+        async def send_message(chat_id: int, **kwargs) -> MagicMock:
+            in_flight.append(chat_id)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(chat_id)
+            return MagicMock(message_id=100 + chat_id)
+
+        mock_bot.send_message = AsyncMock(side_effect=send_message)
+
+        send_scheduled_post(self.post.id)
+
+        self.assertEqual(mock_bot.send_message.await_count, 5)
+        self.assertGreater(max(peak), 1)
+        self.assertEqual(PostDelivery.objects.get(post=self.post, chat_id=3).message_ids, [103])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "sent")
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp(), POST_SENDER_ENGINE="scheduled_posts.async_sender")
+    @patch("scheduled_posts.async_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_asyncio_engine_stores_file_ids_before_fan_out(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that file_ids of the upload phase are stored even if the concurrent fan-out crashes.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the asyncio Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+        attachment = ScheduledPostAttachment.objects.create(
+            post=self.post,
+            file=ContentFile(b"image-bytes", name="picture.png"),
+            original_name="picture.png"
+        )
+
+        async def send_photo(chat_id: int, photo, **kwargs) -> MagicMock:
+            if isinstance(photo, str):
+                raise KeyboardInterrupt
+            message = MagicMock()
+            message.photo[-1].file_id = "photo-file-id"
+            return message
+
+        mock_bot.send_photo = AsyncMock(side_effect=send_photo)
+
+        with self.assertRaises(KeyboardInterrupt):
+            send_scheduled_post(self.post.id)
+
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.telegram_file_ids, {"photo": "photo-file-id"})
+
+    @override_settings(POST_SENDER_ENGINE="scheduled_posts.async_sender")
+    @patch("scheduled_posts.async_sender.bot")
+    @patch("scheduled_posts.post_sender.translator")
+    def test_translation_after_asyncio_engine_send(self, mock_translator: Mock, mock_bot: Mock) -> None:
+        """
+        Test that a translation cache miss still works after the asyncio engine ran in the same thread.
+
+        Args:
+            mock_translator (Mock): Mock for the googletrans client returning coroutines.
+            mock_bot (Mock): Mock for the asyncio Telegram bot.
+        """
+        async def translate(text: str, dest: str) -> Mock:
+            return Mock(text=f"{text} [{dest}]")
+
+        mock_translator.translate.side_effect = translate
+        mock_bot.send_message = AsyncMock(return_value=MagicMock(message_id=1))
+        send_scheduled_post(self.post.id)
+
+        translation_cache.clear()
+        self.post.content = "Goodbye!"
+        variants = prepare_variants(self.post)
+
+        self.assertEqual(variants["de"].text, "Goodbye! [de]")
+
+    @override_settings(POST_SENDER_ENGINE="scheduled_posts.async_sender")
+    @patch("scheduled_posts.async_sender.bot")
+    @patch("scheduled_posts.post_sender._google_translate_batch")
+    def test_asyncio_engine_defers_flood_wait(self, mock_translate: Mock, mock_bot: Mock) -> None:
+        """
+        Test that flood waits raised by the asyncio client defer the recipient like the threaded engine.
+
+        Args:
+            mock_translate (Mock): Mock for the batch translator.
+            mock_bot (Mock): Mock for the asyncio Telegram bot.
+        """
+        mock_translate.side_effect = lambda pairs: [text for text, _ in pairs]
+
+        async def send_message(chat_id: int, **kwargs) -> None:
+            if chat_id == 2:
+                raise asyncio_helper.ApiTelegramException("sendMessage", Mock(), {
+                    "error_code": 429,
+                    "description": "Too Many Requests",
+                    "parameters": {"retry_after": 60},
+                })
+
+        mock_bot.send_message = AsyncMock(side_effect=send_message)
+
+        with patch("scheduled_posts.tasks.send_scheduled_post.apply_async") as mock_async:
+            mock_async.return_value.id = "task-id"
+            send_scheduled_post(self.post.id)
+
+        self.assertEqual(mock_bot.send_message.await_count, 5)
+        mock_async.assert_called_once_with(args=[self.post.id], kwargs={"deferred_only": True}, countdown=60.0)
+        self.assertEqual(PostDelivery.objects.get(post=self.post, chat_id=2).status, "pending")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AttachmentLoaderTests(TestCase):
+    """
+    Test case for loading attachments once per post.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a post with one stored attachment.
+        """
+        user = User.objects.create_user(username="user4", password="pass")
+        post = ScheduledPost.objects.create(user=user, content="Hello!")
+        self.attachment = ScheduledPostAttachment.objects.create(
+            post=post,
+            file=ContentFile(b"0123456789", name="report.pdf"),
+            original_name="report.pdf"
+        )
+
+    def test_views_share_one_open_file(self) -> None:
+        """
+        Test that every view reads the full content while the file is opened only once.
+        """
+        with patch("builtins.open", wraps=open) as mock_open:
+            with AttachmentLoader() as loader:
+                first = loader.open(self.attachment)
+                second = loader.open(self.attachment)
+                self.assertEqual(first.read(4), b"0123")
+                self.assertEqual(second.read(), b"0123456789")
+                self.assertEqual(first.read(), b"456789")
+                self.assertEqual(first.name, "report.pdf")
+
+        self.assertEqual(mock_open.call_count, 1)
+        with self.assertRaises(ValueError):
+            first.seek(0)
+            first.read()
+
+    def test_backfill_stores_metadata(self) -> None:
+        """
+        Test that the backfill command stores kind, MIME type, size and hash of old attachments.
+        """
+        call_command("backfill_attachment_metadata", stdout=StringIO())
+
+        self.attachment.refresh_from_db()
+        self.assertEqual(self.attachment.media_kind, "document")
+        self.assertEqual(self.attachment.mime_type, "application/octet-stream")
+        self.assertEqual(self.attachment.size, 10)
+        self.assertEqual(self.attachment.content_hash, hashlib.sha256(b"0123456789").hexdigest())
+
+    def test_describe_classifies_media(self) -> None:
+        """
+        Test that small media files are sent by kind and oversized ones as documents.
+        """
+        photo = describe(ContentFile(b"x" * 10), "cat.png")
+        video = describe(ContentFile(b"x" * (MAX_MEDIA_SIZE + 1)), "clip.mp4")
+
+        self.assertEqual((photo["media_kind"], photo["mime_type"]), ("photo", "image/png"))
+        self.assertEqual((video["media_kind"], video["mime_type"]), ("document", "video/mp4"))
+
+
+class RateLimiterTests(TestCase):
+    """
+    Test case for the Telegram token bucket rate limiter.
+    """
+
+    def test_per_chat_bucket_spaces_messages(self) -> None:
+        """
+        Test that a second message to the same chat waits while other chats do not.
+        """
+        limiter = RateLimiter(LocalBucketStore())
+
+        self.assertEqual(limiter.reserve(100), 0)
+        self.assertEqual(limiter.reserve(200), 0)
+        self.assertAlmostEqual(limiter.reserve(100), 1.0, delta=0.05)
+
+    def test_group_chat_bucket_limits_per_minute(self) -> None:
+        """
+        Test that group chats are throttled to the per-minute group limit.
+        """
+        limiter = RateLimiter(LocalBucketStore())
+        with self.settings(TELEGRAM_CHAT_RATE=1000):
+            waits = [limiter.reserve(-100) for _ in range(21)]
+
+        self.assertEqual(max(waits[:20]), 0)
+        self.assertAlmostEqual(waits[20], 3.0, delta=0.05)
+
+    def test_database_store_is_shared(self) -> None:
+        """
+        Test that separate limiter instances share buckets through the database.
+        """
+        first = RateLimiter(DatabaseBucketStore())
+        second = RateLimiter(DatabaseBucketStore())
+
+        self.assertEqual(first.reserve(100), 0)
+        self.assertAlmostEqual(second.reserve(100), 1.0, delta=0.05)
+
+    def test_buckets_are_charged_at_send_time(self) -> None:
+        """
+        Test that a send delayed by one bucket takes the token of the other bucket at the delayed time.
+        """
+        store = LocalBucketStore()
+
+        waits = [
+            store.reserve([("a", 1, 1)]),
+            store.reserve([("a", 1, 1), ("b", 1, 1)]),
+            store.reserve([("b", 1, 1)]),
+        ]
+
+        self.assertEqual(waits[0], 0)
+        self.assertAlmostEqual(waits[1], 1.0, delta=0.05)
+        self.assertAlmostEqual(waits[2], 2.0, delta=0.05)
+
+    def test_database_store_locks_buckets_once(self) -> None:
+        """
+        Test that a reservation locks all its buckets in a single query and idle buckets are pruned.
+        """
+        limiter = RateLimiter(DatabaseBucketStore())
+        limiter.reserve(-100)
+        RateLimitBucket.objects.create(key="chat:1", tokens=0, updated_at=time.time() - 7200)
+
+        with CaptureQueriesContext(connection) as queries:
+            limiter.reserve(-100)
+
+        self.assertEqual(sum("FOR UPDATE" in query["sql"] for query in queries.captured_queries), 1)
+        self.assertEqual(limiter.store.prune(), 1)
+        self.assertEqual(
+            set(RateLimitBucket.objects.values_list("key", flat=True)),
+            {"global", "chat:-100", "group:-100"}
+        )
+
+
+class RetryTests(TestCase):
+    """
+    Test case for retrying Bot API calls.
+    """
+
+    def test_short_flood_wait_is_slept_through(self) -> None:
+        """
+        Test that a short retry_after is waited out inline.
+        """
+        call = Mock(side_effect=[flood_wait(3), "ok"])
+        sleep = Mock()
+
+        self.assertEqual(call_with_retry(call, sleep=sleep), "ok")
+        sleep.assert_called_once_with(3.0)
+
+    def test_long_flood_wait_is_deferred(self) -> None:
+        """
+        Test that a retry_after above the inline limit raises DeliveryDeferred.
+        """
+        with self.assertRaises(DeliveryDeferred) as ctx:
+            call_with_retry(Mock(side_effect=flood_wait(120)), sleep=Mock())
+        self.assertEqual(ctx.exception.retry_after, 120.0)
+
+    @override_settings(TELEGRAM_SEND_MAX_ATTEMPTS=3, TELEGRAM_RETRY_BACKOFF_BASE=1, TELEGRAM_RETRY_BACKOFF_MAX=30)
+    def test_network_errors_back_off_within_budget(self) -> None:
+        """
+        Test that network errors are retried with growing jittered delays up to the attempt budget.
+        """
+        call = Mock(side_effect=ConnectionError("reset"))
+        sleep = Mock()
+
+        with self.assertRaises(ConnectionError):
+            call_with_retry(call, sleep=sleep)
+
+        self.assertEqual(call.call_count, 3)
+        first, second = [c.args[0] for c in sleep.call_args_list]
+        self.assertTrue(0.5 <= first <= 1 and 1 <= second <= 2)
+
+    def test_permanent_errors_are_not_retried(self) -> None:
+        """
+        Test that client errors are raised after a single attempt.
+        """
+        error = ApiTelegramException("sendMessage", Mock(), {"error_code": 403, "description": "Forbidden"})
+        call = Mock(side_effect=error)
+
+        with self.assertRaises(ApiTelegramException):
+            call_with_retry(call, sleep=Mock())
+        call.assert_called_once()
@@ -0,0 +1,205 @@
+"""
+Translation cache
+Two-tier cache (in-process LRU + database) for translated post texts, both expiring after TRANSLATION_CACHE_TTL.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import hashlib
+import threading
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils import timezone
+
+from .models import TranslationCacheEntry
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+EVICT_EVERY = 100  # run DB eviction once per this many stored entries
+
+# --------------------------------------------------------------------------------
+# CACHE STATE
+
+_lock = threading.Lock()
+# Least recently used entries are dropped first, and every entry expires TTL seconds after it was loaded.
+_lru = TTLCache(maxsize=settings.TRANSLATION_CACHE_LRU_SIZE, ttl=settings.TRANSLATION_CACHE_TTL)
+_stats = {'lru_hits': 0, 'db_hits': 0, 'misses': 0}
+_writes = 0
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def _hash_text(text: str) -> str:
+    """
+    Compute the cache hash of a source text.
+
+    Args:
+        text (str): Source text.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _count(counter: str) -> None:
+    """
+    Increment a hit/miss counter.
+
+    Args:
+        counter (str): Counter name.
+    """
+    with _lock:
+        _stats[counter] += 1
+
+
+def _store(entries: Dict[Tuple[str, str], str]) -> None:
+    """
+    Persist translations in the database tier with one upsert, evicting stale rows periodically.
+
+    Args:
+        entries (dict): Translated text keyed by (source hash, target language).
+    """
+    global _writes
+    now = timezone.now()
+    TranslationCacheEntry.objects.bulk_create(
+        [
+            TranslationCacheEntry(source_hash=source_hash, language=dest, text=translated, created_at=now)
+            for (source_hash, dest), translated in entries.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['source_hash', 'language'],
+        update_fields=['text', 'created_at']
+    )
+    with _lock:
+        run_eviction = (_writes + len(entries)) // EVICT_EVERY > _writes // EVICT_EVERY
+        _writes += len(entries)
+    if run_eviction:
+        evict()
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def get_or_translate(text: str, dest: str, translate: Callable[[str, str], str]) -> str:
+    """
+    Return a cached translation or translate the text and cache the result.
+
+    Args:
+        text (str): Source text.
+        dest (str): Target language code.
+        translate (Callable): Function performing the actual translation.
+
+    Returns:
+        str: Translated text.
+    """
+    result = get_or_translate_many(
+        [(text, dest)],
+        lambda pairs: [translate(*pair) for pair in pairs]
+    )
+    return result[(text, dest)]
+
+
+def get_or_translate_many(
+    pairs: Iterable[Tuple[str, str]],
+    translate_batch: Callable[[List[Tuple[str, str]]], List[str]]
+) -> Dict[Tuple[str, str], str]:
+    """
+    Resolve many (text, language) pairs, translating only the cache misses in one batch.
+
+    Cache hits are read with one query and the new translations written with another.
+
+    Args:
+        pairs (Iterable[tuple]): Source text and target language pairs.
+        translate_batch (Callable): Function translating a list of pairs, returning texts in order.
+
+    Returns:
+        dict: Translated text keyed by (text, language).
+    """
+    results = {}
+    missing = {}
+    for text, dest in dict.fromkeys(pairs):
+        key = (_hash_text(text), dest)
+        with _lock:
+            cached = _lru.get(key)
+        if cached is not None:
+            _count('lru_hits')
+            results[(text, dest)] = cached
+        else:
+            missing[key] = (text, dest)
+
+    if missing:
+        expires_after = timezone.now() - timedelta(seconds=settings.TRANSLATION_CACHE_TTL)
+        rows = TranslationCacheEntry.objects.filter(
+            source_hash__in={source_hash for source_hash, _ in missing},
+            language__in={dest for _, dest in missing},
+            created_at__gte=expires_after
+        ).values_list('source_hash', 'language', 'text')
+        for source_hash, dest, cached in rows:
+            pair = missing.pop((source_hash, dest), None)
+            if pair is None:
+                continue
+            _count('db_hits')
+            with _lock:
+                _lru[(source_hash, dest)] = cached
+            results[pair] = cached
+
+    if missing:
+        pending = list(missing.items())
+        translated = translate_batch([pair for _, pair in pending])
+        stored = {}
+        for (key, pair), text in zip(pending, translated):
+            _count('misses')
+            stored[key] = text
+            with _lock:
+                _lru[key] = text
+            results[pair] = text
+        _store(stored)
+    return results
+
+
+def evict() -> int:
+    """
+    Delete expired entries and trim the database tier to its maximum size.
+
+    Returns:
+        int: Number of deleted rows.
+    """
+    expires_after = timezone.now() - timedelta(seconds=settings.TRANSLATION_CACHE_TTL)
+    deleted, _ = TranslationCacheEntry.objects.filter(created_at__lt=expires_after).delete()
+
+    max_entries = settings.TRANSLATION_CACHE_MAX_ENTRIES
+    overflow = list(TranslationCacheEntry.objects.order_by('-created_at').values_list(
+        'created_at', flat=True
+    )[max_entries:max_entries + 1])
+    if overflow:
+        trimmed, _ = TranslationCacheEntry.objects.filter(created_at__lte=overflow[0]).delete()
+        deleted += trimmed
+    return deleted
+
+
+def stats() -> Dict[str, int]:
+    """
+    Return hit/miss counters of the cache.
+
+    Returns:
+        dict: Counters for LRU hits, DB hits and misses.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def clear() -> None:
+    """
+    Clear the in-process tier and reset the counters.
+    """
+    with _lock:
+        _lru.clear()
+        for counter in _stats:
+            _stats[counter] = 0
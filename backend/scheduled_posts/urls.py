@@ -9,6 +9,7 @@ This file contains the URL patterns for the scheduled posts functionality.
 from django.urls import path
 
 from .views import (
+    ScheduledPostBulkCreateView,
     ScheduledPostListCreateView,
     create_post_view,
     my_posts_view,
@@ -22,6 +23,7 @@ from .views import (
 
 urlpatterns = [
     path('posts/', ScheduledPostListCreateView.as_view(), name='posts'),
+    path('posts/bulk/', ScheduledPostBulkCreateView.as_view(), name='posts_bulk'),
     path('create-post/', create_post_view, name='create_post'),
     path('my-posts/', my_posts_view, name='my_posts'),
     path('send-now/<int:post_id>/', send_post_now, name='send_post_now'),
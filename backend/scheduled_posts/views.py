@@ -9,19 +9,29 @@ Views for creating, listing, sending, and cancelling scheduled posts.
 from datetime import timedelta
 
 from celery.result import AsyncResult
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Exists, OuterRef
 from django.http import FileResponse, Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
-
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from tgpostman.pagination import KeysetPagination, KeysetPaginator
+from tgpostman.search import search
+from . import ledger
+from .attachments import describe
+from .bulk import create_posts
 from .forms import CreatePostForm
-from .models import ScheduledPost, ScheduledPostAttachment
+from .models import PostDelivery, ScheduledPost, ScheduledPostAttachment
+from .parsers import NDJSONParser
 from .serializers import ScheduledPostSerializer
-from .tasks import send_scheduled_post
+from .tasks import dispatch_post, schedule_preparation, send_scheduled_post
 
 
 # --------------------------------------------------------------------------------
@@ -31,23 +41,69 @@ class ScheduledPostListCreateView(generics.ListCreateAPIView):
     """
     API view for listing and creating scheduled posts.
 
+    The list accepts a ``q`` parameter ranking posts by a full-text search of their content
+    and is paginated with an opaque ``cursor`` parameter.
+
     Returns:
         QuerySet of posts belonging to the authenticated user.
     """
 
     serializer_class = ScheduledPostSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
-        Filter posts by the current authenticated user.
+        Filter posts by the current authenticated user and the optional search phrase.
 
         Returns:
-            QuerySet: Scheduled posts ordered by schedule time.
+            QuerySet: Scheduled posts ordered by relevance, then schedule time.
         """
-        return ScheduledPost.objects.filter(
-            user=self.request.user
-        ).order_by('-schedule_time')
+        posts = ScheduledPost.objects.filter(user=self.request.user).prefetch_related('targets', 'groups')
+        return search(posts, self.request.query_params.get('q', ''), 'content', '-schedule_time')
+
+
+# --------------------------------------------------------------------------------
+
+
+class ScheduledPostBulkCreateView(APIView):
+    """
+    API view creating many scheduled posts in one request.
+
+    Accepts a JSON array or an NDJSON stream of posts shaped like the list
+    endpoint's input, with attachments given as ``{"name", "content"}`` objects
+    holding Base64 data. Responds with one result per post: 201 if every post
+    was created, 207 if some were rejected.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request):
+        """
+        Validate and create the posts of the request body.
+
+        Args:
+            request (Request): Request with a list of posts.
+
+        Returns:
+            Response: Per-post results in input order.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'detail': 'Ожидается массив постов.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.POST_BULK_MAX_ITEMS:
+            return Response(
+                {'detail': f'Не более {settings.POST_BULK_MAX_ITEMS} постов за запрос.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = create_posts(request.user, items)
+        created = all(result['status'] == 'created' for result in results)
+        return Response(
+            {'results': results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_207_MULTI_STATUS
+        )
 
 
 # --------------------------------------------------------------------------------
@@ -100,12 +156,12 @@ def create_post_view(request):
                 ScheduledPostAttachment.objects.create(
                     post=post,
                     file=f,
-                    original_name=original_name
+                    original_name=original_name,
+                    **describe(f, original_name)
                 )
 
-            task = send_scheduled_post.apply_async(args=[post.id], eta=post.schedule_time)
-            post.celery_task_id = task.id
-            post.save()
+            dispatch_post(post)
+            schedule_preparation(post)
 
             messages.success(request, 'Пост успешно создан и будет отправлен!')
             return redirect('my_posts')
@@ -132,19 +188,12 @@ def my_posts_view(request):
     q = request.GET.get('q', '')
     posts_qs = ScheduledPost.objects.filter(
         user=request.user
-    ).prefetch_related('targets', 'groups').order_by('-created_at')
-
-    if q:
-        posts_qs = posts_qs.filter(content__icontains=q)
+    ).prefetch_related('targets', 'groups').annotate(
+        retryable=Exists(PostDelivery.objects.filter(post=OuterRef('pk'), status='failed'))
+    )
+    posts_qs = search(posts_qs, q, 'content', '-created_at')
 
-    paginator = Paginator(posts_qs, 10)
-    page = request.GET.get('page', 1)
-    try:
-        posts = paginator.page(page)
-    except PageNotAnInteger:
-        posts = paginator.page(1)
-    except EmptyPage:
-        posts = paginator.page(paginator.num_pages)
+    posts = KeysetPaginator(posts_qs, 10).page_or_first(request.GET.get('cursor'))
 
     form = CreatePostForm(user=request.user)
     return render(request, 'posts/my_posts.html', {'posts': posts, 'q': q, 'form': form})
@@ -156,7 +205,9 @@ def my_posts_view(request):
 @login_required
 def send_post_now(request, post_id):
     """
-    Immediately send a pending scheduled post.
+    Immediately send a pending scheduled post, or retry a failed one.
+
+    A retry is delivered only to the recipients that have not received the post yet.
 
     Args:
         request (HttpRequest): The incoming request.
@@ -166,7 +217,10 @@ def send_post_now(request, post_id):
         HttpResponseRedirect: Redirect back to post list.
     """
     post = ScheduledPost.objects.get(id=post_id, user=request.user)
-    if post.status == 'pending':
+    if post.status == 'pending' or ledger.can_retry(post):
+        post.status = 'pending'
+        post.error_message = None
+        post.dispatched_at = timezone.now()
         task = send_scheduled_post.apply_async(args=[post.id], eta=timezone.now())
         post.celery_task_id = task.id
         post.save()
@@ -194,7 +248,10 @@ def cancel_post(request, post_id):
     """
     try:
         post = ScheduledPost.objects.get(id=post_id, user=request.user)
-        if post.status == 'pending' and post.celery_task_id:
+        not_dispatched = ScheduledPost.objects.filter(id=post.id, status='pending', dispatched_at__isnull=True)
+        if not_dispatched.update(status='failed', error_message='Пост был отменен пользователем.'):
+            messages.success(request, 'Пост был отменен!')
+        elif post.status == 'pending' and post.celery_task_id:
             result = AsyncResult(post.celery_task_id)
             if result.state == 'PENDING':
                 result.revoke(terminate=True)
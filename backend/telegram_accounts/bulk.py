@@ -0,0 +1,54 @@
+"""
+Bulk chat import
+
+This file adds many Telegram chats at once, inserting them in one query and validating them in the background.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+from typing import List
+
+from .models import TelegramChat
+from .tasks import schedule_validation
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def import_chats(user, chat_ids: List[int]) -> List[dict]:
+    """
+    Add chats the user does not have yet.
+
+    New chats are inserted with a single ``INSERT`` in the 'validating' state
+    and checked with Telegram by the validate_chat task once committed, so the
+    import never waits for Bot API lookups. Poll the chat status for the verdict.
+
+    :param user: Owner of the new chats
+    :param chat_ids: Telegram chat IDs, duplicates are imported once
+    :return: One result per distinct chat ID, in input order, with the chat ID and its status
+    """
+    chat_ids = list(dict.fromkeys(chat_ids))
+    existing = dict(
+        TelegramChat.objects.filter(user=user, chat_id__in=chat_ids).values_list('chat_id', 'pk')
+    )
+    new_ids = [chat_id for chat_id in chat_ids if chat_id not in existing]
+
+    # A chat added concurrently is skipped, so the import never fails half-way.
+    TelegramChat.objects.bulk_create(
+        [TelegramChat(user=user, chat_id=chat_id, title=str(chat_id), status='validating') for chat_id in new_ids],
+        ignore_conflicts=True
+    )
+    created = {}
+    for chat in TelegramChat.objects.filter(user=user, chat_id__in=new_ids, status='validating').only('pk', 'chat_id'):
+        created[chat.chat_id] = chat.pk
+        schedule_validation(chat)
+
+    results = []
+    for chat_id in chat_ids:
+        if chat_id in created:
+            results.append({'chat_id': chat_id, 'status': 'validating', 'id': created[chat_id]})
+        else:
+            pk = existing.get(chat_id) or TelegramChat.objects.get(user=user, chat_id=chat_id).pk
+            results.append({'chat_id': chat_id, 'status': 'exists', 'id': pk})
+    return results
@@ -9,7 +9,7 @@ Forms for adding and validating Telegram chat/channel data.
 from django import forms
 
 from .models import TelegramChat
-from .telegram_api import get_chat_info
+from .tasks import schedule_validation
 
 # --------------------------------------------------------------------------------
 
@@ -50,7 +50,7 @@ class AddChatForm(forms.Form):
 
 class TelegramChatForm(forms.ModelForm):
     """
-    ModelForm for adding a Telegram chat with validation and enrichment.
+    ModelForm for adding a Telegram chat, validated with Telegram in the background.
 
     Args:
         user (User): The user adding the chat.
@@ -75,29 +75,26 @@ class TelegramChatForm(forms.ModelForm):
 
     def clean_chat_id(self):
         """
-        Validate uniqueness and retrieve chat metadata via API.
+        Validate that the chat has not been added yet.
+
+        Telegram is not asked here: the chat is checked in the background after saving.
 
         Returns:
             int: Validated chat ID.
 
         Raises:
-            ValidationError: If chat already exists or info cannot be retrieved.
+            ValidationError: If chat already exists.
         """
         chat_id = self.cleaned_data['chat_id']
         if TelegramChat.objects.filter(user=self.user, chat_id=chat_id).exists():
             raise forms.ValidationError("Чат с таким ID уже добавлен.")
-        try:
-            chat_info = get_chat_info(chat_id)
-            self.cleaned_data['title'] = chat_info['title']
-            self.cleaned_data['chat_type'] = chat_info['chat_type']
-            self.cleaned_data['url'] = chat_info['url']
-        except Exception as e:
-            raise forms.ValidationError(f"Не удалось получить данные чата: {e}")
         return chat_id
 
     def save(self, commit=True):
         """
-        Save the chat instance with additional API metadata.
+        Save the chat in the 'validating' state and queue its check with Telegram.
+
+        The title is a placeholder until the background task stores the chat metadata.
 
         Args:
             commit (bool): Whether to save to the database immediately.
@@ -107,9 +104,9 @@ class TelegramChatForm(forms.ModelForm):
         """
         instance = super().save(commit=False)
         instance.user = self.user
-        instance.title = self.cleaned_data.get('title')
-        instance.chat_type = self.cleaned_data.get('chat_type')
-        instance.url = self.cleaned_data.get('url')
+        instance.title = str(instance.chat_id)
+        instance.status = 'validating'
         if commit:
             instance.save()
+            schedule_validation(instance)
         return instance
@@ -9,10 +9,17 @@ class Migration(migrations.Migration):
         ('telegram_accounts', '0002_initial'),
     ]
 
+    # 0001_initial already creates the column: only the migration state is updated here,
+    # so migrating an empty database does not fail with DuplicateColumn.
     operations = [
-        migrations.AddField(
-            model_name='telegramchat',
-            name='chat_type',
-            field=models.CharField(blank=True, max_length=32),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='telegramchat',
+                    name='chat_type',
+                    field=models.CharField(blank=True, max_length=32),
+                ),
+            ],
+            database_operations=[],
         ),
     ]
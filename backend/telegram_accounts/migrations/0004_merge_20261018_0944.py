@@ -0,0 +1,14 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:44
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_accounts', '0003_alter_telegramchat_url'),
+        ('telegram_accounts', '0003_telegramchat_chat_type'),
+    ]
+
+    operations = [
+    ]
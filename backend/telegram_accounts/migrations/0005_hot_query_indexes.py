@@ -0,0 +1,23 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_accounts', '0004_merge_20261018_0944'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='telegramchat',
+            index=models.Index(fields=['chat_id'], name='telegramchat_chat_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telegramchat',
+            index=models.Index(fields=['user', 'title'], name='telegramchat_user_title_idx'),
+        ),
+    ]
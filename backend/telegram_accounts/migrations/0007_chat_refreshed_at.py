@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_accounts', '0006_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='telegramchat',
+            name='refreshed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
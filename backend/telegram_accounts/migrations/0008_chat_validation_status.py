@@ -0,0 +1,23 @@
+# Generated by Django 5.1.8 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_accounts', '0007_chat_refreshed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='telegramchat',
+            name='error_message',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='telegramchat',
+            name='status',
+            field=models.CharField(choices=[('validating', 'Validating'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+    ]
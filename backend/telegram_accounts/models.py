@@ -9,6 +9,8 @@ Model representing a Telegram chat or channel linked to a user.
 from django.conf import settings
 from django.db import models
 
+from tgpostman.search import search_indexes, search_vector_field
+
 # --------------------------------------------------------------------------------
 
 
@@ -24,8 +26,18 @@ class TelegramChat(models.Model):
         url (str): Optional public URL (t.me/…).
         can_post (bool): Whether the bot can post to this chat.
         added_at (datetime): Timestamp when the chat was added.
+        refreshed_at (datetime): When the metadata was last fetched from Telegram.
+        status (str): Whether the chat is still being checked with Telegram, ready or rejected.
+        error_message (str): Why Telegram rejected the chat.
+        search_vector (SearchVector): Full-text vector of the title, maintained by the database.
     """
 
+    STATUS_CHOICES = [
+        ('validating', 'Validating'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     chat_id = models.BigIntegerField()
     chat_type = models.CharField(max_length=32, blank=True)
@@ -33,9 +45,18 @@ class TelegramChat(models.Model):
     url = models.URLField(blank=True, null=True)
     can_post = models.BooleanField(default=False)
     added_at = models.DateTimeField(auto_now_add=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='ready')
+    error_message = models.TextField(blank=True, null=True)
+    search_vector = search_vector_field('title')
 
     class Meta:
         unique_together = ('user', 'chat_id')
+        indexes = [
+            models.Index(fields=['chat_id'], name='telegramchat_chat_id_idx'),
+            models.Index(fields=['user', 'title'], name='telegramchat_user_title_idx'),
+            *search_indexes('telegramchat', 'title'),
+        ]
 
     def __str__(self) -> str:
         """
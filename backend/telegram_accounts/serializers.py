@@ -7,6 +7,7 @@ This file defines the serializer for the TelegramChat model, including field def
 # --------------------------------------------------------------------------------
 # IMPORTS
 
+from django.conf import settings
 from rest_framework import serializers
 
 from .models import TelegramChat
@@ -22,8 +23,13 @@ class TelegramChatSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TelegramChat
-        fields = "__all__"
-        read_only_fields = ("user", "title", "can_post", "chat_type", "url")
+        fields = (
+            "id", "user", "chat_id", "chat_type", "title", "url", "can_post", "added_at",
+            "refreshed_at", "status", "error_message"
+        )
+        read_only_fields = (
+            "user", "title", "can_post", "chat_type", "url", "refreshed_at", "status", "error_message"
+        )
 
     def create(self, validated_data: dict) -> TelegramChat:
         """
@@ -33,3 +39,26 @@ class TelegramChatSerializer(serializers.ModelSerializer):
         :return: The created TelegramChat instance
         """
         return TelegramChat.objects.create(**validated_data)
+
+
+class TelegramChatImportSerializer(serializers.Serializer):
+    """
+    Serializer validating the chat IDs of a bulk import.
+    """
+
+    chat_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.TELEGRAM_CHAT_IMPORT_MAX
+    )
+
+
+class TelegramChatStatusSerializer(serializers.ModelSerializer):
+    """
+    Lightweight serializer polled while a newly added chat is being validated.
+    """
+
+    class Meta:
+        model = TelegramChat
+        fields = ("id", "chat_id", "status", "error_message", "title", "can_post", "chat_type", "url")
+        read_only_fields = fields
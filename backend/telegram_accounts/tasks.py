@@ -0,0 +1,125 @@
+"""
+Telegram chat tasks
+
+This file defines Celery tasks keeping stored chat metadata in sync with Telegram.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import TelegramChat
+from .telegram_api import ChatUnavailable, get_chat_info, get_chat_infos
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+VALIDATION_MAX_RETRIES = 3
+VALIDATION_RETRY_DELAY = 10  # seconds between lookups after a network error
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def schedule_validation(chat: TelegramChat) -> None:
+    """
+    Check a newly added chat with Telegram in the background once the row is committed.
+
+    :param chat: Chat saved in the 'validating' state
+    """
+    transaction.on_commit(lambda: validate_chat.delay(chat.pk))
+
+# --------------------------------------------------------------------------------
+# CELERY TASKS
+
+
+@shared_task(bind=True, max_retries=VALIDATION_MAX_RETRIES, default_retry_delay=VALIDATION_RETRY_DELAY)
+def validate_chat(self, chat_pk: int) -> None:
+    """
+    Celery task fetching the metadata of a newly added chat and settling its status.
+
+    Chats Telegram does not know or denies access to are marked 'failed' at
+    once; network errors are retried before giving up.
+
+    :param chat_pk: Primary key of the TelegramChat to validate
+    :return: None
+    """
+    try:
+        chat = TelegramChat.objects.get(pk=chat_pk, status='validating')
+    except TelegramChat.DoesNotExist:
+        return
+
+    try:
+        info = get_chat_info(chat.chat_id)
+    except ValueError as e:
+        if not isinstance(e, ChatUnavailable) and self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        TelegramChat.objects.filter(pk=chat_pk).update(
+            status='failed', can_post=False, error_message=str(e), refreshed_at=timezone.now()
+        )
+        return
+
+    TelegramChat.objects.filter(pk=chat_pk).update(
+        status='ready', error_message=None, refreshed_at=timezone.now(), **info
+    )
+
+
+@shared_task
+def refresh_chat_metadata() -> int:
+    """
+    Periodic task re-fetching title, URL, type and posting permission of stale chats.
+
+    Ready chats not refreshed for TELEGRAM_CHAT_REFRESH_AGE seconds are
+    processed in batches of TELEGRAM_CHAT_REFRESH_BATCH distinct chat IDs:
+    each batch is looked up concurrently and written with one ``UPDATE`` for
+    every user who added the chat. Chats Telegram no longer gives access to
+    lose ``can_post``; chats whose lookup failed for another reason are left
+    for the next run.
+
+    :return: Number of refreshed chat rows
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.TELEGRAM_CHAT_REFRESH_AGE)
+    stale = TelegramChat.objects.filter(
+        Q(refreshed_at__isnull=True) | Q(refreshed_at__lt=cutoff), status='ready'
+    )
+    batch_size = settings.TELEGRAM_CHAT_REFRESH_BATCH
+    refreshed = 0
+    last_chat_id = None
+
+    while True:
+        batch = stale if last_chat_id is None else stale.filter(chat_id__gt=last_chat_id)
+        chat_ids = list(batch.order_by('chat_id').values_list('chat_id', flat=True).distinct()[:batch_size])
+        if not chat_ids:
+            break
+        last_chat_id = chat_ids[-1]
+
+        infos = {
+            chat_id: info
+            for chat_id, info in get_chat_infos(chat_ids, fresh=True).items()
+            if isinstance(info, (dict, ChatUnavailable))
+        }
+        now = timezone.now()
+        rows = list(stale.filter(chat_id__in=list(infos)))
+        for chat in rows:
+            info = infos[chat.chat_id]
+            if isinstance(info, ChatUnavailable):
+                chat.can_post = False
+            else:
+                chat.title = info['title']
+                chat.can_post = info['can_post']
+                chat.chat_type = info['chat_type']
+                chat.url = info['url']
+            chat.refreshed_at = now
+        TelegramChat.objects.bulk_update(rows, ['title', 'can_post', 'chat_type', 'url', 'refreshed_at'])
+        refreshed += len(rows)
+
+        if len(chat_ids) < batch_size:
+            break
+    return refreshed
@@ -7,33 +7,170 @@ This file contains logic for interacting with the Telegram bot API to retrieve c
 # --------------------------------------------------------------------------------
 # IMPORTS
 
-from decouple import config
-from telebot import TeleBot
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Union
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.db import connections
+from telebot.apihelper import ApiTelegramException
+
+from scheduled_posts.rate_limiter import RateLimiter
+from tgpostman.telegram import bot
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+LOOKUP_BUCKET = 'lookup'
+UNAVAILABLE_ERROR_CODES = {400, 403}  # chat not found, bot not a member or kicked
+
+# --------------------------------------------------------------------------------
+# CACHE STATE
+
+_lock = threading.Lock()
+_found = TTLCache(maxsize=settings.TELEGRAM_CHAT_INFO_CACHE_SIZE, ttl=settings.TELEGRAM_CHAT_INFO_TTL)
+_missing = TTLCache(maxsize=settings.TELEGRAM_CHAT_INFO_CACHE_SIZE, ttl=settings.TELEGRAM_CHAT_INFO_NEGATIVE_TTL)
+
+rate_limiter = RateLimiter.from_settings()
+
+# --------------------------------------------------------------------------------
+# EXCEPTIONS
+
+
+class ChatUnavailable(ValueError):
+    """
+    Raised when Telegram reports that a chat does not exist or the bot cannot access it.
+
+    Unlike network errors, this answer is cached for TELEGRAM_CHAT_INFO_NEGATIVE_TTL seconds.
+    """
 
 # --------------------------------------------------------------------------------
-# BOT INITIALIZATION
+# HELPER FUNCTIONS
+
+
+def _describe(chat) -> dict:
+    """
+    Extract the stored metadata from a Bot API chat.
+
+    :param chat: Chat returned by getChat
+    :return: A dictionary containing the chat's title, post permission, type and URL
+    """
+    return {
+        "title": chat.title or chat.username or str(chat.id),
+        "can_post": chat.type in ("group", "supergroup", "channel"),
+        "chat_type": chat.type,
+        "url": f'https://t.me/{chat.username}' if chat.username else getattr(chat, 'invite_link', None),
+    }
+
+
+def _fetch(chat_id: int) -> dict:
+    """
+    Ask Telegram for a chat under the lookup rate limit and cache the answer.
 
-BOT_TOKEN = config("TELEGRAM_BOT_TOKEN")
-bot = TeleBot(token=BOT_TOKEN)
+    :param chat_id: The ID of the chat to retrieve information about
+    :return: Chat metadata
+    :raises ChatUnavailable: If Telegram does not know the chat or denies access
+    :raises ValueError: If the chat info cannot be fetched for another reason
+    """
+    try:
+        rate_limiter.throttle(LOOKUP_BUCKET, settings.TELEGRAM_LOOKUP_RATE)
+        info = _describe(bot.get_chat(chat_id))
+    except ApiTelegramException as e:
+        if e.error_code not in UNAVAILABLE_ERROR_CODES:
+            raise ValueError(f"Telegram error: {e}")
+        error = ChatUnavailable(f"Telegram error: {e.description}")
+        with _lock:
+            _found.pop(chat_id, None)
+            _missing[chat_id] = error
+        raise error
+    except Exception as e:
+        raise ValueError(f"Telegram error: {e}")
+
+    with _lock:
+        _missing.pop(chat_id, None)
+        _found[chat_id] = info
+    return dict(info)
+
+
+def _cached(chat_id: int) -> Union[dict, ChatUnavailable, None]:
+    """
+    Look up a chat in the positive and negative caches.
+
+    :param chat_id: The ID of the chat
+    :return: A copy of the cached metadata, the cached error, or None on a miss
+    """
+    with _lock:
+        info = _found.get(chat_id)
+        if info is not None:
+            return dict(info)
+        return _missing.get(chat_id)
 
 # --------------------------------------------------------------------------------
 # FUNCTION DEFINITION
 
-def get_chat_info(chat_id: int) -> dict:
+def get_chat_info(chat_id: int, fresh: bool = False) -> dict:
     """
     Retrieve information about a Telegram chat, such as title, posting permissions, and chat type.
 
+    Answers are cached for TELEGRAM_CHAT_INFO_TTL seconds, unknown chats for
+    TELEGRAM_CHAT_INFO_NEGATIVE_TTL seconds.
+
     :param chat_id: The ID of the chat to retrieve information about
+    :param fresh: Skip the cache and ask Telegram
     :return: A dictionary containing the chat's title, post permission, and type
     :raises ValueError: If the chat info cannot be fetched
     """
-    try:
-        chat = bot.get_chat(chat_id)
-        return {
-            "title": chat.title or chat.username,
-            "can_post": chat.type in ("group", "supergroup", "channel"),
-            "chat_type": chat.type,
-            "url": f'https://t.me/{chat.username}' if chat.username else getattr(chat, 'invite_link', None),
-        }
-    except Exception as e:
-        raise ValueError(f"Telegram error: {e}")
+    chat_id = int(chat_id)
+    cached = None if fresh else _cached(chat_id)
+    if isinstance(cached, ChatUnavailable):
+        raise cached
+    if cached is not None:
+        return cached
+    return _fetch(chat_id)
+
+
+def get_chat_infos(chat_ids: Iterable[int], fresh: bool = False) -> Dict[int, Union[dict, ValueError]]:
+    """
+    Retrieve information about many chats, asking Telegram concurrently for cache misses.
+
+    Lookups run on up to TELEGRAM_LOOKUP_CONCURRENCY threads and together stay
+    within TELEGRAM_LOOKUP_RATE calls per second. A failed chat does not stop
+    the others.
+
+    :param chat_ids: IDs of the chats
+    :param fresh: Skip the cache and ask Telegram for every chat
+    :return: Metadata or the lookup error, keyed by chat ID
+    """
+    results: Dict[int, Union[dict, ValueError]] = {}
+    pending = []
+    for chat_id in dict.fromkeys(int(chat_id) for chat_id in chat_ids):
+        cached = None if fresh else _cached(chat_id)
+        if cached is None:
+            pending.append(chat_id)
+        else:
+            results[chat_id] = cached
+
+    queue = iter(pending)
+    queue_lock = threading.Lock()
+
+    def worker() -> None:
+        try:
+            while True:
+                with queue_lock:
+                    chat_id = next(queue, None)
+                if chat_id is None:
+                    return
+                try:
+                    results[chat_id] = _fetch(chat_id)
+                except ValueError as e:
+                    results[chat_id] = e
+        finally:
+            connections.close_all()
+
+    workers = min(settings.TELEGRAM_LOOKUP_CONCURRENCY, len(pending))
+    if workers:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(worker)
+    return results
@@ -7,11 +7,46 @@ This file contains unit tests for the Telegram chat integration, including the a
 # --------------------------------------------------------------------------------
 # IMPORTS
 
-from unittest.mock import patch
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock, patch
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
+from scheduled_posts.rate_limiter import LocalBucketStore, RateLimiter
+from telebot.apihelper import ApiTelegramException
+from telegram_accounts import telegram_api
+from telegram_accounts.models import TelegramChat
+from telegram_accounts.tasks import refresh_chat_metadata
+from tgpostman import telegram
+from tgpostman.celery import app as celery_app
 from users.models import User
 
+# --------------------------------------------------------------------------------
+# HELPERS
+
+def telegram_chat(chat_id: int, title: str) -> Mock:
+    """
+    Build a chat as returned by getChat.
+    :param chat_id: Telegram chat ID.
+    :param title: Chat title.
+    :return: Channel without a public username.
+    """
+    return Mock(id=chat_id, title=title, username=None, type="channel", invite_link=None)
+
+
+def chat_not_found() -> ApiTelegramException:
+    """
+    Build the error the Bot API raises for an unknown chat.
+    :return: 400 error.
+    """
+    return ApiTelegramException("getChat", Mock(), {"error_code": 400, "description": "Bad Request: chat not found"})
+
 # --------------------------------------------------------------------------------
 # TEST CASES
 
@@ -26,10 +61,17 @@ class TelegramChatTests(APITestCase):
         self.user = User.objects.create_user(username="user1", password="1234")
         self.client.credentials(HTTP_X_API_KEY=self.user.api_key)
 
-    @patch("telegram_accounts.views.get_chat_info")
+    def eager_tasks(self) -> None:
+        """
+        Run Celery tasks inline for the rest of the test.
+        """
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+
+    @patch("telegram_accounts.tasks.get_chat_info")
     def test_add_chat(self, mock_get_chat_info) -> None:
         """
-        Test the addition of a new Telegram chat using mocked chat info.
+        Test that a new chat is saved as validating and gets its metadata from the background task.
         :param mock_get_chat_info: Mock for the get_chat_info function.
         """
         mock_get_chat_info.return_value = {
@@ -38,9 +80,252 @@ class TelegramChatTests(APITestCase):
             "chat_type": "channel",
             "url":None
         }
+        self.eager_tasks()
         data = {"chat_id": -100123456789}
         url = reverse("telegramchat-list")
-        response = self.client.post(url, data)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url, data)
 
         self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["status"], "validating")
+        self.assertNotIn("search_vector", response.data)
+        mock_get_chat_info.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        response = self.client.get(reverse("telegramchat-validation-status", args=[response.data["id"]]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "ready")
         self.assertEqual(response.data["title"], "Test Group")
+        self.assertTrue(response.data["can_post"])
+
+    @patch("telegram_accounts.tasks.get_chat_info")
+    def test_form_does_not_wait_for_telegram(self, mock_get_chat_info) -> None:
+        """
+        Test that the web form saves the chat at once and a rejected chat is reported through the status view.
+        :param mock_get_chat_info: Mock for the get_chat_info function.
+        """
+        mock_get_chat_info.side_effect = telegram_api.ChatUnavailable("Telegram error: chat not found")
+        self.eager_tasks()
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse("manage_telegram_chats"), {"chat_id": "-42"})
+
+        self.assertEqual(response.status_code, 302)
+        chat = TelegramChat.objects.get(user=self.user, chat_id=-42)
+        self.assertEqual((chat.status, chat.title), ("validating", "-42"))
+        mock_get_chat_info.assert_not_called()
+        status_url = reverse("telegram_chat_status", args=[chat.pk])
+        self.assertContains(self.client.get(reverse("manage_telegram_chats")), f'data-status-url="{status_url}"')
+
+        for callback in callbacks:
+            callback()
+        response = self.client.get(status_url)
+
+        self.assertEqual(response.json()["status"], "failed")
+        self.assertEqual(response.json()["error_message"], "Telegram error: chat not found")
+        self.assertFalse(response.json()["can_post"])
+
+
+class ChatInfoTests(APITestCase):
+    """
+    Test case for cached chat lookups, bulk import and metadata refresh.
+    """
+    def setUp(self) -> None:
+        """
+        Reset the lookup caches and mock the Bot API client.
+        """
+        telegram_api._found.clear()
+        telegram_api._missing.clear()
+        for target, value in (
+            ("telegram_accounts.telegram_api.rate_limiter", RateLimiter(LocalBucketStore())),
+            ("telegram_accounts.telegram_api.bot", Mock()),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.bot = telegram_api.bot
+        self.user = User.objects.create_user(username="user2", password="1234")
+        self.client.credentials(HTTP_X_API_KEY=self.user.api_key)
+
+    def test_lookups_are_cached(self) -> None:
+        """
+        Test that known and unknown chats are fetched once, while network errors are retried.
+        """
+        self.bot.get_chat.return_value = telegram_chat(-1, "News")
+        self.assertEqual(telegram_api.get_chat_info(-1)["title"], "News")
+        self.assertEqual(telegram_api.get_chat_info("-1")["title"], "News")
+        self.assertEqual(self.bot.get_chat.call_count, 1)
+
+        self.bot.get_chat.side_effect = chat_not_found()
+        for _ in range(2):
+            with self.assertRaises(telegram_api.ChatUnavailable):
+                telegram_api.get_chat_info(-2)
+        self.assertEqual(self.bot.get_chat.call_count, 2)
+
+        self.bot.get_chat.side_effect = ConnectionError("timeout")
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                telegram_api.get_chat_info(-3)
+        self.assertEqual(self.bot.get_chat.call_count, 4)
+
+    def test_bulk_import(self) -> None:
+        """
+        Test that a bulk import skips known chats, inserts the rest at once and validates them in the background.
+        """
+        existing = TelegramChat.objects.create(user=self.user, chat_id=-1, title="Old")
+
+        def get_chat(chat_id: int) -> Mock:
+            if chat_id == -3:
+                raise chat_not_found()
+            return telegram_chat(chat_id, f"Chat {chat_id}")
+
+        self.bot.get_chat.side_effect = get_chat
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                reverse("telegramchat-bulk-import"), {"chat_ids": [-1, -2, -3, -2, -4]}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 202)
+        results = {result["chat_id"]: result for result in response.data["results"]}
+        self.assertEqual(len(results), 4)
+        self.assertEqual((results[-1]["status"], results[-1]["id"]), ("exists", existing.pk))
+        for chat_id in (-2, -3, -4):
+            self.assertEqual(results[chat_id]["status"], "validating")
+        self.bot.get_chat.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(
+            set(TelegramChat.objects.exclude(pk=existing.pk).values_list("chat_id", "status", "title")),
+            {(-2, "ready", "Chat -2"), (-3, "failed", "-3"), (-4, "ready", "Chat -4")}
+        )
+        self.assertIn("chat not found", TelegramChat.objects.get(chat_id=-3).error_message)
+        self.assertEqual(sorted(call.args[0] for call in self.bot.get_chat.call_args_list), [-4, -3, -2])
+
+    def test_refresh_updates_stale_chats(self) -> None:
+        """
+        Test that the refresh task updates every copy of a stale chat and revokes lost access.
+        """
+        other = User.objects.create_user(username="user3", password="1234")
+        for user in (self.user, other):
+            TelegramChat.objects.create(user=user, chat_id=-10, title="Old", can_post=True)
+        TelegramChat.objects.create(user=self.user, chat_id=-11, title="Gone", can_post=True)
+        TelegramChat.objects.create(user=self.user, chat_id=-12, title="Fresh", refreshed_at=timezone.now())
+
+        def get_chat(chat_id: int) -> Mock:
+            if chat_id == -11:
+                raise chat_not_found()
+            return telegram_chat(chat_id, "Renamed")
+
+        self.bot.get_chat.side_effect = get_chat
+        with override_settings(TELEGRAM_CHAT_REFRESH_BATCH=1):
+            self.assertEqual(refresh_chat_metadata(), 3)
+
+        self.assertEqual(
+            set(TelegramChat.objects.values_list("chat_id", "title", "can_post")),
+            {(-10, "Renamed", True), (-11, "Gone", False), (-12, "Fresh", False)}
+        )
+        self.assertFalse(TelegramChat.objects.filter(refreshed_at__isnull=True).exists())
+
+
+class TelegramChatQueryPlanTests(TestCase):
+    """
+    Test case guarding chat lookups against sequential scans.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """
+        Seed enough chats for the planner to prefer indexes.
+        """
+        users = User.objects.bulk_create([User(username=f"seed{i}") for i in range(200)])
+        TelegramChat.objects.bulk_create([
+            TelegramChat(user=users[i % len(users)], chat_id=i, title=f"Chat {i}")
+            for i in range(20000)
+        ], batch_size=5000)
+        cls.user = users[0]
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {TelegramChat._meta.db_table}")
+
+    def test_chat_lookups_use_index(self) -> None:
+        """
+        Test that chat lookups by chat_id, with and without the owner, and title listings use indexes.
+        """
+        for queryset in (
+            TelegramChat.objects.filter(chat_id=42, user=self.user),
+            TelegramChat.objects.filter(chat_id=42),
+            TelegramChat.objects.filter(user=self.user).order_by('title')[:10],
+        ):
+            plan = queryset.explain()
+            self.assertNotIn("Seq Scan", plan, plan)
+
+
+class TelegramClientTests(TestCase):
+    """
+    Test case for the lazily created Bot API client.
+    """
+
+    def setUp(self) -> None:
+        """
+        Forget any cached bot username.
+        """
+        telegram._username = telegram._username_failed_at = None
+
+    def test_boot_creates_no_client(self) -> None:
+        """
+        Test that booting the web app and the worker neither creates the client nor calls Telegram.
+        """
+        result = subprocess.run(
+            [sys.executable, str(Path(settings.BASE_DIR) / "benchmarks" / "import_time.py"), "--top", "0"],
+            capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+    @override_settings(BOT_USERNAME="")
+    @patch("tgpostman.telegram.get_bot")
+    def test_username_fetched_once(self, mock_get_bot) -> None:
+        """
+        Test that the bot username is requested once and a failure is not retried right away.
+        :param mock_get_bot: Mock for the client factory.
+        """
+        mock_get_bot.return_value.get_me.side_effect = ConnectionError
+        self.assertIsNone(telegram.get_bot_username())
+        self.assertIsNone(telegram.get_bot_username())
+        self.assertEqual(mock_get_bot.return_value.get_me.call_count, 1)
+
+        telegram._username_failed_at = None
+        mock_get_bot.return_value.get_me.side_effect = None
+        mock_get_bot.return_value.get_me.return_value.username = "postman_bot"
+        self.assertEqual(telegram.get_bot_username(), "postman_bot")
+        self.assertEqual(telegram.get_bot_username(), "postman_bot")
+        self.assertEqual(mock_get_bot.return_value.get_me.call_count, 2)
+
+    def test_requests_share_pooled_session(self) -> None:
+        """
+        Test that Bot API calls from any thread reuse one pooled session with per-method timeouts.
+        """
+        telegram.reset_transport()
+        with ThreadPoolExecutor(4) as pool:
+            sessions = set(map(id, pool.map(lambda _: telegram.get_session(), range(8))))
+        session = telegram.get_session()
+        self.assertEqual(sessions, {id(session)})
+        adapter = session.get_adapter("https://api.telegram.org")
+        self.assertEqual(adapter._pool_maxsize, settings.TELEGRAM_HTTP_POOL_SIZE)
+
+        response = Mock(status_code=200)
+        response.json.return_value = {"ok": True, "result": {"id": -1, "type": "channel", "title": "News"}}
+        with patch.object(session, "request", return_value=response) as mock_request:
+            self.assertEqual(telegram.get_bot().get_chat(-1).title, "News")
+            self.assertEqual(
+                mock_request.call_args.kwargs["timeout"],
+                (settings.TELEGRAM_CONNECT_TIMEOUT, settings.TELEGRAM_LOOKUP_READ_TIMEOUT)
+            )
+        self.assertEqual(
+            telegram.timeouts("sendDocument", files={"document": b"x"}),
+            (settings.TELEGRAM_CONNECT_TIMEOUT, settings.TELEGRAM_UPLOAD_READ_TIMEOUT)
+        )
@@ -14,6 +14,7 @@ from .views import (
     TelegramChatListCreateView,
     TelegramChatDeleteView,
     add_chat_view,
+    chat_status_view,
     TelegramChatViewSet,
 )
 
@@ -32,6 +33,7 @@ urlpatterns = [
     path('add/', add_chat_view, name='add_chat'),
     path('manage/', TelegramChatListCreateView.as_view(), name='manage_telegram_chats'),
     path('delete/<int:pk>/', TelegramChatDeleteView.as_view(), name='delete_telegram_chat'),
+    path('status/<int:pk>/', chat_status_view, name='telegram_chat_status'),
 
     # API
     path('', include(router.urls)),
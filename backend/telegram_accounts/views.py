@@ -9,20 +9,27 @@ This file contains views for managing Telegram chats, including listing, adding,
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils.decorators import method_decorator
 from django.views import View
-from rest_framework import viewsets, permissions
+from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from tgpostman.settings import BOT_USERNAME
+from tgpostman.pagination import KeysetPagination, KeysetPaginator
+from tgpostman.search import search
+from tgpostman.telegram import get_bot_username
+from .bulk import import_chats
 from .forms import AddChatForm, TelegramChatForm
 from .models import TelegramChat
-from .serializers import TelegramChatSerializer
-from .telegram_api import get_chat_info
+from .serializers import TelegramChatImportSerializer, TelegramChatSerializer, TelegramChatStatusSerializer
+from .tasks import schedule_validation
 
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+STATUS_FIELDS = TelegramChatStatusSerializer.Meta.fields
 
 # --------------------------------------------------------------------------------
 # VIEWS
@@ -40,25 +47,16 @@ class TelegramChatListCreateView(View):
         """
         form = TelegramChatForm(user=request.user)
         q = request.GET.get('q', '')
-        chats_qs = TelegramChat.objects.filter(user=request.user)
-        if q:
-            chats_qs = chats_qs.filter(title__icontains=q)
+        chats_qs = search(TelegramChat.objects.filter(user=request.user), q, 'title', 'title')
 
         # Pagination
-        page = request.GET.get('page', 1)
-        paginator = Paginator(chats_qs.order_by('title'), 10)  # 10 per page
-        try:
-            chats = paginator.page(page)
-        except PageNotAnInteger:
-            chats = paginator.page(1)
-        except EmptyPage:
-            chats = paginator.page(paginator.num_pages)
+        chats = KeysetPaginator(chats_qs, 10).page_or_first(request.GET.get('cursor'))  # 10 per page
 
         context = {
             'form': form,
             'chats': chats,
             'q': q,
-            'bot_username': BOT_USERNAME,
+            'bot_username': get_bot_username(),
         }
         return render(request, 'telegram_accounts/manage.html', context)
 
@@ -74,10 +72,9 @@ class TelegramChatListCreateView(View):
 
         # If form invalid, re-display page 1 of results without search
         chats_qs = TelegramChat.objects.filter(user=request.user).order_by('title')
-        paginator = Paginator(chats_qs, 10)
-        chats = paginator.page(1)
+        chats = KeysetPaginator(chats_qs, 10).page()
         return render(request, 'telegram_accounts/manage.html',
-                      {'form': form, 'chats': chats, 'q': '', 'bot_username': BOT_USERNAME, })
+                      {'form': form, 'chats': chats, 'q': '', 'bot_username': get_bot_username(), })
 
 
 @method_decorator(login_required, name='dispatch')
@@ -99,35 +96,37 @@ class TelegramChatDeleteView(View):
 def add_chat_view(request):
     """
     View for adding a new Telegram chat.
+    The chat is saved right away and checked with Telegram in the background.
     """
     if request.method == "POST":
         form = AddChatForm(request.POST)
         if form.is_valid():
             chat_id = form.cleaned_data["chat_id"]
-            try:
-                chat_info = get_chat_info(chat_id)
-                chat, created = TelegramChat.objects.get_or_create(
-                    user=request.user,
-                    chat_id=chat_id,
-                    defaults={
-                        "title": chat_info["title"],
-                        "can_post": chat_info["can_post"],
-                        "chat_type": chat_info["chat_type"],
-                        "url": chat_info["url"],
-                    }
-                )
-                if created:
-                    messages.success(request, f"Чат '{chat.title}' успешно добавлен!")
-                else:
-                    messages.info(request, f"Чат уже существует: {chat.title}")
-                return redirect("dashboard")
-            except Exception as e:
-                messages.error(request, f"Ошибка: {e}")
+            chat, created = TelegramChat.objects.get_or_create(
+                user=request.user,
+                chat_id=chat_id,
+                defaults={"title": str(chat_id), "status": "validating"}
+            )
+            if created:
+                schedule_validation(chat)
+                messages.success(request, f"Чат {chat_id} добавлен и проверяется.")
+            else:
+                messages.info(request, f"Чат уже существует: {chat.title}")
+            return redirect("dashboard")
     else:
         form = AddChatForm()
     return render(request, "telegram_accounts/add_chat.html", {"form": form})
 
 
+@login_required
+def chat_status_view(request, pk):
+    """
+    Return the validation status and metadata of a chat as JSON, for polling from the chat list.
+    """
+    chat = get_object_or_404(TelegramChat.objects.only(*STATUS_FIELDS), pk=pk, user=request.user)
+    return JsonResponse(TelegramChatStatusSerializer(chat).data)
+
+
 class TelegramChatViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing Telegram chats via API.
@@ -136,31 +135,53 @@ class TelegramChatViewSet(viewsets.ModelViewSet):
     queryset = TelegramChat.objects.all()
     serializer_class = TelegramChatSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
         Return the queryset of Telegram chats for the current user.
+        Supports optional ranked search by title with the ``q`` parameter.
         """
-        return TelegramChat.objects.filter(user=self.request.user)
+        chats = TelegramChat.objects.filter(user=self.request.user)
+        return search(chats, self.request.query_params.get('q', ''), 'title', 'title')
 
     def perform_create(self, serializer):
         """
-        Override the default create method to add chat info during creation.
+        Save the chat in the 'validating' state and check it with Telegram in the background.
+        Poll the ``status`` action for the final metadata and ``can_post`` verdict.
         """
-        chat_info = get_chat_info(self.request.data["chat_id"])
-        serializer.save(
+        chat = serializer.save(
             user=self.request.user,
-            title=chat_info["title"],
-            can_post=chat_info["can_post"],
-            chat_type=chat_info["chat_type"],
-            url=chat_info["url"],
+            title=str(serializer.validated_data["chat_id"]),
+            status="validating",
         )
+        schedule_validation(chat)
+
+    @action(detail=True, methods=['get'], url_path='status')
+    def validation_status(self, request, pk=None):
+        """
+        Return the validation status and metadata of a chat.
+        """
+        chat = get_object_or_404(self.get_queryset().only(*STATUS_FIELDS), pk=pk)
+        return Response(TelegramChatStatusSerializer(chat).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_import(self, request):
+        """
+        Add many chats at once from a list of chat IDs.
+        Responds 202 with one result per chat; new chats are validated in the background,
+        poll the ``status`` action of each for its verdict.
+        """
+        serializer = TelegramChatImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = import_chats(request.user, serializer.validated_data['chat_ids'])
+        return Response({'results': results}, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=False, methods=['get'], url_path='my')
     def list_my_chats(self, request):
         """
         List chats that belong to the authenticated user.
         """
-        chats = self.get_queryset()
+        chats = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(chats, many=True)
-        return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
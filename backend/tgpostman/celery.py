@@ -9,6 +9,7 @@ This file sets up the Celery application for the project.
 
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # --------------------------------------------------------------------------------
 # CELERY APP SETUP
@@ -25,3 +26,16 @@ app.autodiscover_tasks()
 # Celery timezone settings
 app.conf.enable_utc = True
 app.conf.timezone = 'Europe/Moscow'
+
+
+# --------------------------------------------------------------------------------
+# WORKER PROCESS SETUP
+
+@worker_process_init.connect
+def init_telegram_transport(**kwargs) -> None:
+    """
+    Give every forked worker process its own Bot API connection pool.
+    """
+    from tgpostman.telegram import reset_transport
+
+    reset_transport()
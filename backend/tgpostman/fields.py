@@ -0,0 +1,158 @@
+"""
+Related fields
+Form and serializer fields validating a whole list of related object IDs with one user-scoped query.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+from django import forms
+from django.core.exceptions import ValidationError
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.utils import html
+
+# --------------------------------------------------------------------------------
+
+
+class OwnedObjectsField(serializers.Field):
+    """
+    Serializer field accepting a list of primary keys of objects owned by the requesting user.
+
+    Unlike ``PrimaryKeyRelatedField(many=True)``, which runs one query per ID,
+    the whole list is checked with a single ``IN`` query scoped to
+    ``request.user``. Every invalid ID is reported at once, and the fetched
+    objects are returned in input order, ready for ``set()``.
+
+    Args:
+        model (Model): Related model.
+        owner_field (str): Field of the model pointing to the owner.
+        **kwargs: Standard serializer field arguments.
+    """
+
+    default_error_messages = {
+        'not_a_list': 'Expected a list of items but got type "{input_type}".',
+        'incorrect_type': 'Incorrect type. Expected pk value, received {data_type}.',
+        'does_not_exist': 'Invalid pk "{pk_value}" - object does not exist.',
+    }
+
+    def __init__(self, model, owner_field: str = 'user', **kwargs):
+        self.model = model
+        self.owner_field = owner_field
+        super().__init__(**kwargs)
+
+    def get_value(self, dictionary):
+        """
+        Read the list from JSON data or from repeated form keys.
+
+        Args:
+            dictionary (dict): Incoming data.
+
+        Returns:
+            list: Raw IDs, or ``empty`` if the field was not sent.
+        """
+        if html.is_html_input(dictionary):
+            if self.field_name not in dictionary and getattr(self.root, 'partial', False):
+                return empty
+            return dictionary.getlist(self.field_name)
+        return dictionary.get(self.field_name, empty)
+
+    def to_internal_value(self, data) -> list:
+        """
+        Fetch the objects for a list of IDs.
+
+        Args:
+            data (list): Raw IDs.
+
+        Returns:
+            list[Model]: Owned objects in input order, without duplicates.
+
+        Raises:
+            ValidationError: With one message per invalid ID.
+        """
+        if isinstance(data, (str, dict)) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+
+        ids = []
+        for value in data:
+            if isinstance(value, bool):
+                self.fail('incorrect_type', data_type=type(value).__name__)
+            try:
+                ids.append(int(value))
+            except (TypeError, ValueError):
+                self.fail('incorrect_type', data_type=type(value).__name__)
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+
+        user = self.context['request'].user
+        objects = self.model.objects.filter(**{self.owner_field: user}, pk__in=ids).in_bulk()
+        missing = [pk for pk in ids if pk not in objects]
+        if missing:
+            raise serializers.ValidationError([
+                self.error_messages['does_not_exist'].format(pk_value=pk) for pk in missing
+            ])
+        return [objects[pk] for pk in ids]
+
+    def to_representation(self, value) -> list:
+        """
+        Represent related objects by their primary keys.
+
+        Args:
+            value (Manager): Related manager, prefetched when listing.
+
+        Returns:
+            list[int]: Primary keys.
+        """
+        return [obj.pk for obj in value.all()]
+
+# --------------------------------------------------------------------------------
+
+
+class OwnedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """
+    Form field validating selected IDs against an owner-scoped queryset in one query.
+
+    Reports every invalid ID at once and returns the fetched objects as a list,
+    so saving them with ``set()`` does not query again.
+    """
+
+    def _check_values(self, value) -> list:
+        """
+        Fetch the objects for a list of IDs.
+
+        Args:
+            value (list): Raw IDs.
+
+        Returns:
+            list[Model]: Selected objects.
+
+        Raises:
+            ValidationError: With one error per invalid ID.
+        """
+        key = self.to_field_name or 'pk'
+        try:
+            value = list(dict.fromkeys(value))
+        except TypeError:
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+
+        errors = []
+        for pk in value:
+            self.validate_no_null_characters(pk)
+            try:
+                self.queryset.filter(**{key: pk})
+            except (ValueError, TypeError):
+                errors.append(ValidationError(
+                    self.error_messages['invalid_pk_value'], code='invalid_pk_value', params={'pk': pk}
+                ))
+        if errors:
+            raise ValidationError(errors)
+
+        objects = {str(getattr(obj, key)): obj for obj in self.queryset.filter(**{f'{key}__in': value})}
+        errors = [
+            ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': val})
+            for val in value if str(val) not in objects
+        ]
+        if errors:
+            raise ValidationError(errors)
+        return [objects[str(val)] for val in value]
@@ -0,0 +1,309 @@
+"""
+Keyset pagination
+Cursor-based pagination on the ordering keys of a queryset for HTML views and the REST API.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import base64
+import binascii
+import datetime
+import json
+from typing import List, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# --------------------------------------------------------------------------------
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder keeping full microsecond precision of datetimes, which the
+    Django encoder truncates to milliseconds and which the seek condition needs.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def encode_cursor(values: list, backwards: bool = False) -> str:
+    """
+    Build an opaque cursor from the ordering key values of a row.
+
+    Args:
+        values (list): Ordering key values of the boundary row.
+        backwards (bool): Whether the cursor points to the previous page.
+
+    Returns:
+        str: URL-safe cursor.
+    """
+    payload = json.dumps({'v': values, 'b': backwards}, cls=CursorEncoder)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[list, bool]:
+    """
+    Read the ordering key values and direction from a cursor.
+
+    Args:
+        cursor (str): Cursor produced by encode_cursor.
+
+    Returns:
+        tuple: Key values and whether the cursor points backwards.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return list(payload['v']), bool(payload['b'])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _flip(field: str) -> str:
+    """
+    Reverse the direction of an ordering key.
+
+    Args:
+        field (str): Ordering key, descending if prefixed with '-'.
+
+    Returns:
+        str: Key with the opposite direction.
+    """
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _after(ordering: List[str], values: list) -> Q:
+    """
+    Build the condition selecting rows that come after the given key values.
+
+    Args:
+        ordering (list[str]): Ordering keys.
+        values (list): Key values of the boundary row.
+
+    Returns:
+        Q: Lexicographic comparison over all keys.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        step = Q(**{f'{field.lstrip("-")}__{lookup}': values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            step &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= step
+    return condition
+
+# --------------------------------------------------------------------------------
+
+
+class KeysetPage:
+    """
+    One page of keyset-paginated rows.
+
+    Args:
+        object_list (list): Rows of the page.
+        next_cursor (str): Cursor of the following page, None on the last page.
+        previous_cursor (str): Cursor of the preceding page, None on the first page.
+    """
+
+    def __init__(self, object_list: list, next_cursor: Optional[str], previous_cursor: Optional[str]):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+# --------------------------------------------------------------------------------
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the ordering keys of the last seen row.
+
+    Unlike OFFSET pagination, no COUNT(*) is run and every page costs the same
+    as the first. The queryset ordering is used, with the primary key appended
+    as a tie-breaker so the order is total.
+
+    Args:
+        queryset (QuerySet): Queryset ordered by field names.
+        per_page (int): Number of rows per page.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-pk' if ordering and ordering[0].startswith('-') else 'pk')
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+
+    def _key(self, obj) -> list:
+        """
+        Read the ordering key values of a row.
+
+        Args:
+            obj (Model): Row of the queryset.
+
+        Returns:
+            list: Key values in ordering order.
+        """
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the page a cursor points to.
+
+        Args:
+            cursor (str): Cursor from a previous page, None for the first page.
+
+        Returns:
+            KeysetPage: Requested page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        values, backwards = decode_cursor(cursor) if cursor else (None, False)
+        if values is not None and len(values) != len(self.ordering):
+            raise ValueError('Invalid cursor')
+        ordering = [_flip(field) for field in self.ordering] if backwards else self.ordering
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(_after(ordering, values))
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        has_next = has_more if not backwards else values is not None
+        has_previous = has_more if backwards else values is not None
+        return KeysetPage(
+            rows,
+            encode_cursor(self._key(rows[-1])) if rows and has_next else None,
+            encode_cursor(self._key(rows[0]), backwards=True) if rows and has_previous else None
+        )
+
+    def page_or_first(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the page a cursor points to, or the first page for a malformed cursor.
+
+        Args:
+            cursor (str): Cursor from a previous page.
+
+        Returns:
+            KeysetPage: Requested or first page.
+        """
+        try:
+            return self.page(cursor)
+        except (ValueError, TypeError):
+            return self.page()
+
+# --------------------------------------------------------------------------------
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF pagination returning ``next``/``previous`` cursor links and ``results``.
+    """
+
+    page_size = 50
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        """
+        Return the rows of the page requested by the cursor query parameter.
+
+        Args:
+            queryset (QuerySet): Ordered queryset to paginate.
+            request (Request): Incoming request.
+            view (APIView): View being paginated.
+
+        Returns:
+            list: Rows of the page.
+        """
+        self.request = request
+        try:
+            self.page = KeysetPaginator(queryset, self.page_size).page(
+                request.query_params.get(self.cursor_query_param)
+            )
+        except (ValueError, TypeError):
+            raise NotFound('Invalid cursor')
+        return list(self.page)
+
+    def _link(self, cursor: Optional[str]) -> Optional[str]:
+        """
+        Build the URL of a page.
+
+        Args:
+            cursor (str): Cursor of the page.
+
+        Returns:
+            str: Absolute URL, or None without a cursor.
+        """
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data: list) -> Response:
+        """
+        Wrap serialized rows with links to the neighbouring pages.
+
+        Args:
+            data (list): Serialized rows.
+
+        Returns:
+            Response: Paginated response.
+        """
+        return Response({
+            'next': self._link(self.page.next_cursor),
+            'previous': self._link(self.page.previous_cursor),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """
+        Describe the paginated response for schema generators.
+
+        Args:
+            schema (dict): Schema of one row list.
+
+        Returns:
+            dict: Schema of the paginated response.
+        """
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,96 @@
+"""
+Search
+Ranked PostgreSQL full-text and trigram search shared by posts, chats and group members.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, SearchVectorField, TrigramSimilarity
+)
+from django.db import models
+from django.db.models import DecimalField, F, Q, QuerySet
+from django.db.models.functions import Cast, Upper
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+SEARCH_CONFIG = 'simple'  # texts are multilingual, so no language-specific stemming
+RANK_DIGITS = 6  # decimal places the relevance rank is rounded to
+
+# --------------------------------------------------------------------------------
+# MODEL HELPERS
+
+
+def search_vector_field(text_field: str) -> models.GeneratedField:
+    """
+    Build a stored tsvector column kept up to date by PostgreSQL on every write.
+
+    Args:
+        text_field (str): Name of the text field to index.
+
+    Returns:
+        GeneratedField: Generated search vector field.
+    """
+    return models.GeneratedField(
+        expression=SearchVector(text_field, config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
+
+
+def search_indexes(prefix: str, text_field: str) -> list:
+    """
+    Build GIN indexes for the search vector and for substring matching of a text field.
+
+    The trigram index is built over UPPER(text) so Django's ``icontains``
+    lookups can use it.
+
+    Args:
+        prefix (str): Index name prefix.
+        text_field (str): Name of the text field.
+
+    Returns:
+        list[GinIndex]: Indexes to add to the model Meta.
+    """
+    return [
+        GinIndex(fields=['search_vector'], name=f'{prefix}_search_idx'),
+        GinIndex(OpClass(Upper(text_field), name='gin_trgm_ops'), name=f'{prefix}_trgm_idx'),
+    ]
+
+# --------------------------------------------------------------------------------
+# QUERY HELPERS
+
+
+def search(queryset: QuerySet, q: str, text_field: str, *ordering: str) -> QuerySet:
+    """
+    Filter a queryset by a search phrase and order it by relevance.
+
+    Rows match on full-text words or on a substring of the text, and are
+    ranked by full-text rank plus trigram similarity.
+
+    Args:
+        queryset (QuerySet): Queryset of a model with a ``search_vector`` field.
+        q (str): Search phrase, ignored if blank.
+        text_field (str): Name of the searched text field.
+        *ordering (str): Ordering applied without a phrase and between equally ranked rows.
+
+    Returns:
+        QuerySet: Matching rows, best matches first.
+    """
+    q = (q or '').strip()
+    if not q:
+        return queryset.order_by(*ordering) if ordering else queryset
+    query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+    return queryset.filter(
+        Q(search_vector=query) | Q(**{f'{text_field}__icontains': q})
+    ).annotate(
+        # Rounded to an exact numeric: a float rank does not survive the round trip
+        # through a pagination cursor, so seeking past equally ranked rows would stall.
+        rank=Cast(
+            SearchRank(F('search_vector'), query) + TrigramSimilarity(text_field, q),
+            DecimalField(max_digits=RANK_DIGITS + 2, decimal_places=RANK_DIGITS)
+        )
+    ).order_by('-rank', *ordering)
@@ -10,7 +10,6 @@ import os
 from pathlib import Path
 
 from decouple import config
-from telebot import TeleBot
 
 # --------------------------------------------------------------------------------
 # BASE DIRECTORY
@@ -41,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_celery_results',
     'django_celery_beat',
@@ -166,6 +166,13 @@ REST_FRAMEWORK = {
     ],
 }
 
+# --------------------------------------------------------------------------------
+# API KEY CACHE
+
+API_KEY_CACHE_SIZE = config('API_KEY_CACHE_SIZE', default=10_000, cast=int)  # users per process
+API_KEY_CACHE_TTL = config('API_KEY_CACHE_TTL', default=60, cast=int)  # seconds
+API_KEY_SHARED_CACHE = config('API_KEY_SHARED_CACHE', default='')  # CACHES alias shared by workers, empty disables
+
 # --------------------------------------------------------------------------------
 # LANGUAGE CHOICES
 
@@ -198,13 +205,101 @@ LANG_CHOICES = [
 ]
 
 # --------------------------------------------------------------------------------
-# TELEGRAM BOT INSTANCE
+# POST SENDER
+
+POST_SENDER_CONCURRENCY = config('POST_SENDER_CONCURRENCY', default=8, cast=int)
+POST_SENDER_ENGINE = config(
+    'POST_SENDER_ENGINE', default='scheduled_posts.post_sender'
+)  # threads; 'scheduled_posts.async_sender' for asyncio (needs aiohttp)
+POST_ASYNC_CONCURRENCY = config('POST_ASYNC_CONCURRENCY', default=200, cast=int)  # in-flight sends, asyncio engine
+POST_FANOUT_CHUNK_THRESHOLD = config('POST_FANOUT_CHUNK_THRESHOLD', default=500, cast=int)  # recipients
+POST_FANOUT_CHUNK_SIZE = config('POST_FANOUT_CHUNK_SIZE', default=200, cast=int)  # recipients per subtask
+POST_LEDGER_BATCH_SIZE = config('POST_LEDGER_BATCH_SIZE', default=50, cast=int)  # deliveries per ledger write
+POST_PREPARE_LEAD_MINUTES = config('POST_PREPARE_LEAD_MINUTES', default=5, cast=int)  # re-render before schedule_time
+POST_BULK_MAX_ITEMS = config('POST_BULK_MAX_ITEMS', default=10_000, cast=int)  # posts per bulk request
+
+# --------------------------------------------------------------------------------
+# POST DISPATCHER
+
+POST_DISPATCH_INTERVAL = config('POST_DISPATCH_INTERVAL', default=15, cast=int)  # seconds between polls
+POST_DISPATCH_LOOKAHEAD = config('POST_DISPATCH_LOOKAHEAD', default=120, cast=int)  # seconds enqueued ahead
+POST_DISPATCH_BATCH_SIZE = config('POST_DISPATCH_BATCH_SIZE', default=500, cast=int)  # posts per transaction
+POST_PREPARE_INTERVAL = config('POST_PREPARE_INTERVAL', default=60, cast=int)  # seconds between polls
+
+CELERY_BEAT_SCHEDULE = {
+    'dispatch-due-posts': {
+        'task': 'scheduled_posts.tasks.dispatch_due_posts',
+        'schedule': POST_DISPATCH_INTERVAL,
+    },
+    'prepare-upcoming-posts': {
+        'task': 'scheduled_posts.tasks.prepare_upcoming_posts',
+        'schedule': POST_PREPARE_INTERVAL,
+    },
+}
+
+# --------------------------------------------------------------------------------
+# TELEGRAM RATE LIMITS
+
+TELEGRAM_RATE_LIMIT_STORE = config(
+    'TELEGRAM_RATE_LIMIT_STORE',
+    default='scheduled_posts.rate_limiter.DatabaseBucketStore'
+)
+TELEGRAM_GLOBAL_RATE = config('TELEGRAM_GLOBAL_RATE', default=30, cast=float)  # messages per second
+TELEGRAM_CHAT_RATE = config('TELEGRAM_CHAT_RATE', default=1, cast=float)  # messages per second
+TELEGRAM_GROUP_RATE = config('TELEGRAM_GROUP_RATE', default=20, cast=float)  # messages per minute
+TELEGRAM_RATE_LIMIT_IDLE = config(
+    'TELEGRAM_RATE_LIMIT_IDLE', default=3600, cast=int
+)  # seconds until an idle bucket is deleted, longer than any bucket takes to refill
+
+# --------------------------------------------------------------------------------
+# TELEGRAM RETRIES
+
+TELEGRAM_SEND_MAX_ATTEMPTS = config('TELEGRAM_SEND_MAX_ATTEMPTS', default=4, cast=int)  # per Bot API call
+TELEGRAM_DELIVERY_MAX_ATTEMPTS = config('TELEGRAM_DELIVERY_MAX_ATTEMPTS', default=5, cast=int)  # per recipient
+TELEGRAM_RETRY_BACKOFF_BASE = config('TELEGRAM_RETRY_BACKOFF_BASE', default=1, cast=float)  # seconds
+TELEGRAM_RETRY_BACKOFF_MAX = config('TELEGRAM_RETRY_BACKOFF_MAX', default=30, cast=float)  # seconds
+TELEGRAM_RETRY_INLINE_MAX = config('TELEGRAM_RETRY_INLINE_MAX', default=10, cast=float)  # longer waits are deferred
+
+# --------------------------------------------------------------------------------
+# TRANSLATION CACHE
+
+TRANSLATION_CACHE_LRU_SIZE = config('TRANSLATION_CACHE_LRU_SIZE', default=2048, cast=int)
+TRANSLATION_CACHE_TTL = config('TRANSLATION_CACHE_TTL', default=30 * 24 * 60 * 60, cast=int)  # seconds
+TRANSLATION_CACHE_MAX_ENTRIES = config('TRANSLATION_CACHE_MAX_ENTRIES', default=100_000, cast=int)
+
+# --------------------------------------------------------------------------------
+# TELEGRAM BOT
 
 BOT_TOKEN = config("TELEGRAM_BOT_TOKEN")
-bot = TeleBot(token=BOT_TOKEN)
+BOT_USERNAME = config("TELEGRAM_BOT_USERNAME", default='')  # empty: fetched with getMe on first use
+
+# --------------------------------------------------------------------------------
+# TELEGRAM HTTP TRANSPORT
 
-BOT_USERNAME = None
-try:
-    BOT_USERNAME = bot.get_me().username
-except Exception:
-    pass
+TELEGRAM_HTTP_POOL_SIZE = config(
+    'TELEGRAM_HTTP_POOL_SIZE', default=POST_SENDER_CONCURRENCY * 2, cast=int
+)  # keep-alive connections per process
+TELEGRAM_CONNECT_TIMEOUT = config('TELEGRAM_CONNECT_TIMEOUT', default=5, cast=float)  # seconds
+TELEGRAM_READ_TIMEOUT = config('TELEGRAM_READ_TIMEOUT', default=30, cast=float)  # seconds, send methods
+TELEGRAM_LOOKUP_READ_TIMEOUT = config('TELEGRAM_LOOKUP_READ_TIMEOUT', default=10, cast=float)  # seconds, getChat etc.
+TELEGRAM_UPLOAD_READ_TIMEOUT = config('TELEGRAM_UPLOAD_READ_TIMEOUT', default=120, cast=float)  # seconds, file uploads
+
+# --------------------------------------------------------------------------------
+# TELEGRAM CHAT INFO
+
+TELEGRAM_CHAT_INFO_TTL = config('TELEGRAM_CHAT_INFO_TTL', default=600, cast=int)  # seconds a lookup is reused
+TELEGRAM_CHAT_INFO_NEGATIVE_TTL = config(
+    'TELEGRAM_CHAT_INFO_NEGATIVE_TTL', default=60, cast=int
+)  # seconds an unknown chat is remembered
+TELEGRAM_CHAT_INFO_CACHE_SIZE = config('TELEGRAM_CHAT_INFO_CACHE_SIZE', default=10_000, cast=int)  # chats per process
+TELEGRAM_LOOKUP_RATE = config('TELEGRAM_LOOKUP_RATE', default=20, cast=float)  # getChat calls per second
+TELEGRAM_LOOKUP_CONCURRENCY = config('TELEGRAM_LOOKUP_CONCURRENCY', default=8, cast=int)  # parallel lookups
+TELEGRAM_CHAT_IMPORT_MAX = config('TELEGRAM_CHAT_IMPORT_MAX', default=500, cast=int)  # chat IDs per bulk import
+TELEGRAM_CHAT_REFRESH_INTERVAL = config('TELEGRAM_CHAT_REFRESH_INTERVAL', default=3600, cast=int)  # seconds between runs
+TELEGRAM_CHAT_REFRESH_AGE = config('TELEGRAM_CHAT_REFRESH_AGE', default=86400, cast=int)  # seconds until stale
+TELEGRAM_CHAT_REFRESH_BATCH = config('TELEGRAM_CHAT_REFRESH_BATCH', default=200, cast=int)  # chats per batch
+
+CELERY_BEAT_SCHEDULE['refresh-chat-metadata'] = {
+    'task': 'telegram_accounts.tasks.refresh_chat_metadata',
+    'schedule': TELEGRAM_CHAT_REFRESH_INTERVAL,
+}
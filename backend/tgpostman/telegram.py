@@ -0,0 +1,215 @@
+"""
+Telegram client
+Lazily created, process-wide Bot API clients and pooled HTTP transport shared by the web app and Celery workers.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import threading
+import time
+from typing import Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from requests.adapters import HTTPAdapter
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+USERNAME_RETRY_INTERVAL = 60  # seconds between getMe attempts after a failure
+LOOKUP_METHODS = {'getMe', 'getChat', 'getChatMember', 'getChatMemberCount', 'getFile'}
+LONG_POLL_METHODS = {'getUpdates'}
+
+# --------------------------------------------------------------------------------
+# CLIENT STATE
+
+_lock = threading.Lock()
+_bot = None
+_async_bot = None
+_session: Optional[requests.Session] = None
+_username: Optional[str] = None
+_username_failed_at: Optional[float] = None
+
+# --------------------------------------------------------------------------------
+# TRANSPORT
+
+
+def _build_session() -> requests.Session:
+    """
+    Create a keep-alive session with a connection pool sized for the sender concurrency.
+
+    Returns:
+        Session: Session whose HTTPS adapter holds up to TELEGRAM_HTTP_POOL_SIZE connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.TELEGRAM_HTTP_POOL_SIZE, pool_block=True)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide Bot API session, creating it on first use.
+
+    Returns:
+        Session: Shared session.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def reset_transport() -> None:
+    """
+    Drop the pooled connections, so a forked worker process opens its own.
+    """
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def timeouts(method_name: str, files=None, requested: Tuple[float, float] = None) -> Tuple[float, float]:
+    """
+    Pick connect and read timeouts for a Bot API method.
+
+    Args:
+        method_name (str): Bot API method, e.g. ``sendMessage``.
+        files (dict): Files uploaded with the request.
+        requested (tuple): Timeouts computed by pyTelegramBotAPI, kept for long polling.
+
+    Returns:
+        tuple: Connect and read timeouts in seconds.
+    """
+    if method_name in LONG_POLL_METHODS and requested:
+        return requested
+    if files:
+        read = settings.TELEGRAM_UPLOAD_READ_TIMEOUT
+    elif method_name in LOOKUP_METHODS:
+        read = settings.TELEGRAM_LOOKUP_READ_TIMEOUT
+    else:
+        read = settings.TELEGRAM_READ_TIMEOUT
+    return settings.TELEGRAM_CONNECT_TIMEOUT, read
+
+
+def send_request(method: str, url: str, params=None, files=None, timeout=None, proxies=None) -> requests.Response:
+    """
+    Send a Bot API request through the shared session.
+
+    Installed as pyTelegramBotAPI's ``CUSTOM_REQUEST_SENDER``, replacing its
+    per-thread sessions that are dropped every ten minutes and with every new
+    sender thread.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Bot API URL, ending with the API method name.
+        params (dict): Query or form parameters.
+        files (dict): Files to upload.
+        timeout (tuple): Timeouts computed by pyTelegramBotAPI.
+        proxies (dict): Proxies configured in pyTelegramBotAPI.
+
+    Returns:
+        Response: Raw HTTP response, checked by pyTelegramBotAPI.
+    """
+    method_name = url.rsplit('/', 1)[-1]
+    return get_session().request(
+        method, url, params=params, files=files,
+        timeout=timeouts(method_name, files, timeout), proxies=proxies
+    )
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def get_bot():
+    """
+    Return the process-wide Bot API client, creating it on first use.
+
+    Nothing is sent to Telegram when the client is created, so importing
+    modules that use it costs no network round trip. All of the client's
+    requests go through the pooled transport.
+
+    Returns:
+        TeleBot: Shared client.
+    """
+    global _bot
+    if _bot is None:
+        with _lock:
+            if _bot is None:
+                from telebot import TeleBot, apihelper
+
+                apihelper.CUSTOM_REQUEST_SENDER = send_request
+                _bot = TeleBot(token=settings.BOT_TOKEN)
+    return _bot
+
+
+def get_async_bot():
+    """
+    Return the process-wide asyncio Bot API client, creating it on first use.
+
+    Used by the asyncio delivery engine. Its aiohttp connection pool holds up
+    to POST_ASYNC_CONCURRENCY connections and is opened again by every event
+    loop that sends through it.
+
+    Returns:
+        AsyncTeleBot: Shared client.
+    """
+    global _async_bot
+    if _async_bot is None:
+        with _lock:
+            if _async_bot is None:
+                from telebot import asyncio_helper
+                from telebot.async_telebot import AsyncTeleBot
+
+                asyncio_helper.REQUEST_LIMIT = settings.POST_ASYNC_CONCURRENCY
+                _async_bot = AsyncTeleBot(token=settings.BOT_TOKEN)
+    return _async_bot
+
+
+async def close_async_session() -> None:
+    """
+    Close the aiohttp session of the asyncio client before its event loop stops.
+    """
+    if _async_bot is None:
+        return
+    from telebot import asyncio_helper
+
+    session = asyncio_helper.session_manager.session
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_bot_username() -> Optional[str]:
+    """
+    Return the bot username, asking Telegram once and caching the answer.
+
+    TELEGRAM_BOT_USERNAME skips the request entirely. After a failed request
+    None is returned without retrying for USERNAME_RETRY_INTERVAL seconds, so
+    pages do not block on an unreachable Bot API.
+
+    Returns:
+        str: Bot username, or None if it could not be fetched.
+    """
+    global _username, _username_failed_at
+    if settings.BOT_USERNAME:
+        return settings.BOT_USERNAME
+    if _username is not None:
+        return _username
+    if _username_failed_at is not None and time.monotonic() - _username_failed_at < USERNAME_RETRY_INTERVAL:
+        return None
+    try:
+        _username = get_bot().get_me().username
+    except Exception:
+        _username_failed_at = time.monotonic()
+    return _username
+
+
+bot = SimpleLazyObject(get_bot)
+async_bot = SimpleLazyObject(get_async_bot)
@@ -18,4 +18,4 @@ class UserAdmin(admin.ModelAdmin):
     """
     Admin configuration for the User model.
     """
-    list_display = ('username', 'api_key', 'is_staff', 'is_active')
+    list_display = ('username', 'is_staff', 'is_active')
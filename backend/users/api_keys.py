@@ -0,0 +1,134 @@
+"""
+API key store
+
+This file resolves hashed API keys to users through an in-process TTL cache and an optional shared cache.
+Only the primary key and active flag of a user are cached, never the password hash or other fields.
+"""
+
+# --------------------------------------------------------------------------------
+# IMPORTS
+
+import hashlib
+import secrets
+import threading
+from typing import Optional, Tuple
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+# --------------------------------------------------------------------------------
+# CONSTANTS
+
+SHARED_KEY_PREFIX = 'api-key:'
+
+# --------------------------------------------------------------------------------
+# CACHE STATE
+
+_lock = threading.Lock()
+_local = TTLCache(maxsize=settings.API_KEY_CACHE_SIZE, ttl=settings.API_KEY_CACHE_TTL)
+
+# --------------------------------------------------------------------------------
+# HELPER FUNCTIONS
+
+
+def hash_key(api_key: str) -> str:
+    """
+    Hash an API key for storage and lookups.
+
+    Keys are 256-bit random tokens, so a plain SHA-256 is enough and keeps
+    lookups a single indexed equality match.
+
+    :param api_key: Plaintext API key
+    :return: Hex digest of the key
+    """
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+def generate_key() -> Tuple[str, str]:
+    """
+    Generate a new API key.
+
+    :return: Tuple of the plaintext key and its hash
+    """
+    api_key = secrets.token_hex(32)
+    return api_key, hash_key(api_key)
+
+
+def _shared_cache():
+    """
+    Return the shared cache tier, if one is configured.
+
+    :return: Django cache named by API_KEY_SHARED_CACHE, or None
+    """
+    alias = settings.API_KEY_SHARED_CACHE
+    return caches[alias] if alias else None
+
+# --------------------------------------------------------------------------------
+# PUBLIC API
+
+
+def resolve(api_key: str):
+    """
+    Find the active user owning an API key.
+
+    Looks in the in-process cache, then the shared cache, then the database,
+    filling the faster tiers on the way back. The caches hold ``(pk, is_active)``
+    pairs; the returned user loads any other field from the database on first access.
+
+    :param api_key: Plaintext API key from the request
+    :return: A user with only its primary key and active flag loaded, or None for unknown keys and inactive users
+    """
+    key_hash = hash_key(api_key)
+    with _lock:
+        entry = _local.get(key_hash)
+
+    if entry is None:
+        shared = _shared_cache()
+        entry = shared.get(SHARED_KEY_PREFIX + key_hash) if shared is not None else None
+        if entry is None:
+            entry = get_user_model().objects.filter(
+                api_key_hash=key_hash, is_active=True
+            ).values_list('pk', 'is_active').first()
+            if entry is None:
+                return None
+            if shared is not None:
+                shared.set(SHARED_KEY_PREFIX + key_hash, entry, settings.API_KEY_CACHE_TTL)
+        with _lock:
+            _local[key_hash] = entry
+
+    pk, is_active = entry
+    if not is_active:
+        return None
+    user_model = get_user_model()
+    return user_model.from_db(user_model.objects.db, ['id', 'is_active'], [pk, is_active])
+
+
+def invalidate(*key_hashes: Optional[str]) -> None:
+    """
+    Drop cached entries for the given key hashes.
+
+    Called whenever a user is saved or deleted so rotated keys and deactivated
+    users stop authenticating. Other processes drop their in-process copies
+    after API_KEY_CACHE_TTL at most.
+
+    :param key_hashes: Hashes to forget, empty values are ignored
+    """
+    key_hashes = [h for h in key_hashes if h]
+    if not key_hashes:
+        return
+    with _lock:
+        for key_hash in key_hashes:
+            _local.pop(key_hash, None)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete_many([SHARED_KEY_PREFIX + h for h in key_hashes])
+
+
+def clear() -> None:
+    """
+    Empty the in-process cache.
+    """
+    with _lock:
+        _local.clear()
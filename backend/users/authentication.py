@@ -10,7 +10,7 @@ This file contains the custom authentication class for API key authentication in
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
-from .models import User
+from . import api_keys
 
 
 # --------------------------------------------------------------------------------
@@ -24,17 +24,18 @@ class ApiKeyAuthentication(BaseAuthentication):
     def authenticate(self, request):
         """
         Authenticate the user based on the provided API key.
+        The key is resolved through the API key caches, so most requests skip the database.
 
         :param request: The HTTP request object containing the API key in the headers.
-        :return: A tuple of user and None if the API key is valid, or raises AuthenticationFailed.
+        :return: A tuple of user and the API key if the key is valid, or raises AuthenticationFailed.
         """
         api_key = request.headers.get("X-API-KEY")
         if not api_key:
             return None
 
-        try:
-            user = User.objects.get(api_key=api_key)
-        except User.DoesNotExist:
+        user = api_keys.resolve(api_key)
+        if user is None:
             raise AuthenticationFailed("Invalid API Key")
 
-        return (user, None)
+        user.api_key = api_key
+        return (user, api_key)
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.8 on 2026-10-18 12:00
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_api_keys(apps, schema_editor):
+    """
+    Store the SHA-256 of every existing key, so issued keys keep working.
+    """
+    User = apps.get_model('users', 'User')
+    users = list(User.objects.exclude(api_key__isnull=True).exclude(api_key=''))
+    for user in users:
+        user.api_key_hash = hashlib.sha256(user.api_key.encode('utf-8')).hexdigest()
+    User.objects.bulk_update(users, ['api_key_hash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='api_key_hash',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(hash_api_keys, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='api_key',
+        ),
+    ]
@@ -7,11 +7,11 @@ This file defines the custom User model, extending the default AbstractUser mode
 # --------------------------------------------------------------------------------
 # IMPORTS
 
-import secrets
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from . import api_keys
+
 
 # --------------------------------------------------------------------------------
 # USER MODEL
@@ -19,19 +19,58 @@ from django.db import models
 class User(AbstractUser):
     """
     Custom user model that extends the default Django AbstractUser with an API key.
+
+    Only a hash of the key is stored. The plaintext key is available as ``api_key``
+    on the instance that generated it and is never read back from the database.
     """
-    api_key = models.CharField(max_length=64, unique=True, blank=True, null=True)
+    api_key_hash = models.CharField(max_length=64, unique=True, blank=True, null=True)
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Remember the stored key hash so a rotated key can be dropped from the caches.
+        """
+        super().__init__(*args, **kwargs)
+        self.api_key = None
+        # Read from __dict__: users resolved from an API key have the hash deferred.
+        self._stored_api_key_hash = self.__dict__.get('api_key_hash')
+
+    def rotate_api_key(self) -> str:
+        """
+        Replace the API key with a new one and save it.
+
+        :return: The new plaintext API key
+        """
+        if self._stored_api_key_hash is None:
+            self._stored_api_key_hash = self.api_key_hash  # loads a deferred hash, so the old key is invalidated
+        self.api_key, self.api_key_hash = api_keys.generate_key()
+        self.save(update_fields=['api_key_hash'])
+        return self.api_key
 
     def save(self, *args, **kwargs) -> None:
         """
         Override the save method to generate a new API key if it does not exist.
+        Cached lookups of the old and new key are invalidated after saving.
 
         :param args: Positional arguments passed to the parent save method
         :param kwargs: Keyword arguments passed to the parent save method
         """
-        if not self.api_key:
-            self.api_key = secrets.token_hex(32)
+        if not self.api_key_hash:
+            self.api_key, self.api_key_hash = api_keys.generate_key()
         super().save(*args, **kwargs)
+        api_keys.invalidate(self._stored_api_key_hash, self.api_key_hash)
+        self._stored_api_key_hash = self.api_key_hash
+
+    def delete(self, *args, **kwargs):
+        """
+        Override the delete method to drop cached lookups of the user's key.
+
+        :param args: Positional arguments passed to the parent delete method
+        :param kwargs: Keyword arguments passed to the parent delete method
+        """
+        key_hash = self.api_key_hash
+        result = super().delete(*args, **kwargs)
+        api_keys.invalidate(key_hash)
+        return result
 
     def __str__(self) -> str:
         """
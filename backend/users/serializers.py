@@ -22,12 +22,14 @@ UserModel = get_user_model()
 class UserRegisterSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration, including password validation.
+    The new API key is returned once, in the registration response.
     """
     password = serializers.CharField(write_only=True, validators=[validate_password])
+    api_key = serializers.CharField(read_only=True)
 
     class Meta:
         model = UserModel
-        fields = ("username", "password")
+        fields = ("username", "password", "api_key")
 
     def create(self, validated_data: dict) -> UserModel:
         """
@@ -49,6 +51,8 @@ class ApiKeySerializer(serializers.ModelSerializer):
     """
     Serializer for returning the user's username and API key.
     """
+    api_key = serializers.CharField(read_only=True)
+
     class Meta:
         model = UserModel
         fields = ("username", "api_key")
@@ -7,9 +7,12 @@ This file contains tests for the user registration and API key generation, as we
 # --------------------------------------------------------------------------------
 # IMPORTS
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
+from users import api_keys
 from users.models import User
 
 # --------------------------------------------------------------------------------
@@ -32,13 +35,103 @@ class UserTests(APITestCase):
         }
         response = self.client.post(url, data)
         self.assertEqual(response.status_code, 201)
+        api_key = response.data["api_key"]
 
-        # Retrieve the created user and verify the API key
+        # Retrieve the created user and verify only the key hash is stored
         user = User.objects.get(username="testuser")
-        self.assertIsNotNone(user.api_key)
+        self.assertEqual(user.api_key_hash, api_keys.hash_key(api_key))
+        self.assertIsNone(user.api_key)
 
         # Verify /me/ endpoint
-        self.client.credentials(HTTP_X_API_KEY=user.api_key)
+        self.client.credentials(HTTP_X_API_KEY=api_key)
         response = self.client.get(reverse("api_key"))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["username"], "testuser")
+        self.assertEqual(response.data["api_key"], api_key)
+
+    def test_login_keeps_key_and_rotation_replaces_it(self) -> None:
+        """
+        Test that logging in leaves the API key alone and the rotation endpoint replaces it.
+        """
+        user = User.objects.create_user(username="testuser", password="TestPass1234")
+        api_key = user.api_key
+        credentials = {"username": "testuser", "password": "TestPass1234"}
+
+        response = self.client.post(reverse("api_login"), credentials)
+        self.assertEqual(response.data, {"username": "testuser"})
+        user.refresh_from_db()
+        self.assertEqual(user.api_key_hash, api_keys.hash_key(api_key))
+
+        self.client.credentials(HTTP_X_API_KEY=api_key)
+        self.assertEqual(self.client.get(reverse("api_key")).status_code, 200)
+        new_key = self.client.post(reverse("api_key_rotate")).data["api_key"]
+        self.assertEqual(self.client.get(reverse("api_key")).status_code, 403)
+
+        self.client.credentials()
+        response = self.client.post(reverse("api_key_rotate"), credentials)
+        self.client.credentials(HTTP_X_API_KEY=new_key)
+        self.assertEqual(self.client.get(reverse("api_key")).status_code, 403)
+        self.client.credentials(HTTP_X_API_KEY=response.data["api_key"])
+        self.assertEqual(self.client.get(reverse("api_key")).status_code, 200)
+
+
+class ApiKeyCacheTests(APITestCase):
+    """
+    Test case for cached API key lookups and their invalidation.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a user with a fresh API key and an empty cache.
+        """
+        api_keys.clear()
+        self.user = User.objects.create_user(username="user1", password="1234")
+        self.api_key = self.user.api_key
+        self.url = reverse("api_key")
+
+    def get(self, api_key: str):
+        """
+        Request the API key endpoint with a key and count the key lookups it ran.
+
+        :param api_key: API key to send
+        :return: Tuple of the response and the number of queries looking up a key hash
+        """
+        self.client.credentials(HTTP_X_API_KEY=api_key)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        lookups = sum('"api_key_hash" =' in q["sql"] for q in ctx.captured_queries)
+        return response, lookups
+
+    def test_cached_lookup(self) -> None:
+        """
+        Test that only the first request with a key reads the user from the database.
+        """
+        response, lookups = self.get(self.api_key)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lookups, 1)
+
+        response, lookups = self.get(self.api_key)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lookups, 0)
+        self.assertEqual(response.data["username"], "user1")
+
+    def test_cache_holds_no_user_fields(self) -> None:
+        """
+        Test that the cache keeps only the primary key and active flag, never the password hash.
+        """
+        self.get(self.api_key)
+
+        self.assertEqual(list(api_keys._local.values()), [(self.user.pk, True)])
+
+    def test_rotation_and_deactivation(self) -> None:
+        """
+        Test that a rotated key and a deactivated user stop authenticating at once.
+        """
+        self.assertEqual(self.get(self.api_key)[0].status_code, 200)
+        new_key = self.user.rotate_api_key()
+        self.assertEqual(self.get(self.api_key)[0].status_code, 403)
+        self.assertEqual(self.get(new_key)[0].status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get(new_key)[0].status_code, 403)
@@ -1,14 +1,14 @@
 """
 User API URLs
 
-This file defines the URL patterns for user-related API endpoints, including registration, login, and API key retrieval.
+This file defines the URL patterns for user-related API endpoints, including registration, login, and API key retrieval and rotation.
 """
 
 # --------------------------------------------------------------------------------
 # IMPORTS
 
 from django.urls import path
-from .views import RegisterView, ApiKeyView, LoginAPIView
+from .views import RegisterView, ApiKeyView, ApiKeyRotateView, LoginAPIView
 
 # --------------------------------------------------------------------------------
 # URL PATTERNS
@@ -16,5 +16,6 @@ from .views import RegisterView, ApiKeyView, LoginAPIView
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='api_register'),
     path('me/', ApiKeyView.as_view(), name='api_key'),
+    path('me/rotate/', ApiKeyRotateView.as_view(), name='api_key_rotate'),
     path('login_api/', LoginAPIView.as_view(), name='api_login'),
 ]
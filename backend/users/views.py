@@ -35,28 +35,53 @@ class RegisterView(generics.CreateAPIView):
 class LoginAPIView(APIView):
     """
     View for logging in a user using username and password.
-    Returns an API key if credentials are valid.
+    Checks the credentials without changing the API key.
     """
     permission_classes = [AllowAny]
 
     def post(self, request):
         """
-        Handle user login and return the API key if credentials are valid.
+        Handle user login and return the username if credentials are valid.
+        Only a hash of the API key is stored, so the key itself is returned only
+        at registration and by the rotation endpoint.
 
         :param request: The request object containing 'username' and 'password'
-        :return: API key for authenticated user or error message
+        :return: Username of the authenticated user or error message
         """
         username = request.data.get('username')
         password = request.data.get('password')
         user = authenticate(username=username, password=password)
         if user:
-            return Response({'api_key': user.api_key})
+            return Response({'username': user.username})
         return Response({'error': 'Invalid credentials'}, status=400)
 
 
+class ApiKeyRotateView(APIView):
+    """
+    View issuing a new API key, which replaces the old one at once.
+    Accepts the current API key or the username and password.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        """
+        Rotate the API key of the authenticated user, or of the user matching the credentials.
+
+        :param request: The request object authenticated by API key or containing 'username' and 'password'
+        :return: The new API key or error message
+        """
+        user = request.user
+        if not user.is_authenticated:
+            user = authenticate(username=request.data.get('username'), password=request.data.get('password'))
+        if not user:
+            return Response({'error': 'Invalid credentials'}, status=400)
+        return Response({'api_key': user.rotate_api_key()})
+
+
 class ApiKeyView(generics.RetrieveAPIView):
     """
     View to retrieve the API key of the authenticated user.
+    The key is the one the request was authenticated with.
     """
     serializer_class = ApiKeySerializer
 